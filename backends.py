@@ -0,0 +1,572 @@
+import os
+import csv
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import random
+import logging
+import zlib
+import zipfile
+import threading
+from pathlib import Path
+
+from engine_watchdog import kill_process, kill_process_group, process_rss, process_tree_rss
+
+
+logger = logging.getLogger(__name__)
+
+# PowerPoint's ppSaveAsPDF file format constant
+PP_SAVE_AS_PDF = 32
+# Presentation.ExportAsFixedFormat constants (slide-range export)
+PP_FIXED_FORMAT_TYPE_PDF = 2
+PP_FIXED_FORMAT_INTENT_PRINT = 2
+PP_PRINT_HANDOUT_VERTICAL_FIRST = 1
+PP_PRINT_OUTPUT_SLIDES = 1
+PP_PRINT_SLIDE_RANGE = 4
+MSO_FALSE = 0
+
+
+class ConversionBackend:
+    """Base class for the engines that do the actual PPTX -> PDF export.
+
+    A backend is started once, converts any number of files and is then closed,
+    so expensive engine startup is paid once per converter rather than per file.
+    """
+
+    name = "base"
+    # Most engines of this kind that can run side by side in one user session (None: no limit)
+    max_workers = None
+
+    def start(self):
+        """Launch or connect to the conversion engine."""
+
+    def convert(self, input_path, output_path):
+        """Export input_path to a PDF at output_path. Raises on failure.
+
+        Returns a dict of phase timings in seconds ("open", "export", "close")
+        plus "slides", the slide count when the engine reports it (else None).
+        """
+        raise NotImplementedError
+
+    def export_slides(self, input_path, output_path, first, last):
+        """Export only slides first..last (1-based, inclusive) to a PDF at output_path.
+
+        Used for incremental reconversion; returns timings like convert(). Backends
+        that can't export a slide range raise NotImplementedError and the converter
+        falls back to a full export.
+        """
+        raise NotImplementedError(f"The {self.name} backend cannot export a slide range")
+
+    def close(self):
+        """Shut the engine down. Must be safe to call more than once."""
+
+    def worker_options(self, worker_id):
+        """Options that build an isolated sibling of this backend in a worker process."""
+        return {}
+
+    def engine_pid(self):
+        """Process id of the engine, when it runs in its own process."""
+        return None
+
+    def engine_rss(self):
+        """Resident memory of the engine in bytes, or None when it can't be measured."""
+        return process_rss(self.engine_pid())
+
+    def can_kill(self):
+        """Whether kill() can stop this engine right now; the converter's timeout depends on it."""
+        return False
+
+    def kill(self):
+        """Forcefully stop a hung engine. Called from the watchdog's timer thread."""
+        raise NotImplementedError(f"The {self.name} backend cannot be killed")
+
+    def restart(self):
+        """Replace the engine with a fresh one (after a kill, crash or to reclaim memory)."""
+        try:
+            self.close()
+        except Exception as e:
+            logger.warning(f"Error closing {self.name} before restart: {e}")
+        self.start()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PowerPointBackend(ConversionBackend):
+    """Drives an installed Microsoft PowerPoint through COM (Windows only).
+
+    PowerPoint runs as a single instance per user session: every COM client,
+    DispatchEx included, talks to the same POWERPNT.EXE. So one converter per
+    session can use it (max_workers = 1). A PowerPoint that was already running
+    when start() was called (the user's, or another converter's) is used but
+    never quit.
+    """
+
+    name = "powerpoint"
+    max_workers = 1
+
+    def __init__(self):
+        self.powerpoint = None
+        self.attached = False  # True when reusing a PowerPoint that was already running
+        self._pid = None
+        self._running_before = set()  # POWERPNT.EXE process ids seen before start()
+        self._com_initialized = False
+
+    def start(self):
+        import pythoncom  # Windows only, so imported on first use
+        import win32com.client
+
+        # COM must be initialised on whichever thread owns the engine (e.g. the GUI worker)
+        pythoncom.CoInitialize()
+        self._com_initialized = True
+        running_before = self._running_before = powerpoint_pids()
+        self.attached = False
+        try:
+            logger.info("Attempting to connect to PowerPoint...")
+            self.powerpoint = win32com.client.GetActiveObject("PowerPoint.Application")
+            self.attached = True
+            logger.info("Found running PowerPoint instance")
+        except Exception:
+            try:
+                logger.info("Starting new PowerPoint instance...")
+                self.powerpoint = win32com.client.Dispatch("PowerPoint.Application")
+                logger.info("Successfully started PowerPoint")
+            except Exception as e:
+                logger.error(f"Failed to initialize PowerPoint: {str(e)}. Troubleshooting: "
+                             f"1. Verify PowerPoint is installed; 2. Try running the script as administrator; "
+                             f"3. Check if PowerPoint works by opening it manually")
+                raise Exception("PowerPoint not installed or not accessible")
+        self._pid = self._find_pid()
+        if self._pid in running_before:
+            # Not in the running object table yet, but started by someone else all the same
+            self.attached = True
+
+    def _find_pid(self):
+        try:
+            import win32process
+            return win32process.GetWindowThreadProcessId(self.powerpoint.HWND)[1]
+        except Exception:
+            return None  # no window handle yet; the engine just can't be killed or measured
+
+    def engine_pid(self):
+        return self._pid
+
+    def can_kill(self):
+        # Only a PowerPoint this backend started itself, whose process is known
+        return not self.attached and self._pid is not None and self._pid not in self._running_before
+
+    def kill(self):
+        if not self.can_kill():
+            # Never kill a PowerPoint the user (or another converter) had open
+            logger.error("Refusing to kill a PowerPoint instance that was already running")
+            return
+        kill_process(self._pid)
+        self._pid = None
+
+    def convert(self, input_path, output_path):
+        return self._export(input_path, output_path)
+
+    def export_slides(self, input_path, output_path, first, last):
+        return self._export(input_path, output_path, (first, last))
+
+    def _export(self, input_path, output_path, slide_range=None):
+        timings = {"open": 0.0, "export": 0.0, "close": 0.0, "slides": None}
+        started = time.perf_counter()
+        # ReadOnly=True, Untitled=False, WithWindow=False: no window to draw
+        presentation = self.powerpoint.Presentations.Open(str(input_path), True, False, False)
+        timings["open"] = time.perf_counter() - started
+        try:
+            timings["slides"] = presentation.Slides.Count
+            started = time.perf_counter()
+            if slide_range is None:
+                presentation.SaveAs(str(output_path), PP_SAVE_AS_PDF)
+            else:
+                presentation.PrintOptions.Ranges.ClearAll()
+                print_range = presentation.PrintOptions.Ranges.Add(*slide_range)
+                presentation.ExportAsFixedFormat(
+                    str(output_path), PP_FIXED_FORMAT_TYPE_PDF, PP_FIXED_FORMAT_INTENT_PRINT, MSO_FALSE,
+                    PP_PRINT_HANDOUT_VERTICAL_FIRST, PP_PRINT_OUTPUT_SLIDES, MSO_FALSE, print_range,
+                    PP_PRINT_SLIDE_RANGE)
+            timings["export"] = time.perf_counter() - started
+        finally:
+            started = time.perf_counter()
+            presentation.Close()
+            timings["close"] = time.perf_counter() - started
+        return timings
+
+    def close(self):
+        try:
+            if self.powerpoint and not self.attached:
+                self.powerpoint.Quit()
+                logger.info("PowerPoint application closed")
+            elif self.powerpoint:
+                logger.info("Leaving the PowerPoint that was already running open")
+        finally:
+            self.powerpoint = None
+            self._pid = None
+            if self._com_initialized:
+                import pythoncom
+                pythoncom.CoUninitialize()
+                self._com_initialized = False
+
+
+class LibreOfficeBackend(ConversionBackend):
+    """Keeps one headless soffice listener alive and converts over a UNO socket.
+
+    Starting soffice costs several seconds, so the listener is launched once in
+    start() and every convert() call reuses the already warm process.
+    Requires the ``uno`` Python bindings shipped with LibreOffice.
+    """
+
+    name = "libreoffice"
+
+    def __init__(self, soffice_path=None, host="127.0.0.1", port=None,
+                 profile_dir=None, startup_timeout=60):
+        self.soffice_path = soffice_path or find_soffice()
+        self.host = host
+        self.port = port
+        self.profile_dir = profile_dir
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.desktop = None
+        self._owned_profile = None
+
+    def start(self):
+        try:
+            import uno  # noqa: F401  (shipped with LibreOffice, not on PyPI)
+        except ImportError:
+            raise Exception("LibreOffice backend needs the 'uno' Python bindings "
+                            "(install python3-uno or use LibreOffice's bundled Python)")
+        if not self.soffice_path:
+            raise Exception("LibreOffice (soffice) not installed or not on PATH")
+
+        if self.port is None:
+            self.port = _free_port(self.host)
+        if self.profile_dir is None:
+            # A private profile keeps this listener from clashing with a desktop session
+            self._owned_profile = tempfile.mkdtemp(prefix="pptx2pdf-lo-")
+            self.profile_dir = self._owned_profile
+        profile_url = Path(self.profile_dir).resolve().as_uri()
+
+        accept = f"socket,host={self.host},port={self.port};urp;StarOffice.ComponentContext"
+        command = [
+            self.soffice_path, "--headless", "--invisible", "--nologo", "--nodefault",
+            "--norestore", "--nolockcheck",
+            f"-env:UserInstallation={profile_url}",
+            f"--accept={accept}",
+        ]
+        logger.info(f"Starting soffice listener on {self.host}:{self.port}")
+        # soffice is often a launcher that spawns soffice.bin; its own process group lets
+        # kill() and engine_rss() reach the real engine too
+        if os.name == "nt":
+            group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group = {"start_new_session": True}
+        self.process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **group)
+        self.desktop = self._connect()
+        logger.info(f"soffice listener ready (pid {self.process.pid})")
+
+    def _connect(self):
+        import uno
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context)
+        url = f"uno:socket,host={self.host},port={self.port};urp;StarOffice.ComponentContext"
+
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(url)
+                return context.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", context)
+            except Exception:
+                if self.process.poll() is not None:
+                    raise Exception(f"soffice exited during startup (code {self.process.returncode})")
+                if time.monotonic() > deadline:
+                    self.close()
+                    raise Exception("Timed out waiting for the soffice listener")
+                time.sleep(0.25)
+
+    def convert(self, input_path, output_path):
+        return self._export(input_path, output_path)
+
+    def export_slides(self, input_path, output_path, first, last):
+        return self._export(input_path, output_path, (first, last))
+
+    def _export(self, input_path, output_path, slide_range=None):
+        import uno
+
+        timings = {"open": 0.0, "export": 0.0, "close": 0.0, "slides": None}
+        started = time.perf_counter()
+        load_props = (_property("Hidden", True), _property("ReadOnly", True))
+        document = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(input_path)), "_blank", 0, load_props)
+        timings["open"] = time.perf_counter() - started
+        if document is None:
+            raise Exception(f"LibreOffice could not open {input_path}")
+        try:
+            timings["slides"] = document.getDrawPages().getCount()
+            started = time.perf_counter()
+            store_props = (_property("FilterName", "impress_pdf_Export"),)
+            if slide_range is not None:
+                filter_data = uno.Any("[]com.sun.star.beans.PropertyValue",
+                                      (_property("PageRange", "%d-%d" % slide_range),))
+                store_props += (_property("FilterData", filter_data),)
+            # uno.invoke keeps the typed FilterData sequence intact across the bridge
+            uno.invoke(document, "storeToURL", (uno.systemPathToFileUrl(str(output_path)), store_props))
+            timings["export"] = time.perf_counter() - started
+        finally:
+            started = time.perf_counter()
+            document.close(True)
+            timings["close"] = time.perf_counter() - started
+        return timings
+
+    def close(self):
+        try:
+            if self.desktop is not None:
+                try:
+                    self.desktop.terminate()
+                except Exception:
+                    pass  # the bridge drops as soffice exits
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._kill_group(self.process)
+                    self.process.wait()
+        finally:
+            self.desktop = None
+            self.process = None
+            if self._owned_profile:
+                shutil.rmtree(self._owned_profile, ignore_errors=True)
+                self._owned_profile = None
+                self.profile_dir = None
+
+    def engine_pid(self):
+        return self.process.pid if self.process is not None else None
+
+    def engine_rss(self):
+        # The launcher plus soffice.bin and anything else it started
+        return process_tree_rss(self.engine_pid())
+
+    def can_kill(self):
+        return self.process is not None
+
+    def kill(self):
+        process = self.process
+        if process is not None:
+            self._kill_group(process)
+
+    @staticmethod
+    def _kill_group(process):
+        try:
+            kill_process_group(process.pid)
+        except (ProcessLookupError, PermissionError):
+            pass  # the whole group is already gone
+        process.kill()
+
+    def worker_options(self, worker_id):
+        # Port and profile are left unset so every worker gets its own listener and profile
+        return {"soffice_path": self.soffice_path, "host": self.host,
+                "startup_timeout": self.startup_timeout}
+
+
+class FakeBackend(ConversionBackend):
+    """In-process stand-in engine for tests: writes a small valid PDF per input.
+
+    Each page is labelled with the deck name, slide number and a checksum of the
+    slide's XML, so tests can tell which slides were exported (and when).
+
+    The simulated export time is delay + per_slide * slides + per_mb * megabytes,
+    randomly scaled by up to +/- jitter (a fraction), which lets benchmarks model
+    a real engine's cost without one installed.
+    """
+
+    name = "fake"
+
+    def __init__(self, delay=0.0, fail_on=(), per_slide=0.0, per_mb=0.0, jitter=0.0, hang_on=()):
+        self.delay = delay
+        self.per_slide = per_slide
+        self.per_mb = per_mb
+        self.jitter = jitter
+        self.fail_on = set(fail_on)  # file names that should raise
+        self.hang_on = set(hang_on)  # file names that block until the engine is killed
+        self.started = False
+        self.starts = 0
+        self.converted = []
+        self._killed = threading.Event()
+
+    def start(self):
+        self.started = True
+        self.starts += 1
+        self._killed.clear()
+
+    def convert(self, input_path, output_path):
+        return self.export_slides(input_path, output_path, 1, None)
+
+    def export_slides(self, input_path, output_path, first, last):
+        if not self.started:
+            raise Exception("Fake backend used before start()")
+        if Path(input_path).name in self.fail_on:
+            raise Exception(f"Simulated conversion failure for {input_path}")
+        started = time.perf_counter()
+        latency = None if Path(input_path).name in self.hang_on else self.simulated_latency(input_path)
+        if latency != 0 and self._killed.wait(latency):
+            raise Exception("Fake engine was killed")
+        slides = _count_slides(input_path)
+        labels = [_fake_page_label(input_path, number) for number in range(first, (last or slides) + 1)]
+        Path(output_path).write_bytes(minimal_pdf(labels))
+        self.converted.append(Path(input_path))
+        return {"open": 0.0, "export": time.perf_counter() - started, "close": 0.0, "slides": slides}
+
+    def close(self):
+        self.started = False
+
+    def can_kill(self):
+        return True
+
+    def kill(self):
+        self._killed.set()
+
+    def simulated_latency(self, input_path):
+        latency = self.delay
+        if self.per_mb:
+            latency += self.per_mb * os.path.getsize(input_path) / (1024 * 1024)
+        if self.per_slide:
+            latency += self.per_slide * _count_slides(input_path)
+        if self.jitter:
+            latency *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, latency)
+
+    def worker_options(self, worker_id):
+        return {"delay": self.delay, "fail_on": sorted(self.fail_on), "per_slide": self.per_slide,
+                "per_mb": self.per_mb, "jitter": self.jitter, "hang_on": sorted(self.hang_on)}
+
+
+BACKENDS = {
+    PowerPointBackend.name: PowerPointBackend,
+    LibreOfficeBackend.name: LibreOfficeBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+
+def default_backend_name():
+    """PowerPoint on Windows, headless LibreOffice everywhere else."""
+    return PowerPointBackend.name if os.name == "nt" else LibreOfficeBackend.name
+
+
+def create_backend(backend=None, **options):
+    """Return a backend instance from a name, a backend instance or None (platform default)."""
+    if isinstance(backend, ConversionBackend):
+        return backend
+    name = backend or default_backend_name()
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown conversion backend: {name!r} (choose from {', '.join(BACKENDS)})")
+    return backend_class(**options)
+
+
+def powerpoint_pids():
+    """Process ids of every running POWERPNT.EXE (empty when they can't be listed)."""
+    try:
+        import psutil  # optional
+        return {process.pid for process in psutil.process_iter(["name"])
+                if (process.info["name"] or "").upper() == "POWERPNT.EXE"}
+    except ImportError:
+        pass
+    if os.name != "nt":
+        return set()
+    try:
+        output = subprocess.run(["tasklist", "/FI", "IMAGENAME eq POWERPNT.EXE", "/FO", "CSV", "/NH"],
+                                capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.SubprocessError):
+        return set()
+    return {int(row[1]) for row in csv.reader(output.splitlines())
+            if len(row) > 1 and row[0].upper() == "POWERPNT.EXE" and row[1].isdigit()}
+
+
+def find_soffice():
+    """Locate the soffice binary on PATH or in the usual install locations."""
+    for candidate in ("soffice", "libreoffice"):
+        path = shutil.which(candidate)
+        if path:
+            return path
+    for path in (r"C:\Program Files\LibreOffice\program\soffice.exe",
+                 "/Applications/LibreOffice.app/Contents/MacOS/soffice"):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def minimal_pdf(labels=None):
+    """Bytes of a valid PDF: one empty page, or one page showing each label."""
+    labels = labels or [None]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % (4 + 2 * index) for index in range(len(labels))), len(labels)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, label in enumerate(labels):
+        text = b""
+        if label:
+            escaped = label.encode("latin-1", "replace")
+            for special in (b"\\", b"(", b")"):
+                escaped = escaped.replace(special, b"\\" + special)
+            text = b"BT /F1 24 Tf 40 270 Td (" + escaped + b") Tj ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 960 540] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * index))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(text) + text + b"\nendstream")
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def _fake_page_label(input_path, number):
+    try:
+        with zipfile.ZipFile(input_path) as archive:
+            checksum = zlib.crc32(archive.read(f"ppt/slides/slide{number}.xml"))
+    except (zipfile.BadZipFile, OSError, KeyError):
+        checksum = 0
+    return f"{Path(input_path).stem} slide {number} {checksum:08x}"
+
+
+def _count_slides(path):
+    """Slide parts in a .pptx (read from the zip directory only); 1 for anything else."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return sum(1 for name in archive.namelist()
+                       if name.startswith("ppt/slides/slide") and name.endswith(".xml")) or 1
+    except (zipfile.BadZipFile, OSError):
+        return 1
+
+
+def _property(name, value):
+    from com.sun.star.beans import PropertyValue
+
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def _free_port(host):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = ".pptx2pdf-journal.jsonl"
+
+
+class BatchJournal:
+    """Append-only record of a batch's progress, one JSON line per state change.
+
+    Each file goes "started" -> "done", "skipped" (its PDF already existed and
+    overwrite was off) or "failed". Every line is flushed and
+    fsynced, so after a crash or reboot the journal still says exactly which PDFs
+    are finished; a torn final line is ignored when the journal is read back.
+    Files are keyed by their path relative to the batch's input folder.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries = self._replay() if resume else {}
+        # Appending keeps history on resume; a fresh batch starts a new journal
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _replay(self):
+        """Latest entry per file."""
+        entries = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from a crash
+                    entries[entry["file"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def is_done(self, relative_path, input_path, output_path, overwrite=False):
+        """True when the journal finished this file, the deck is unchanged and its PDF still exists.
+
+        A file skipped because its PDF already existed only counts when this run
+        doesn't overwrite either; otherwise the overwrite was never carried out.
+        """
+        entry = self.entries.get(Path(relative_path).as_posix())
+        finished = ("done",) if overwrite else ("done", "skipped")
+        if not entry or entry["state"] not in finished or entry.get("output") != str(output_path):
+            return False
+        try:
+            stat = os.stat(input_path)
+            return (stat.st_size, stat.st_mtime_ns) == (entry.get("size"), entry.get("mtime_ns")) \
+                and os.path.exists(output_path)
+        except OSError:
+            return False
+
+    def write(self, relative_path, state, input_path=None, output_path=None, error=None):
+        entry = {"file": Path(relative_path).as_posix(), "state": state, "time": time.time(),
+                 "output": str(output_path) if output_path else None}
+        if state in ("done", "skipped") and input_path:
+            try:
+                stat = os.stat(input_path)
+                entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            except OSError:
+                pass
+        if error:
+            entry["error"] = error
+        self.entries[entry["file"]] = entry
+        try:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.warning(f"Could not write batch journal {self.path}: {e}")
+
+    def summary(self):
+        states = [entry["state"] for entry in self.entries.values()]
+        return {state: states.count(state) for state in ("started", "done", "skipped", "failed")}
+
+    def close(self):
+        self._file.close()
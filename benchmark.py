@@ -0,0 +1,333 @@
+"""Throughput/latency benchmark for PPTXtoPDFConverter.
+
+Generates a synthetic .pptx corpus, runs it through batch_convert for each
+requested worker count and writes the results as JSON, e.g.:
+
+    python benchmark.py --files 40 --slides 5,40 --image-kb 0,500 --workers 1,2,4 \
+        --fake-delay 0.05 --fake-per-slide 0.01 --output bench.json --compare last.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import zlib
+import random
+import struct
+import shutil
+import zipfile
+import argparse
+import platform
+import tempfile
+import threading
+from pathlib import Path
+
+from pptToPdf import PPTXtoPDFConverter
+from engine_watchdog import child_pids, process_rss
+
+
+# --- Synthetic deck generator ---
+
+P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+CT_PREFIX = "application/vnd.openxmlformats-officedocument.presentationml."
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+THEME_XML = XML_HEADER + f'''<a:theme xmlns:a="{A}" name="Bench"><a:themeElements>
+<a:clrScheme name="Bench"><a:dk1><a:srgbClr val="000000"/></a:dk1><a:lt1><a:srgbClr val="FFFFFF"/></a:lt1>
+<a:dk2><a:srgbClr val="1F497D"/></a:dk2><a:lt2><a:srgbClr val="EEECE1"/></a:lt2>
+<a:accent1><a:srgbClr val="4F81BD"/></a:accent1><a:accent2><a:srgbClr val="C0504D"/></a:accent2>
+<a:accent3><a:srgbClr val="9BBB59"/></a:accent3><a:accent4><a:srgbClr val="8064A2"/></a:accent4>
+<a:accent5><a:srgbClr val="4BACC6"/></a:accent5><a:accent6><a:srgbClr val="F79646"/></a:accent6>
+<a:hlink><a:srgbClr val="0000FF"/></a:hlink><a:folHlink><a:srgbClr val="800080"/></a:folHlink></a:clrScheme>
+<a:fontScheme name="Bench"><a:majorFont><a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/></a:majorFont>
+<a:minorFont><a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/></a:minorFont></a:fontScheme>
+<a:fmtScheme name="Bench"><a:fillStyleLst>{'<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>' * 3}</a:fillStyleLst>
+<a:lnStyleLst>{'<a:ln w="9525"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>' * 3}</a:lnStyleLst>
+<a:effectStyleLst>{'<a:effectStyle><a:effectLst/></a:effectStyle>' * 3}</a:effectStyleLst>
+<a:bgFillStyleLst>{'<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>' * 3}</a:bgFillStyleLst></a:fmtScheme>
+</a:themeElements></a:theme>'''
+
+EMPTY_TREE = ('<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+              '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+              '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>')
+
+MASTER_XML = XML_HEADER + f'''<p:sldMaster xmlns:a="{A}" xmlns:r="{R}" xmlns:p="{P}"><p:cSld><p:spTree>{EMPTY_TREE}</p:spTree></p:cSld>
+<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" hlink="hlink" folHlink="folHlink"/>
+<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst></p:sldMaster>'''
+
+LAYOUT_XML = XML_HEADER + f'''<p:sldLayout xmlns:a="{A}" xmlns:r="{R}" xmlns:p="{P}" type="blank"><p:cSld name="Blank"><p:spTree>{EMPTY_TREE}</p:spTree></p:cSld>
+<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>'''
+
+
+def _relationships(*relationships):
+    body = "".join(f'<Relationship Id="{rel_id}" Type="{REL_TYPE}{rel_type}" Target="{target}"/>'
+                   for rel_id, rel_type, target in relationships)
+    return XML_HEADER + f'<Relationships xmlns="{PKG_RELS}">{body}</Relationships>'
+
+
+def _noise_png(rng, width, height):
+    """An incompressible RGB PNG, so media bytes behave like real photos."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\0" + rng.randbytes(width * 3) for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows, 1)) + chunk(b"IEND", b""))
+
+
+def _slide_xml(number, with_image):
+    text = (f'<p:sp><p:nvSpPr><p:cNvPr id="2" name="Text"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="457200" y="457200"/><a:ext cx="8229600" cy="914400"/></a:xfrm>'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr><p:txBody><a:bodyPr/><a:lstStyle/>'
+            f'<a:p><a:r><a:rPr lang="en-US" sz="3200"/><a:t>Benchmark slide {number}</a:t></a:r></a:p></p:txBody></p:sp>')
+    picture = ''
+    if with_image:
+        picture = ('<p:pic><p:nvPicPr><p:cNvPr id="3" name="Picture"/><p:cNvPicPr/><p:nvPr/></p:nvPicPr>'
+                   '<p:blipFill><a:blip r:embed="rId2"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+                   '<p:spPr><a:xfrm><a:off x="1371600" y="1600200"/><a:ext cx="6400800" cy="4572000"/></a:xfrm>'
+                   '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>')
+    return XML_HEADER + (f'<p:sld xmlns:a="{A}" xmlns:r="{R}" xmlns:p="{P}"><p:cSld><p:spTree>{EMPTY_TREE}'
+                         f'{text}{picture}</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>')
+
+
+def write_synthetic_deck(path, slides, image_kb=0, rng=None):
+    """Write a minimal but valid .pptx with `slides` slides and ~image_kb of noise image per slide."""
+    rng = rng or random.Random()
+    side = int((image_kb * 1024 / 3) ** 0.5) if image_kb else 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as deck:
+        overrides = [("/ppt/presentation.xml", CT_PREFIX + "presentation.main+xml"),
+                     ("/ppt/slideMasters/slideMaster1.xml", CT_PREFIX + "slideMaster+xml"),
+                     ("/ppt/slideLayouts/slideLayout1.xml", CT_PREFIX + "slideLayout+xml"),
+                     ("/ppt/theme/theme1.xml", "application/vnd.openxmlformats-officedocument.theme+xml")]
+        overrides += [(f"/ppt/slides/slide{n}.xml", CT_PREFIX + "slide+xml") for n in range(1, slides + 1)]
+        deck.writestr("[Content_Types].xml", XML_HEADER + (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/><Default Extension="png" ContentType="image/png"/>'
+            + "".join(f'<Override PartName="{part}" ContentType="{kind}"/>' for part, kind in overrides) + '</Types>'))
+        deck.writestr("_rels/.rels", _relationships(("rId1", "officeDocument", "ppt/presentation.xml")))
+
+        slide_ids = "".join(f'<p:sldId id="{255 + n}" r:id="rId{n + 2}"/>' for n in range(1, slides + 1))
+        deck.writestr("ppt/presentation.xml", XML_HEADER + (
+            f'<p:presentation xmlns:a="{A}" xmlns:r="{R}" xmlns:p="{P}">'
+            '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+            f'<p:sldIdLst>{slide_ids}</p:sldIdLst><p:sldSz cx="9144000" cy="6858000"/>'
+            '<p:notesSz cx="6858000" cy="9144000"/></p:presentation>'))
+        deck.writestr("ppt/_rels/presentation.xml.rels", _relationships(
+            ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"), ("rId2", "theme", "theme/theme1.xml"),
+            *[(f"rId{n + 2}", "slide", f"slides/slide{n}.xml") for n in range(1, slides + 1)]))
+        deck.writestr("ppt/theme/theme1.xml", THEME_XML)
+        deck.writestr("ppt/slideMasters/slideMaster1.xml", MASTER_XML)
+        deck.writestr("ppt/slideMasters/_rels/slideMaster1.xml.rels", _relationships(
+            ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"), ("rId2", "theme", "../theme/theme1.xml")))
+        deck.writestr("ppt/slideLayouts/slideLayout1.xml", LAYOUT_XML)
+        deck.writestr("ppt/slideLayouts/_rels/slideLayout1.xml.rels", _relationships(
+            ("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")))
+
+        for n in range(1, slides + 1):
+            deck.writestr(f"ppt/slides/slide{n}.xml", _slide_xml(n, bool(side)))
+            relationships = [("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")]
+            if side:
+                # Images are already compressed, so store them like PowerPoint does
+                deck.writestr(f"ppt/media/image{n}.png", _noise_png(rng, side, side), zipfile.ZIP_STORED)
+                relationships.append(("rId2", "image", f"../media/image{n}.png"))
+            deck.writestr(f"ppt/slides/_rels/slide{n}.xml.rels", _relationships(*relationships))
+
+
+def generate_corpus(directory, files, slide_counts, image_sizes_kb, seed=0):
+    """Write `files` decks cycling through the slide counts and image sizes. Returns their paths."""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(files):
+        slides = slide_counts[index % len(slide_counts)]
+        image_kb = image_sizes_kb[(index // len(slide_counts)) % len(image_sizes_kb)]
+        path = directory / f"deck{index:05d}_{slides}s_{image_kb}kb.pptx"
+        write_synthetic_deck(path, slides, image_kb, rng)
+        paths.append(path)
+    return paths
+
+
+# --- Measurement ---
+
+def percentile(values, fraction):
+    """Nearest-rank percentile; None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class PeakRSS:
+    """Samples the resident set size of this process and its engine children while a run is going.
+
+    ru_maxrss is a lifetime high-water mark, so it can't tell one run from the
+    next; sampling the live process tree gives each run its own peak. Finding the
+    children means a scan of every process without psutil, so the child list is
+    only refreshed every refresh seconds to keep the sampler out of the timings.
+    """
+
+    def __init__(self, interval=0.05, refresh=1.0):
+        self.interval = interval
+        self.refresh = refresh
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        pid = os.getpid()
+        members, listed = [pid], None
+        while True:
+            now = time.monotonic()
+            if listed is None or now - listed >= self.refresh:
+                members, listed = [pid] + child_pids(pid), now
+            sizes = [size for size in map(process_rss, members) if size is not None]
+            if sizes and (self.peak is None or sum(sizes) > self.peak):
+                self.peak = sum(sizes)
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def run_once(converter, corpus_dir, output_dir, workers):
+    """One batch over the corpus; returns throughput and latency figures."""
+    shutil.rmtree(output_dir, ignore_errors=True)
+    results = []
+    with PeakRSS() as rss:
+        started = time.perf_counter()
+        converter.batch_convert(corpus_dir, output_dir, overwrite=True, gui_mode=True, workers=workers,
+                                on_result=results.append, deduplicate=False)
+    wall = time.perf_counter() - started
+    latencies = [result["duration"] for result in results]
+    output_bytes = sum(os.path.getsize(result["output"]) for result in results if result["success"])
+    return {
+        "workers": workers,
+        "files": len(results),
+        "failed": sum(not result["success"] for result in results),
+        "wall_seconds": wall,
+        "files_per_second": len(results) / wall if wall else None,
+        "output_bytes": output_bytes,
+        "latency_seconds": {
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None,
+        },
+        "worker_utilisation": {str(worker_id): stats["utilisation"]
+                               for worker_id, stats in converter.worker_stats.items()} if workers > 1 else None,
+        "peak_rss_bytes": rss.peak,  # this process plus engine processes; None if unmeasurable
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Print per-worker-count deltas against a baseline; returns True when nothing regressed."""
+    previous = {run["workers"]: run for run in baseline["runs"]}
+    ok = True
+    for run in current["runs"]:
+        old = previous.get(run["workers"])
+        if not old or not old["files_per_second"]:
+            continue
+        change = run["files_per_second"] / old["files_per_second"] - 1
+        p95_old, p95_new = old["latency_seconds"]["p95"], run["latency_seconds"]["p95"]
+        print(f"workers={run['workers']}: {old['files_per_second']:.2f} -> {run['files_per_second']:.2f} files/s "
+              f"({change:+.1%}), p95 {p95_old:.3f}s -> {p95_new:.3f}s, "
+              f"PDF {old.get('output_bytes', 0) / 1024 ** 2:.1f} -> {run['output_bytes'] / 1024 ** 2:.1f} MiB")
+        if change < -tolerance:
+            print(f"  REGRESSION: throughput dropped more than {tolerance:.0%}")
+            ok = False
+    return ok
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",") if value]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PPTX to PDF conversion throughput and latency")
+    parser.add_argument("--files", type=int, default=40, help="decks in the synthetic corpus")
+    parser.add_argument("--slides", type=_int_list, default=[5, 20, 60], help="comma-separated slide counts")
+    parser.add_argument("--image-kb", type=_int_list, default=[0, 200, 1000],
+                        help="comma-separated image size per slide, in KiB (0 = text only)")
+    parser.add_argument("--workers", type=_int_list, default=[1, 2, 4], help="comma-separated worker counts")
+    parser.add_argument("--backend", default="fake", help="fake, libreoffice or powerpoint")
+    parser.add_argument("--fake-delay", type=float, default=0.05, help="fake backend: seconds per file")
+    parser.add_argument("--fake-per-slide", type=float, default=0.005, help="fake backend: seconds per slide")
+    parser.add_argument("--fake-per-mb", type=float, default=0.02, help="fake backend: seconds per MiB")
+    parser.add_argument("--fake-jitter", type=float, default=0.1, help="fake backend: +/- latency fraction")
+    parser.add_argument("--media-dpi", type=int, help="downsample images to this DPI before export")
+    parser.add_argument("--corpus-dir", help="reuse/keep the corpus here instead of a temp folder")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed throughput drop vs baseline")
+    args = parser.parse_args(argv)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="pptx2pdf-bench-"))
+    corpus_dir = Path(args.corpus_dir) if args.corpus_dir else work_dir / "corpus"
+    try:
+        if not any(corpus_dir.glob("*.pptx")):
+            print(f"Generating {args.files} synthetic decks in {corpus_dir}...")
+            generate_corpus(corpus_dir, args.files, args.slides, args.image_kb, args.seed)
+        corpus = sorted(corpus_dir.glob("*.pptx"))
+
+        backend_options = None
+        if args.backend == "fake":
+            backend_options = {"delay": args.fake_delay, "per_slide": args.fake_per_slide,
+                               "per_mb": args.fake_per_mb, "jitter": args.fake_jitter}
+        converter = PPTXtoPDFConverter(log_file=str(work_dir / "benchmark.log"), backend=args.backend,
+                                       backend_options=backend_options, media_dpi=args.media_dpi)
+        try:
+            runs = []
+            for workers in args.workers:
+                print(f"Running with {workers} worker(s)...")
+                runs.append(run_once(converter, corpus_dir, work_dir / "output", workers))
+        finally:
+            converter.close()
+
+        baseline_rate = next((run["files_per_second"] for run in runs if run["workers"] == 1), None)
+        for run in runs:
+            run["speedup_vs_1_worker"] = run["files_per_second"] / baseline_rate if baseline_rate else None
+            print(f"workers={run['workers']}: {run['files_per_second']:.2f} files/s, "
+                  f"p50 {run['latency_seconds']['p50']:.3f}s, p95 {run['latency_seconds']['p95']:.3f}s, "
+                  f"p99 {run['latency_seconds']['p99']:.3f}s, {run['output_bytes'] / 1024 ** 2:.1f} MiB of PDF, "
+                  f"{run['failed']} failed")
+
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": {"system": platform.platform(), "python": platform.python_version(),
+                         "cpus": os.cpu_count()},
+            "backend": args.backend,
+            "backend_options": backend_options,
+            "media_dpi": args.media_dpi,
+            "corpus": {"files": len(corpus), "bytes": sum(path.stat().st_size for path in corpus),
+                       "slides": args.slides, "image_kb": args.image_kb, "seed": args.seed},
+            "runs": runs,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+        if args.compare:
+            with open(args.compare) as f:
+                if not compare(report, json.load(f), args.tolerance):
+                    return 1
+        return 0
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
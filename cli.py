@@ -0,0 +1,257 @@
+"""Non-interactive command line for scripted and fleet-wide conversions.
+
+    python cli.py decks/ "archive/**/*.pptx" --manifest todo.txt --output "out/{relative}.pdf" \
+        --shard 3/16 --workers 4 > results.jsonl
+
+Prints one JSON line per file (input, output, outcome, timings) on stdout and
+nothing else there; diagnostics go to stderr and the log file.
+Exit codes: 0 all files converted (or skipped/served from cache, or a --shard
+that selected nothing), 1 some files failed, 2 bad arguments or no inputs,
+3 the conversion engine could not start.
+"""
+import sys
+import glob
+import json
+import hashlib
+import itertools
+import argparse
+from pathlib import Path
+from collections import Counter
+
+from file_scanner import POWERPOINT_EXTENSIONS, scan_presentations
+
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_ENGINE = 3
+FAILED_OUTCOMES = ("failed", "timeout", "rejected", None)
+DEFAULT_TEMPLATE = "{dir}/{stem}.pdf"
+
+
+def parse_shard(text):
+    """'i/N' -> (i, N) with 0 <= i < N."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..N-1, got {text!r}")
+    return index, count
+
+
+def in_shard(key, shard):
+    """Deterministic partition: the same key lands in the same shard on every machine."""
+    if shard is None:
+        return True
+    index, count = shard
+    return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:16], 16) % count == index
+
+
+def read_manifest(path):
+    """Paths listed one per line ('-' reads stdin); blank lines and # comments are ignored."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def expand_inputs(arguments, recursive=False, include=None, exclude=None):
+    """Yield (shard key, input path, relative stem) for every deck named by the arguments.
+
+    Arguments may be files, folders (scanned like batch_convert) or glob patterns.
+    The shard key is the path as given, so it does not depend on where a share is
+    mounted as long as every machine is given the same arguments.
+    """
+    for argument in arguments:
+        path = Path(argument)
+        if path.is_dir():
+            for deck in scan_presentations(path, recursive, include, exclude):
+                relative = deck.relative_to(path).with_suffix("")
+                yield (path / relative).as_posix() + deck.suffix, deck, relative.as_posix()
+        elif glob.has_magic(argument):
+            for match in sorted(glob.iglob(argument, recursive=True)):
+                if match.lower().endswith(POWERPOINT_EXTENSIONS) and Path(match).is_file():
+                    yield Path(match).as_posix(), Path(match), Path(match).stem
+        else:
+            yield path.as_posix(), path, path.stem
+
+
+def output_for(template, input_path, relative):
+    """Fill the --output template for one input."""
+    input_path = Path(input_path).resolve()
+    return Path(template.format(
+        dir=input_path.parent.as_posix(),
+        stem=input_path.stem,
+        name=input_path.name,
+        relative=relative,
+        parent=input_path.parent.name,
+    ))
+
+
+def result_line(result):
+    """The JSON line printed for one finished file."""
+    record = result.get("record") or {}
+    outcome = record.get("outcome") or ("converted" if result["success"] else "failed")
+    return {
+        "input": result["input"],
+        "output": result["output"],
+        "success": bool(result["success"]),
+        "outcome": outcome,
+        "worker": result.get("worker"),
+        "duration": result.get("duration"),
+        "open_seconds": record.get("open_seconds"),
+        "export_seconds": record.get("export_seconds"),
+        "close_seconds": record.get("close_seconds"),
+        "slide_count": record.get("slide_count"),
+        "input_size": record.get("input_size"),
+        "output_size": record.get("output_size"),
+        "error": record.get("error"),
+    }
+
+
+def parse_backend_option(text):
+    """'key=value' -> (key, value); the value is read as JSON when it parses, else kept as a string."""
+    key, separator, value = text.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"expected key=value, got {text!r}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Convert PowerPoint decks to PDF without prompts",
+        epilog="Output template fields: {dir} {stem} {name} {relative} {parent}")
+    parser.add_argument("inputs", nargs="*", help="files, folders or glob patterns (quote globs)")
+    parser.add_argument("--manifest", action="append", default=[],
+                        help="file listing one input per line ('-' for stdin); may be repeated")
+    parser.add_argument("-o", "--output", default=DEFAULT_TEMPLATE,
+                        help=f"output path template (default: {DEFAULT_TEMPLATE})")
+    parser.add_argument("-r", "--recursive", action="store_true", help="descend into subfolders of folder inputs")
+    parser.add_argument("--include", action="append", help="glob pattern folder inputs must match")
+    parser.add_argument("--exclude", action="append", help="glob pattern to skip in folder inputs")
+    parser.add_argument("--shard", type=parse_shard, help="only convert shard i of N (0-based), e.g. 3/16")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="parallel engine processes")
+    parser.add_argument("--overwrite", action="store_true", help="replace existing PDFs")
+    parser.add_argument("--list", action="store_true", help="print the selected input/output pairs and exit")
+    parser.add_argument("--backend", help="powerpoint, libreoffice or fake (default: platform default)")
+    parser.add_argument("--backend-option", type=parse_backend_option, action="append", default=[],
+                        metavar="KEY=VALUE", help="backend constructor option, e.g. startup_timeout=120; "
+                                                  "may be repeated")
+    parser.add_argument("--timeout", type=float, help="seconds per file before the engine is restarted")
+    parser.add_argument("--retries", type=int, default=0, help="retries for transient engine errors")
+    parser.add_argument("--cache-dir", help="enable the persistent conversion cache")
+    parser.add_argument("--media-dpi", type=int, help="downsample images to this DPI before export")
+    parser.add_argument("--metrics-file", help="append a JSON record per conversion here")
+    parser.add_argument("--log-file", default="conversion.log")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+    if not args.inputs and not args.manifest:
+        parser.print_usage(sys.stderr)
+        print("cli.py: error: no inputs given", file=sys.stderr)
+        return EXIT_USAGE
+    if args.workers < 1:
+        print("cli.py: error: --workers must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        output_for(args.output, Path("deck.pptx"), "deck")
+    except (KeyError, IndexError, ValueError) as e:
+        print(f"cli.py: error: bad --output template {args.output!r}: {e!r}", file=sys.stderr)
+        return EXIT_USAGE
+
+    matched = 0  # inputs found, in any shard
+    selected = 0
+    seen = set()
+
+    def jobs():
+        """(input, output) pairs for this shard, produced lazily so huge manifests stream."""
+        nonlocal matched, selected
+        arguments = list(args.inputs)
+        sources = [arguments] + [read_manifest(manifest) for manifest in args.manifest]
+        for source in sources:
+            for key, input_path, relative in expand_inputs(source, args.recursive, args.include, args.exclude):
+                matched += 1
+                if not in_shard(key, args.shard):
+                    continue
+                resolved = input_path.resolve()
+                if resolved in seen:
+                    continue
+                seen.add(resolved)
+                output_path = output_for(args.output, resolved, relative)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                selected += 1
+                yield resolved, output_path.resolve()
+
+    pending = jobs()
+    try:
+        first = next(pending, None)  # don't start an engine when nothing matched
+        if first is None and args.shard and matched:
+            # Inputs matched but none hashed to this shard: normal for small or skewed inputs
+            print(f"cli.py: shard {args.shard[0]}/{args.shard[1]} selected none of the inputs; nothing to do",
+                  file=sys.stderr)
+            return EXIT_OK
+        if first is None:
+            print("cli.py: error: no PowerPoint files matched", file=sys.stderr)
+            return EXIT_USAGE
+        if args.list:
+            for input_path, output_path in itertools.chain([first], pending):
+                print(json.dumps({"input": str(input_path), "output": str(output_path)}), flush=True)
+            return EXIT_OK
+    except OSError as e:  # e.g. an unreadable manifest
+        print(f"cli.py: error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    from pptToPdf import PPTXtoPDFConverter  # engine start-up only when there is work
+
+    try:
+        converter = PPTXtoPDFConverter(log_file=args.log_file, backend=args.backend,
+                                       backend_options=dict(args.backend_option), cache_dir=args.cache_dir,
+                                       metrics_file=args.metrics_file, timeout=args.timeout,
+                                       retries=args.retries, media_dpi=args.media_dpi)
+    except Exception as e:
+        print(f"cli.py: error: could not start the conversion engine: {e}", file=sys.stderr)
+        return EXIT_ENGINE
+
+    outcomes = Counter()
+
+    def on_result(result):
+        line = result_line(result)
+        outcomes[line["outcome"]] += 1
+        print(json.dumps(line), flush=True)
+
+    try:
+        converter.convert_many(itertools.chain([first], pending), args.workers, args.overwrite, on_result)
+    except OSError as e:  # e.g. an unreadable manifest
+        print(f"cli.py: error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except KeyboardInterrupt:
+        print("cli.py: interrupted", file=sys.stderr)
+        return EXIT_FAILURES
+    finally:
+        converter.close()
+
+    failures = sum(outcomes[outcome] for outcome in FAILED_OUTCOMES)
+    others = ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())
+                       if outcome != "converted")
+    print(f"{outcomes['converted']}/{selected} files converted" + (f" ({others})" if others else ""),
+          file=sys.stderr)
+    return EXIT_FAILURES if failures else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
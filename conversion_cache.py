@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+HASH_CHUNK_SIZE = 1024 * 1024
+# Linux ioctl that makes a copy-on-write clone of a file (Btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+# Stores between full rescans of the cache folder, which other converters may be filling too
+RESCAN_EVERY = 100
+
+
+def file_digest(path):
+    """sha256 hex digest of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clone_or_copy(source, destination):
+    """Copy source to destination as an independent file, atomically.
+
+    Uses a copy-on-write reflink where the filesystem supports one, which costs no
+    space or time until either file changes, and a plain copy elsewhere. Unlike a
+    hardlink, editing the destination afterwards never changes the source.
+    """
+    destination = Path(destination)
+    temp_path = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            _reflink(source, temp_path)
+        except (ImportError, OSError):
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, destination)
+    finally:
+        temp_path.unlink(missing_ok=True)  # only still there if the copy failed
+
+
+def _reflink(source, destination):
+    import fcntl  # POSIX only; Windows falls back to a copy
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+class ConversionCache:
+    """Persistent content-addressed store of converted PDFs with size-based LRU eviction.
+
+    Entries are keyed by a hash of the input bytes plus the conversion options and
+    live as <key>.pdf files in cache_dir; an entry's mtime is its last-use time.
+    A running byte total keeps stores cheap: the folder is only scanned when that
+    total passes max_bytes, or every RESCAN_EVERY stores to pick up other writers.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = None  # size of the cache as of the last scan plus our stores since
+        self._stores_since_scan = 0
+
+    def key_for(self, digest, options):
+        """Cache key for an input digest (see file_digest) and its conversion options."""
+        payload = digest + json.dumps(options, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.pdf"
+
+    def materialize(self, key, destination):
+        """Place a copy of the cached PDF for key at destination. Returns False on a miss.
+
+        A copy (or reflink), never a hardlink: a viewer that saves annotations into
+        the output in place must not rewrite the entry every later hit is served from.
+        """
+        entry = self._entry_path(key)
+        try:
+            clone_or_copy(entry, destination)
+            os.utime(entry)  # mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def store(self, key, pdf_path):
+        """Copy a freshly converted PDF into the cache, evicting down to max_bytes when it is full."""
+        entry = self._entry_path(key)
+        temp_path = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        try:
+            replaced = entry.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        try:
+            # Copy rather than link so later edits to the output can't corrupt the cache
+            shutil.copyfile(pdf_path, temp_path)
+            size = temp_path.stat().st_size
+            os.replace(temp_path, entry)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        self._stores_since_scan += 1
+        if self._bytes is None or self._stores_since_scan >= RESCAN_EVERY:
+            self.evict()
+            return
+        self._bytes += size - replaced
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def entries(self):
+        """Cache entries, least recently used first."""
+        entries = []
+        for entry in self.cache_dir.glob("*.pdf"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process meanwhile
+            entries.append({"key": entry.stem, "size": stat.st_size, "last_used": stat.st_mtime})
+        entries.sort(key=lambda item: item["last_used"])
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = self.entries()
+        total = sum(item["size"] for item in entries)
+        removed = 0
+        for item in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                self._entry_path(item["key"]).unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= item["size"]
+        self._bytes = total
+        self._stores_since_scan = 0
+        if removed:
+            logger.info(f"Evicted {removed} entries from conversion cache {self.cache_dir}")
+        return removed
+
+    def stats(self):
+        entries = self.entries()
+        return {
+            "cache_dir": str(self.cache_dir),
+            "entries": len(entries),
+            "bytes": sum(item["size"] for item in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        for item in self.entries():
+            self._entry_path(item["key"]).unlink(missing_ok=True)
+        self._bytes = 0
+
+
+def main(argv=None):
+    """Inspect or clear a conversion cache: python conversion_cache.py CACHE_DIR [--list] [--clear]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect a PPTX to PDF conversion cache")
+    parser.add_argument("cache_dir")
+    parser.add_argument("--list", action="store_true", help="list entries, least recently used first")
+    parser.add_argument("--clear", action="store_true", help="delete every entry")
+    args = parser.parse_args(argv)
+
+    cache = ConversionCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+    if args.list:
+        for item in cache.entries():
+            last_used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(item["last_used"]))
+            print(f"{item['key']}  {item['size']:>12}  {last_used}")
+    stats = cache.stats()
+    del stats["hits"], stats["misses"]  # only meaningful inside a running converter
+    json.dump(stats, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
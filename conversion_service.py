@@ -0,0 +1,365 @@
+"""Local HTTP conversion service with warm engines and a bounded job queue.
+
+    python conversion_service.py --port 8765 --workers 2 --queue-size 16
+
+    POST   /jobs?name=deck.pptx   request body is the deck; 202 with the job, 429 when the queue is full
+    GET    /jobs/<id>             job status as JSON
+    GET    /jobs/<id>/pdf         the converted PDF, streamed
+    DELETE /jobs/<id>             cancel a queued job and delete its files
+    GET    /health                workers, queue depth and capacity
+"""
+import sys
+import json
+import time
+import queue
+import shutil
+import logging
+import tempfile
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from conversion_worker import ConversionJob, ConversionWorker
+from file_scanner import POWERPOINT_EXTENSIONS
+from spooling import ram_root, spool_prefix, spool_root, sweep_stale
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_UPLOAD_BYTES = 512 * 1024 ** 2
+
+
+class ServiceJob(ConversionJob):
+    """A ConversionJob plus the status the service reports for it."""
+
+    def __init__(self, input_path, output_path, name):
+        super().__init__("single", input_path, output_path, overwrite=True)
+        self.name = name
+        self.status = "queued"  # queued, running, done, failed or cancelled
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.record = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+            "record": self.record,
+            "pdf": f"/jobs/{self.id}/pdf" if self.status == "done" else None,
+        }
+
+
+class ConversionService:
+    """Runs `workers` conversion threads, each with its own warm converter, behind one job queue.
+
+    Each converter has its own engine only where the backend allows several per
+    session (LibreOffice); PowerPoint is one shared instance, so use one worker.
+
+    converter_factory(worker_id) builds a PPTXtoPDFConverter; it is called on the
+    worker's own thread, so COM engines stay on the thread that created them.
+    Uploads and PDFs live in work_dir, or without one in a per-job spool directory
+    that is in RAM (/dev/shm) when it has room (see spooling.py); finished jobs are
+    purged after job_ttl seconds.
+    """
+
+    def __init__(self, converter_factory, workers=1, queue_size=16, work_dir=None, job_ttl=3600,
+                 max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES):
+        self.work_dir = Path(work_dir) if work_dir else None
+        if self.work_dir:
+            self.work_dir.mkdir(parents=True, exist_ok=True)
+        # Job folders of a service that was killed before close() would otherwise stay in RAM
+        sweep_stale([self.work_dir] if self.work_dir else [ram_root(), tempfile.gettempdir()])
+        self.job_ttl = job_ttl
+        self.max_upload_bytes = max_upload_bytes
+        self.jobs = {}  # id -> ServiceJob
+        self._lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.events = queue.Queue()
+        self.workers = [
+            ConversionWorker(lambda worker_id=worker_id: converter_factory(worker_id), self.queue, self.events,
+                             name=f"conversion-worker-{worker_id}")
+            for worker_id in range(workers)
+        ]
+        self.ready_workers = 0
+        self._events_thread = threading.Thread(target=self._pump_events, name="service-events", daemon=True)
+        self._events_thread.start()
+        for worker in self.workers:
+            worker.start()
+
+    # --- Jobs ---
+
+    def full(self):
+        return self.queue.full()
+
+    def submit(self, name, stream, length):
+        """Spool an upload and queue it. Raises queue.Full when there is no room."""
+        self.purge_expired()
+        if length < 0:
+            raise ValueError(f"Invalid upload length {length}")
+        if length > self.max_upload_bytes:
+            raise ValueError(f"Upload of {length} bytes exceeds the {self.max_upload_bytes} byte limit")
+        job_dir = Path(tempfile.mkdtemp(prefix=spool_prefix("job"), dir=self.work_dir or spool_root(length)))
+        input_path = job_dir / name
+        job = ServiceJob(input_path, input_path.with_suffix(".pdf"), name)
+        try:
+            with open(input_path, "wb") as f:
+                remaining = length
+                while remaining:
+                    chunk = stream.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ValueError("Upload ended early")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            with self._lock:
+                self.jobs[job.id] = job
+            self.queue.put_nowait(job)
+        except BaseException:
+            with self._lock:
+                self.jobs.pop(job.id, None)
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        logger.info(f"Queued job {job.id}: {name} ({length} bytes)")
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def delete(self, job_id):
+        """Cancel a job (queued jobs are skipped by the worker) and remove its files once idle."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job.cancel()
+            if job.status == "running":
+                return job  # its files are removed by the purge once it finishes
+            if job.status == "queued":
+                job.status = "cancelled"
+            del self.jobs[job_id]
+        shutil.rmtree(job.input_path.parent, ignore_errors=True)
+        return job
+
+    def purge_expired(self):
+        cutoff = time.time() - self.job_ttl
+        with self._lock:
+            expired = [job for job in self.jobs.values() if job.finished and job.finished < cutoff]
+            for job in expired:
+                del self.jobs[job.id]
+        for job in expired:
+            shutil.rmtree(job.input_path.parent, ignore_errors=True)
+
+    def _pump_events(self):
+        """Apply worker events to the job table."""
+        while True:
+            name, payload = self.events.get()
+            job = payload.get("job")
+            with self._lock:
+                if name == "ready":
+                    self.ready_workers += 1
+                elif name == "init_failed":
+                    logger.error(f"Conversion worker failed to start: {payload['error']}")
+                elif name == "job_started" and job.status == "queued":
+                    job.status, job.started = "running", time.time()
+                elif name == "job_finished":
+                    job.finished = time.time()
+                    job.record = payload["record"]
+                    if payload["cancelled"]:
+                        job.status = "cancelled"
+                    elif payload["success"]:
+                        job.status = "done"
+                    else:
+                        job.status = "failed"
+                        job.error = (payload["record"] or {}).get("error") or "conversion failed"
+                elif name == "job_failed":
+                    job.status, job.finished, job.error = "failed", time.time(), payload["error"]
+                if job is not None and job.cancel_event.is_set() and job.id not in self.jobs:
+                    shutil.rmtree(job.input_path.parent, ignore_errors=True)  # deleted while running
+
+    def health(self):
+        with self._lock:
+            statuses = [job.status for job in self.jobs.values()]
+        return {
+            "workers": len(self.workers),
+            "ready_workers": self.ready_workers,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "running": statuses.count("running"),
+        }
+
+    def close(self):
+        """Drop queued jobs, stop every worker after its current file and delete every job's files."""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        for worker in self.workers:
+            worker.cancel_current()
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=60)
+        # Nothing can download these PDFs any more; don't leave them in /dev/shm
+        with self._lock:
+            jobs = list(self.jobs.values())
+            self.jobs.clear()
+        for job in jobs:
+            shutil.rmtree(job.input_path.parent, ignore_errors=True)
+
+    # --- HTTP ---
+
+    def serve(self, host="127.0.0.1", port=8765):
+        """Create the HTTP server (not yet serving); call serve_forever() on the result."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # only when serving
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send_json(self, status, body, headers=()):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _error(self, status, message, headers=()):
+                self._send_json(status, {"error": message}, headers)
+
+            def _job(self, parts):
+                try:
+                    return service.get(int(parts[1]))
+                except ValueError:
+                    return None
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                if url.path.rstrip("/") != "/jobs":
+                    return self._error(404, "not found")
+                if "Content-Length" not in self.headers:
+                    self.close_connection = True
+                    return self._error(411, "Content-Length required")
+                try:
+                    length = int(self.headers["Content-Length"])
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.close_connection = True
+                    return self._error(400, "Content-Length must be a non-negative integer")
+                name = Path(parse_qs(url.query).get("name", ["upload.pptx"])[0]).name
+                if not name.lower().endswith(POWERPOINT_EXTENSIONS):
+                    self.close_connection = True
+                    return self._error(415, "name must end in .pptx or .ppt")
+                if service.full():
+                    # Refuse before reading the body, so a busy service costs the client nothing
+                    self.close_connection = True
+                    return self._error(429, "queue full", [("Retry-After", "5")])
+                try:
+                    job = service.submit(name, self.rfile, length)
+                except queue.Full:
+                    return self._error(429, "queue full", [("Retry-After", "5")])
+                except ValueError as e:
+                    self.close_connection = True
+                    return self._error(413 if "limit" in str(e) else 400, str(e))
+                self._send_json(202, job.to_dict(), [("Location", f"/jobs/{job.id}")])
+
+            def do_GET(self):
+                parts = urlsplit(self.path).path.strip("/").split("/")
+                if parts == ["health"]:
+                    return self._send_json(200, service.health())
+                if parts[0] != "jobs" or len(parts) not in (2, 3) or (len(parts) == 3 and parts[2] != "pdf"):
+                    return self._error(404, "not found")
+                job = self._job(parts)
+                if job is None:
+                    return self._error(404, "no such job")
+                if len(parts) == 2:
+                    return self._send_json(200, job.to_dict())
+                if job.status != "done":
+                    return self._error(409, f"job is {job.status}")
+                try:
+                    pdf = open(job.output_path, "rb")
+                except FileNotFoundError:
+                    return self._error(410, "PDF no longer available")
+                with pdf:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/pdf")
+                    self.send_header("Content-Length", str(Path(job.output_path).stat().st_size))
+                    self.send_header("Content-Disposition", f'attachment; filename="{Path(job.name).stem}.pdf"')
+                    self.end_headers()
+                    shutil.copyfileobj(pdf, self.wfile, CHUNK_SIZE)
+
+            def do_DELETE(self):
+                parts = urlsplit(self.path).path.strip("/").split("/")
+                if parts[0] != "jobs" or len(parts) != 2:
+                    return self._error(404, "not found")
+                job = self._job(parts)
+                if job is None or service.delete(job.id) is None:
+                    return self._error(404, "no such job")
+                self._send_json(200, job.to_dict())
+
+            def log_message(self, format, *args):
+                logger.info(f"{self.address_string()} {format % args}")
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        logger.info(f"Conversion service listening on http://{host}:{server.server_address[1]}")
+        return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP service for PPTX to PDF conversion")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="warm engines converting in parallel")
+    parser.add_argument("--queue-size", type=int, default=16, help="queued jobs before answering 429")
+    parser.add_argument("--backend", help="powerpoint, libreoffice or fake (default: platform default)")
+    parser.add_argument("--work-dir", help="where uploads and PDFs are kept (default: /dev/shm when it has room, else a temp folder)")
+    parser.add_argument("--job-ttl", type=int, default=3600, help="seconds to keep finished jobs")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_BYTES // 1024 ** 2)
+    parser.add_argument("--timeout", type=float, help="seconds per file before the engine is restarted")
+    parser.add_argument("--cache-dir", help="enable the persistent conversion cache")
+    parser.add_argument("--log-file", default="conversion_service.log")
+    args = parser.parse_args(argv)
+
+    from backends import BACKENDS, default_backend_name
+    from pptToPdf import PPTXtoPDFConverter
+
+    max_workers = getattr(BACKENDS.get(args.backend or default_backend_name()), "max_workers", None)
+    if max_workers and args.workers > max_workers:
+        # Every PowerPoint "worker" would drive the same shared POWERPNT.EXE
+        print(f"The {args.backend or default_backend_name()} backend runs one shared engine per user session; "
+              f"using {max_workers} worker", file=sys.stderr)
+        args.workers = max_workers
+
+    def create_converter(worker_id):
+        return PPTXtoPDFConverter(log_file=args.log_file, backend=args.backend, cache_dir=args.cache_dir,
+                                  worker_id=worker_id, timeout=args.timeout)
+
+    service = ConversionService(create_converter, args.workers, args.queue_size, args.work_dir, args.job_ttl,
+                                args.max_upload_mb * 1024 ** 2)
+    server = service.serve(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} with {args.workers} worker(s); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
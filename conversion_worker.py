@@ -0,0 +1,180 @@
+import queue
+import threading
+import itertools
+
+
+# Job priorities: lower runs first
+HIGH = 0
+NORMAL = 1
+LOW = 2
+PRIORITY_NAMES = {HIGH: "High", NORMAL: "Normal", LOW: "Low"}
+
+
+class ConversionJob:
+    """One queued unit of work for the background worker: a single file or a folder."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, kind, input_path, output_path, overwrite=True, priority=NORMAL):
+        self.id = next(self._ids)
+        self.kind = kind  # "single" or "batch"
+        self.input_path = input_path
+        self.output_path = output_path
+        self.overwrite = overwrite
+        self.priority = priority
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class JobQueue(queue.Queue):
+    """Jobs in priority order, first come first served within a priority.
+
+    Unlike queue.PriorityQueue, waiting jobs can be listed, moved and withdrawn,
+    so the GUI can show the queue and let the user rearrange it. The worker's
+    None stop sentinel always goes to the front.
+    """
+
+    def _init(self, maxsize):
+        self.queue = []
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, job):
+        if job is None:
+            self.queue.insert(0, job)
+            return
+        index = len(self.queue)
+        while index and self.queue[index - 1] is not None and self.queue[index - 1].priority > job.priority:
+            index -= 1
+        self.queue.insert(index, job)
+
+    def _get(self):
+        return self.queue.pop(0)
+
+    def snapshot(self):
+        """The waiting jobs in the order they will run."""
+        with self.mutex:
+            return [job for job in self.queue if job is not None]
+
+    def remove(self, job):
+        """Withdraw a waiting job; False when it already started (or was never queued)."""
+        with self.mutex:
+            if job not in self.queue:
+                return False
+            self.queue.remove(job)
+            self.not_full.notify()
+            return True
+
+    def move(self, job, offset):
+        """Move a waiting job offset places (negative is earlier).
+
+        Jumping past a job of another priority takes on that priority, so the
+        queue stays in priority order and later submissions land where expected.
+        """
+        with self.mutex:
+            if job not in self.queue:
+                return False
+            index = self.queue.index(job)
+            target = max(0, min(len(self.queue) - 1, index + offset))
+            if target == index:
+                return False
+            self.queue.insert(target, self.queue.pop(index))
+            before = self.queue[target - 1] if target else None
+            after = self.queue[target + 1] if target + 1 < len(self.queue) else None
+            if before is not None and before.priority > job.priority:
+                job.priority = before.priority
+            if after is not None and after.priority < job.priority:
+                job.priority = after.priority
+            return True
+
+
+class ConversionWorker(threading.Thread):
+    """Runs conversions off the Tk main thread.
+
+    The worker owns the converter (COM objects must stay on the thread that created
+    them), takes jobs from a queue and reports back through `events`, a thread-safe
+    queue of (event_name, payload) tuples that the GUI polls with root.after().
+    Several workers can share one jobs queue and one events queue (see
+    conversion_service.py); each still owns its own converter.
+    """
+
+    def __init__(self, converter_factory, jobs=None, events=None, name="conversion-worker"):
+        super().__init__(name=name, daemon=True)
+        self.converter_factory = converter_factory
+        self.converter = None
+        self.jobs = jobs if jobs is not None else JobQueue()
+        self.events = events if events is not None else queue.Queue()
+        self.ready = threading.Event()
+        self.current_job = None
+
+    def submit(self, job):
+        self.jobs.put(job)
+        self.events.put(("job_queued", {"job": job, "queued": self.jobs.qsize()}))
+        return job
+
+    def cancel_current(self):
+        """Ask the running job to stop after the file it is converting."""
+        job = self.current_job
+        if job:
+            job.cancel()
+        return job
+
+    def stop(self):
+        """Drop queued jobs, cancel the running one and shut the worker (and its engine) down."""
+        while True:
+            try:
+                self.jobs.get_nowait()
+            except queue.Empty:
+                break
+        self.cancel_current()
+        self.jobs.put(None)
+
+    def run(self):
+        try:
+            self.converter = self.converter_factory()
+        except Exception as e:
+            self.events.put(("init_failed", {"error": str(e)}))
+            return
+        finally:
+            self.ready.set()
+        self.events.put(("ready", {}))
+
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                self._run_job(job)
+        finally:
+            self.converter.close()
+            self.events.put(("stopped", {}))
+
+    def _run_job(self, job):
+        self.current_job = job
+        self.events.put(("job_started", {"job": job}))
+        record = None  # the conversion record of a single-file job
+        try:
+            if job.cancel_event.is_set():
+                success = False
+            elif job.kind == "single":
+                success = self.converter.convert_single_file(job.input_path, job.output_path,
+                                                             overwrite=job.overwrite)
+                record = self.converter.last_record
+            else:
+                success = self.converter.batch_convert(
+                    job.input_path, job.output_path, overwrite=job.overwrite, gui_mode=True,
+                    progress_callback=lambda progress: self.events.put(("progress", {"job": job, **progress})),
+                    on_result=lambda result: self.events.put(("file_finished", {"job": job,
+                                                                                "record": result.get("record")})),
+                    cancel_event=job.cancel_event,
+                )
+            self.events.put(("job_finished", {"job": job, "success": success,
+                                              "cancelled": job.cancel_event.is_set(),
+                                              "record": record}))
+        except Exception as e:
+            self.events.put(("job_failed", {"job": job, "error": str(e)}))
+        finally:
+            self.current_job = None
@@ -0,0 +1,155 @@
+import os
+import logging
+import subprocess
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+# HRESULTs PowerPoint/COM raise when the engine is busy or has died; worth a retry
+TRANSIENT_HRESULTS = {
+    -2147023174,  # 0x800706BA RPC server is unavailable
+    -2147023170,  # 0x800706BE remote procedure call failed
+    -2147417846,  # 0x8001010A RPC_E_SERVERCALL_RETRYLATER
+    -2147418111,  # 0x80010001 RPC_E_CALL_REJECTED
+    -2147417848,  # 0x80010108 RPC_E_DISCONNECTED
+    -2147417851,  # 0x80010105 RPC_E_SERVERFAULT
+}
+TRANSIENT_MESSAGES = (
+    "rpc server is unavailable",
+    "call was rejected by callee",
+    "remote procedure call failed",
+    "object invoked has disconnected",
+    "bridge disposed",  # LibreOffice UNO bridge lost its soffice
+    "connection refused",
+)
+
+
+class ConversionTimeout(Exception):
+    """A conversion ran past its time limit and the engine was killed."""
+
+
+class Watchdog:
+    """Calls on_timeout from a timer thread if the guarded block outlives `timeout` seconds.
+
+    Used around a single engine call: on_timeout kills the engine process, which makes
+    the blocked call fail instead of hanging the batch forever.
+
+        with Watchdog(30, backend.kill) as watchdog:
+            backend.convert(...)
+        if watchdog.fired: ...
+    """
+
+    def __init__(self, timeout, on_timeout):
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.fired = False
+        self._timer = None
+
+    def _fire(self):
+        self.fired = True
+        logger.error(f"Watchdog: no response after {self.timeout}s, killing the engine")
+        try:
+            self.on_timeout()
+        except Exception as e:
+            logger.error(f"Watchdog could not kill the engine: {e}")
+
+    def __enter__(self):
+        if self.timeout:
+            self._timer = threading.Timer(self.timeout, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._timer:
+            self._timer.cancel()
+        return False
+
+
+def is_transient(error):
+    """Whether an engine error looks temporary (busy or crashed engine) rather than a bad deck."""
+    hresult = getattr(error, "hresult", None)
+    if hresult is None and getattr(error, "args", None) and isinstance(error.args[0], int):
+        hresult = error.args[0]  # pywintypes.com_error puts the HRESULT first
+    if hresult in TRANSIENT_HRESULTS:
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in TRANSIENT_MESSAGES)
+
+
+def process_rss(pid):
+    """Resident set size of a process in bytes, or None when it can't be measured."""
+    if not pid:
+        return None
+    try:
+        import psutil  # optional; the only portable way on Windows
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def child_pids(pid):
+    """Every descendant of a process (children, grandchildren, ...); empty when unknown."""
+    try:
+        import psutil  # optional; the only portable way on Windows
+        return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+    except ImportError:
+        pass
+    except Exception:
+        return []
+    parents = {}
+    try:
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        # The command name may contain spaces; the ppid follows its closing ")"
+                        parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                except (OSError, ValueError, IndexError):
+                    continue
+    except OSError:
+        return []
+    descendants, pending = [], [pid]
+    while pending:
+        parent = pending.pop()
+        children = [child for child, ppid in parents.items() if ppid == parent]
+        descendants += children
+        pending += children
+    return descendants
+
+
+def process_tree_rss(pid):
+    """Resident set size of a process plus all its descendants, or None when it can't be measured."""
+    sizes = [process_rss(member) for member in [pid] + child_pids(pid)] if pid else []
+    sizes = [size for size in sizes if size is not None]
+    return sum(sizes) if sizes else None
+
+
+def kill_process(pid):
+    """Forcefully end a process (TerminateProcess on Windows, SIGKILL elsewhere)."""
+    import signal
+
+    os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+def kill_process_group(pid):
+    """Forcefully end a process started with start_new_session (POSIX) or
+    CREATE_NEW_PROCESS_GROUP (Windows) together with everything it spawned."""
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    import signal
+
+    os.killpg(pid, signal.SIGKILL)
@@ -0,0 +1,155 @@
+import os
+import json
+import logging
+from pathlib import Path
+
+from file_scanner import scan_presentations
+from preflight import inspect_presentation
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = Path.home() / ".pptx2pdf" / "eta_history.json"
+HISTORY_VERSION = 1
+# Most recent conversions kept per backend; old timings stop describing a changed machine
+MAX_SAMPLES = 500
+# Below this many conversions the fit is noise: fall back to the mean time per file
+MIN_SAMPLES = 5
+# Seconds per file assumed before anything has been converted on this machine
+DEFAULT_SECONDS = 10.0
+# Keeps the fit solvable when every sample has the same size or slide count
+RIDGE = 1e-6
+
+
+def deck_features(path):
+    """(size in bytes, slide count or None) of a deck, from a pre-flight read of its zip directory."""
+    try:
+        report = inspect_presentation(path)
+    except OSError:
+        return 0, None
+    return report["size"] or 0, report["slides"]
+
+
+def folder_features(folder, recursive=False):
+    """deck_features of every deck a batch of this folder would convert, in scan order."""
+    return [deck_features(path) for path in scan_presentations(folder, recursive)]
+
+
+def _solve(matrix, vector):
+    """Solve a small linear system by Gaussian elimination; None when it is singular."""
+    size = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(size):
+            if row != column:
+                factor = rows[row][column] / rows[column][column]
+                rows[row] = [a - factor * b for a, b in zip(rows[row], rows[column])]
+    return [rows[row][size] / rows[row][row] for row in range(size)]
+
+
+class ThroughputModel:
+    """Predicts conversion seconds from deck size and slide count, learned from past conversions.
+
+    Every converted file's record (see metrics.py) adds a (MiB, slides, seconds)
+    sample for its backend; predictions come from a least-squares fit of
+    seconds = a + b * MiB + c * slides over the most recent samples. The history
+    is a small JSON file, so estimates improve across sessions. Not thread-safe:
+    the GUI only touches it from the Tk thread.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH, max_samples=MAX_SAMPLES):
+        self.path = Path(path)
+        self.max_samples = max_samples
+        self.samples = self._load()  # backend -> [[mib, slides, seconds], ...]
+        self._fits = {}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                history = json.load(f)
+            if history.get("version") == HISTORY_VERSION:
+                return history["samples"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable ETA history {self.path}: {e}")
+        return {}
+
+    def save(self):
+        """Write the history atomically; failures only cost future estimates."""
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": HISTORY_VERSION, "samples": self.samples}, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save ETA history {self.path}: {e}")
+
+    def observe(self, record):
+        """Learn from a conversion record; returns True when it was a usable sample."""
+        if not record or record.get("outcome") != "converted" or not record.get("total_seconds"):
+            return False
+        if record.get("slides_reexported") is not None or record.get("input_size") is None:
+            return False  # partial re-exports say nothing about a full conversion
+        samples = self.samples.setdefault(record["backend"], [])
+        samples.append([record["input_size"] / 1024 ** 2, record.get("slide_count") or 0,
+                        record["total_seconds"]])
+        del samples[:-self.max_samples]
+        self._fits.clear()  # pooled fits of other backends include these samples too
+        return True
+
+    def _samples_for(self, backend):
+        samples = self.samples.get(backend) if backend else None
+        if not samples:  # nothing for this engine yet: any engine beats the default
+            samples = [sample for backend_samples in self.samples.values() for sample in backend_samples]
+        return samples
+
+    def _fit(self, backend):
+        """(intercept, seconds per MiB, seconds per slide, mean slides), or None without history."""
+        if backend in self._fits:
+            return self._fits[backend]
+        samples = self._samples_for(backend)
+        fit = None
+        if samples:
+            mean_seconds = sum(sample[2] for sample in samples) / len(samples)
+            mean_slides = sum(sample[1] for sample in samples) / len(samples)
+            fit = (mean_seconds, 0.0, 0.0, mean_slides)
+            if len(samples) >= MIN_SAMPLES:
+                # Normal equations of least squares over the features [1, MiB, slides]
+                matrix = [[0.0] * 3 for _ in range(3)]
+                vector = [0.0] * 3
+                for mib, slides, seconds in samples:
+                    features = (1.0, mib, slides)
+                    for i in range(3):
+                        vector[i] += features[i] * seconds
+                        for j in range(3):
+                            matrix[i][j] += features[i] * features[j]
+                for i in range(1, 3):
+                    matrix[i][i] += RIDGE * len(samples)
+                coefficients = _solve(matrix, vector)
+                if coefficients:
+                    fit = (*coefficients, mean_slides)
+        self._fits[backend] = fit
+        return fit
+
+    def predict(self, size, slides=None, backend=None):
+        """Expected seconds to convert one deck of size bytes and slides slides."""
+        fit = self._fit(backend)
+        if fit is None:
+            return DEFAULT_SECONDS
+        intercept, per_mib, per_slide, mean_slides = fit
+        seconds = intercept + per_mib * size / 1024 ** 2 + per_slide * (mean_slides if slides is None else slides)
+        # A linear fit can go negative for tiny decks; nothing converts in no time
+        return max(seconds, 0.1)
+
+    def predict_many(self, features, backend=None):
+        """Expected seconds for a list of (size, slides) decks converted one after another."""
+        return sum(self.predict(size, slides, backend) for size, slides in features)
+
+    def sample_count(self, backend=None):
+        return len(self._samples_for(backend))
@@ -0,0 +1,88 @@
+import os
+import fnmatch
+import logging
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+POWERPOINT_EXTENSIONS = (".ppt", ".pptx")
+
+
+def _matches(patterns, relative_path, name):
+    """Case-insensitive glob match against either the relative path or the bare name."""
+    relative_path = relative_path.lower()
+    name = name.lower()
+    return any(fnmatch.fnmatchcase(relative_path, pattern.lower()) or fnmatch.fnmatchcase(name, pattern.lower())
+               for pattern in patterns)
+
+
+def is_presentation(relative_path, name, include=(), exclude=(), extensions=POWERPOINT_EXTENSIONS):
+    """Whether a file (path relative to the scan root, using "/") passes the scan filters."""
+    lowered = name.lower()
+    if not lowered.endswith(tuple(extension.lower() for extension in extensions)) or lowered.startswith("~$"):
+        return False
+    if include and not _matches(include, relative_path, name):
+        return False
+    if exclude and _matches(exclude, relative_path, name):
+        return False
+    return True
+
+
+def is_excluded_folder(relative_path, name, exclude=()):
+    return bool(exclude) and _matches(exclude, relative_path, name)
+
+
+def scan_presentations(root, recursive=False, include=None, exclude=None,
+                       extensions=POWERPOINT_EXTENSIONS):
+    """Lazily yield PowerPoint files under root, as they are found.
+
+    Built on os.scandir so nothing is materialised up front: a caller can start
+    converting the first file while the rest of a large share is still being read.
+    Extensions match case-insensitively (.PPTX counts), every file is yielded at
+    most once even if it is reachable twice, and Office lock files (~$name.pptx)
+    are skipped. include/exclude are glob patterns matched against the path
+    relative to root (using "/") or the file name; exclude also prunes folders.
+    """
+    root = Path(root)
+    seen = set()
+    stack = [(root, "")]
+
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                # Sorted so runs (and shards of runs) see files in a stable order
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            relative_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not is_excluded_folder(relative_path, entry.name, exclude):
+                        subdirectories.append((Path(entry.path), relative_path + "/"))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if not is_presentation(relative_path, entry.name, include, exclude, extensions):
+                continue
+
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            identity = (stat.st_dev, stat.st_ino)
+            if stat.st_ino and identity in seen:
+                continue  # same file reached twice (hardlink, symlink, case alias)
+            seen.add(identity)
+            yield Path(entry.path)
+
+        # Reversed so the stack pops subfolders in name order (depth-first)
+        stack.extend(reversed(subdirectories))
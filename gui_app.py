@@ -1,10 +1,29 @@
+import time
+STARTUP_STARTED = time.perf_counter() # startup instrumentation: everything is measured from here
+
 import tkinter as tk
 import os # for basic GUI elements
+import queue # worker -> GUI events
+import logging
+import threading # estimates are computed off the UI thread
 from tkinter import ttk # for themed widgets
 from tkinter import filedialog, messagebox # keep messagebox for errors
 
-# --- Import converter class ---
-from pptToPdf import PPTXtoPDFConverter # IMPORTANT: pptToPdf.py should be in the same directory
+from conversion_worker import NORMAL, PRIORITY_NAMES, ConversionJob, ConversionWorker, JobQueue
+from eta_model import ThroughputModel, deck_features, folder_features
+
+# How often the Tk loop checks the worker's event queue (milliseconds)
+POLL_INTERVAL_MS = 100
+# How often the queue panel's ETAs count down (milliseconds)
+ETA_REFRESH_MS = 1000
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+
+
+def create_converter():
+    """Runs on the worker thread: the converter module (and the engine) load off the UI thread."""
+    # --- Import converter class ---
+    from pptToPdf import PPTXtoPDFConverter # IMPORTANT: pptToPdf.py should be in the same directory
+    return PPTXtoPDFConverter()
 
 class ConverterApp:
     def __init__(self, root):
@@ -15,27 +34,42 @@ class ConverterApp:
         # Register the closing protocol
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
-        # --- Moved back here: Create the converter instance ---
-         # --- Step 2: Create an instance of the converter ---
-        try:
-            # Instantiate the converter logic. This might take some time if the library is large.
-            # If it needs to start PowerPoint. Consider adding a status message later.
-            self.converter = PPTXtoPDFConverter()
-        except Exception as e:
-            # Handle the exception here. You can show an error message to the user.
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.root.destroy() # Close the application
-            return
+        self.closing = False # set once the window is being destroyed
+        # Seconds since STARTUP_STARTED for each startup milestone (logged once the engine is ready)
+        self.startup_timings = {"imports": time.perf_counter() - STARTUP_STARTED}
+        
+        # --- Create the background worker that owns the converter ---
+        # Conversions run on this thread so the window stays responsive; the converter
+        # (and PowerPoint) is created there too, because COM objects are tied to their thread.
+        # The engine warms up in the background while the window is already drawn.
+        # Its JobQueue runs jobs by priority and lets the queue panel reorder them.
+        self.worker = ConversionWorker(create_converter, JobQueue())
+        self.worker.start()
+        
+        # Seconds per deck learned from earlier conversions, kept across sessions
+        self.eta_model = ThroughputModel()
+        self.backend_name = None # known once the engine is ready
+        # job id -> {"job", "status", "files" (deck size/slides, None until estimated), "done" (files),
+        #            "since" (last progress), "started", "took" (seconds)}
+        self.job_rows = {}
         
         self.create_widgets() # Call the method to create widgets
+        self.status_var.set("Warming up the conversion engine... (you can already pick files)")
+        self.root.after_idle(self.on_first_paint)
+        self.root.after(POLL_INTERVAL_MS, self.poll_worker_events)
+        self.root.after(ETA_REFRESH_MS, self.refresh_queue_loop)
         
         
     def on_closing(self):
         """Handles the window closing event."""
         print("Close button clicked. Attempting to close converter...") # Debug message
+        self.closing = True
         try:
-            if hasattr(self, 'converter') and self.converter:
-                self.converter.close() # Call the new close method
+            if hasattr(self, 'worker') and self.worker.is_alive():
+                # The worker cancels its job between files and closes the converter itself
+                self.worker.stop()
+                self.worker.join(timeout=30)
+            self.eta_model.save()
         except Exception as e:
             # Log or show error id closing the converter fails
             print(f"Error during converter close: {e}")
@@ -74,7 +108,7 @@ class ConverterApp:
         
         # 3. Status Label
         self.status_var = tk.StringVar() # Use a StringVar to easily update the label text
-        self.status_var.set("Ready. Select an action.") # Initial message
+        self.status_var.set("Ready. Select an action.") # Initial message (replaced while warming up)
         status_label = ttk.Label(
             main_frame,
             textvariable=self.status_var, # Link the label to the StringVar
@@ -83,6 +117,56 @@ class ConverterApp:
         # Place label in row 2, column 0. pady adds space above it.
         status_label.grid(row=2, column=0, padx=5,pady=10, sticky=(tk.W, tk.E))
         
+        # 4. Progress Bar (determinate during batches)
+        self.progress_bar = ttk.Progressbar(main_frame, orient=tk.HORIZONTAL, mode="determinate", length=350)
+        self.progress_bar.grid(row=3, column=0, sticky=(tk.W, tk.E))
+        
+        # 5. Progress details: current file, n/total, throughput, ETA
+        self.progress_var = tk.StringVar()
+        progress_label = ttk.Label(main_frame, textvariable=self.progress_var, wraplength=350)
+        progress_label.grid(row=4, column=0, sticky=(tk.W, tk.E))
+        
+        # 6. Cancel Button - stops the running job after the current file
+        self.cancel_button = ttk.Button(
+            main_frame,
+            text="Cancel",
+            command=self.cancel_conversion,
+            state=tk.DISABLED
+        )
+        self.cancel_button.grid(row=5, column=0, sticky=(tk.W, tk.E))
+        
+        # 7. Priority given to newly queued jobs
+        priority_frame = ttk.Frame(main_frame)
+        priority_frame.grid(row=6, column=0, sticky=(tk.W, tk.E))
+        ttk.Label(priority_frame, text="Priority for new jobs:").pack(side=tk.LEFT)
+        self.priority_var = tk.StringVar(value=PRIORITY_NAMES[NORMAL])
+        ttk.Combobox(priority_frame, textvariable=self.priority_var, state="readonly", width=8,
+                     values=list(PRIORITY_NAMES.values())).pack(side=tk.LEFT, padx=5)
+        
+        # 8. Job queue: running job first, then waiting jobs in the order they will run
+        queue_frame = ttk.Frame(main_frame)
+        queue_frame.grid(row=7, column=0, sticky=(tk.W, tk.E))
+        columns = {"job": ("Job", 170), "priority": ("Priority", 60), "status": ("Status", 70),
+                   "takes": ("Takes", 60), "finish": ("Done in", 60)}
+        self.queue_tree = ttk.Treeview(queue_frame, columns=list(columns), show="headings", height=6,
+                                       selectmode="browse")
+        for column, (heading, width) in columns.items():
+            self.queue_tree.heading(column, text=heading)
+            self.queue_tree.column(column, width=width, stretch=column == "job")
+        scrollbar = ttk.Scrollbar(queue_frame, orient=tk.VERTICAL, command=self.queue_tree.yview)
+        self.queue_tree.configure(yscrollcommand=scrollbar.set)
+        self.queue_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # 9. Queue controls: reorder or cancel the selected job
+        queue_buttons = ttk.Frame(main_frame)
+        queue_buttons.grid(row=8, column=0, sticky=(tk.W, tk.E))
+        for text, command in (("Move Up", lambda: self.move_selected_job(-1)),
+                              ("Move Down", lambda: self.move_selected_job(1)),
+                              ("Cancel Job", self.cancel_selected_job),
+                              ("Clear Finished", self.clear_finished_jobs)):
+            ttk.Button(queue_buttons, text=text, command=command).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        
         # --- Add padding to all widgets in the frame ---
         for child in main_frame.winfo_children():
             child.grid_configure(padx=5, pady=5)
@@ -119,49 +203,10 @@ class ConverterApp:
             self.status_var.set("Operation cancelled. Ready.") # Updated message
             return
         
-        # --- Perform Conversion ---
-        try:
-            self.status_var.set(f"Converting {os.path.basename(input_path)}...")
-            #Disable the buttons while conversion is in progress
-            self.single_file_button.config(state=tk.DISABLED)
-            # Also disable the batch convert button
-            if hasattr(self, 'batch_convert_button'):
-                self.batch_convert_button.config(state=tk.DISABLED)
-            self.root.update_idletasks() # Show status update immediately
-            
-            success = self.converter.convert_single_file(input_path, output_path, overwrite=True) # Assuming overwrite is okay
-
-            if success:
-                self.status_var.set(f"Success! PDF saved to: {output_path}")
-                # Ask to open output folder
-                if messagebox.askyesno("Success", f"Conversion successful!\nPDF saved to: \n{output_path}\nOpen the output folder?"):
-                    try:
-                        # Use os.startfile on Windows, or subprocess.call for cross-platform
-                        os.startfile(os.path.dirname(output_path))
-                    except Exception as e:
-                        self.status_var.set(f"Success! PDF saved, but could not open folder: {e}")
-                        messagebox.showwarning("Warning", f"Could not open  the output folder: \n{e}")
-                        
-            else:
-                # Check the log file for specific errors if conversion method returns False
-                self.status_var.set("Conversion failed. Check conversion.log for details.")
-                messagebox.showerror("Conversion Failed", "Could not convert the file. Please check conversion.log for more information.")
-        except Exception as e:
-            # Catch unexpected errors during conversion process
-            self.status_var.set(f"Error during conversion: {e}")
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            # Log the error if possible (converter instance might handle logging)
-            if hasattr(self.converter, 'logger'):
-                self.converter.logger.error(f"GUI Error during single conversion: {e}", exc_info=True)
-        
-        finally:
-            # Re-enable buttons regardless of success or failure
-             self.single_file_button.config(state=tk.NORMAL)
-             if hasattr(self, 'batch_convert_button'):
-                 self.batch_convert_button.config(state=tk.NORMAL)
-            # Set status back to ready after completion or error
-             if 'Success!' not in self.status_var.get():
-                 self.status_var.set("Ready. Select an action")
+        # --- Queue Conversion on the background worker ---
+        # Overwrite is okay: the user already confirmed the save dialog
+        self.submit_job(ConversionJob("single", input_path, output_path, overwrite=True,
+                                      priority=self.selected_priority()))
                 
     
     def select_and_convert_batch(self):
@@ -188,53 +233,275 @@ class ConverterApp:
             self.status_var.set("Operation cancelled.")
             return
         
-        # --- Perform Batch Conversion ---
-        try:
-            self.status_var.set(f"Starting batch conversion in {os.path.basename(input_folder)}...")
-            # Disable buttons during conversion
-            self.single_file_button.config(state=tk.DISABLED)
-            self.batch_convert_button.config(state=tk.DISABLED)
-            self.root.update_idletasks() # Show status update immediately
-            
-            # pass GUI mode to batch_convert method
-            # Call the batch convert method from the converter instance
-            success = self.converter.batch_convert(input_folder, output_folder, overwrite=True, gui_mode=True) # Assuming overwrite is okay
+        # --- Queue Batch Conversion on the background worker ---
+        # Buttons stay enabled, so a second batch can be queued while this one runs
+        self.submit_job(ConversionJob("batch", input_folder, output_folder, overwrite=True, # Assuming overwrite is okay
+                                      priority=self.selected_priority()))
             
-            if success:
-                # Ideally, batch_convert should return a list of converted files or success messages
-                # For testing, using a generic success message
-                self.status_var.set(f"Batch conversion completed for folder: {os.path.basename(input_folder)}")
-                if messagebox.askyesno("Success", f"Batch conversion complete!\nPDFs saved in:\n{output_folder}\n\nOpen the output folder?"):
-                    try:
-                        os.startfile(output_folder)
-                    except Exception as e:
-                        self.status_var.set(f"Batch conversion complete! Couldn't open folder: {e}")
-                        messagebox.showwarning("Warning", f"Could not open the output folder: \n{e}")
+    def selected_priority(self):
+        return next(priority for priority, name in PRIORITY_NAMES.items() if name == self.priority_var.get())
+    
+    def submit_job(self, job):
+        """Adds a job to the queue panel, starts estimating its duration and queues it on the worker."""
+        self.job_rows[job.id] = {"job": job, "status": "queued", "files": None, "done": 0, "since": None,
+                               "started": None, "took": None}
+        self.queue_tree.insert("", tk.END, iid=str(job.id))
+        threading.Thread(target=self.estimate_job, args=(job,), name="eta-estimator", daemon=True).start()
+        self.worker.submit(job)
+        self.refresh_queue_view()
+    
+    def estimate_job(self, job):
+        """Runs on a helper thread: reads the size and slide count of every deck the job will convert."""
+        try:
+            files = [deck_features(job.input_path)] if job.kind == "single" else folder_features(job.input_path)
+        except OSError:
+            files = []
+        self.worker.events.put(("job_estimated", {"job": job, "files": files}))
+    
+    def selected_job_row(self):
+        selection = self.queue_tree.selection()
+        return self.job_rows.get(int(selection[0])) if selection else None
+    
+    def move_selected_job(self, offset):
+        row = self.selected_job_row()
+        if row and row["status"] == "queued" and self.worker.jobs.move(row["job"], offset):
+            self.refresh_queue_view()
+    
+    def cancel_selected_job(self):
+        """Withdraws a waiting job, or stops the running one after its current file."""
+        row = self.selected_job_row()
+        if not row or row["status"] in FINISHED_STATUSES:
+            return
+        if self.worker.jobs.remove(row["job"]):
+            row["job"].cancel()
+            row["status"] = "cancelled"
+            self.refresh_queue_view()
+        elif row["status"] == "running":
+            self.cancel_conversion()
+    
+    def clear_finished_jobs(self):
+        for job_id, row in list(self.job_rows.items()):
+            if row["status"] in FINISHED_STATUSES:
+                del self.job_rows[job_id]
+                self.queue_tree.delete(str(job_id))
+    
+    def cancel_conversion(self):
+        """Stops the running job cleanly after the file currently being converted."""
+        job = self.worker.cancel_current()
+        if job:
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_var.set("Cancelling after the current file...")
+    
+    # --- Worker events (always handled on the Tk main thread) ---
+    def poll_worker_events(self):
+        """Drains the worker's event queue, then re-schedules itself on the Tk loop."""
+        try:
+            while not self.closing:
+                event, payload = self.worker.events.get_nowait()
+                handler = getattr(self, f"on_{event}", None)
+                if handler:
+                    handler(payload)
+        except queue.Empty:
+            pass
+        if self.worker.is_alive() and not self.closing:
+            self.root.after(POLL_INTERVAL_MS, self.poll_worker_events)
+    
+    def on_first_paint(self):
+        self.startup_timings["first_paint"] = time.perf_counter() - STARTUP_STARTED
+    
+    def on_ready(self, payload):
+        self.startup_timings["ready"] = time.perf_counter() - STARTUP_STARTED
+        timings = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.startup_timings.items())
+        print(f"Startup timings: {timings}")
+        logging.info(f"GUI startup timings: {timings}")
+        self.backend_name = self.worker.converter.backend.name
+        if self.worker.jobs.empty() and self.worker.current_job is None:
+            self.status_var.set("Ready. Select an action.")
+    
+    def on_init_failed(self, payload):
+        # Handle the exception here. You can show an error message to the user.
+        messagebox.showerror("Error", f"An error occurred: {payload['error']}")
+        self.closing = True
+        self.root.destroy() # Close the application
+    
+    def on_job_queued(self, payload):
+        if not self.worker.ready.is_set():
+            self.status_var.set("Job queued. It will start as soon as the engine has warmed up.")
+        elif self.worker.current_job is not None:
+            self.status_var.set(f"Job queued ({payload['queued']} waiting). It will start when the current one finishes.")
+    
+    def on_job_estimated(self, payload):
+        row = self.job_rows.get(payload["job"].id)
+        if row:
+            row["files"] = payload["files"]
+            self.refresh_queue_view()
+    
+    def on_job_started(self, payload):
+        job = payload["job"]
+        row = self.job_rows.get(job.id)
+        if row:
+            row.update(status="running", since=time.monotonic(), started=time.monotonic())
+            self.refresh_queue_view()
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_var.set("")
+        if job.kind == "single":
+            self.status_var.set(f"Converting {os.path.basename(job.input_path)}...")
+            # Unknown duration for a single file: just show activity
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.start(15)
+        else:
+            self.status_var.set(f"Starting batch conversion in {os.path.basename(job.input_path)}...")
+            self.progress_bar.config(mode="determinate", value=0)
+    
+    def on_progress(self, payload):
+        # The folder is scanned while converting, so total is unknown (None) until the scan ends
+        total = payload["total"] if payload["total"] is not None else payload["discovered"]
+        total_text = str(payload["total"]) if payload["total"] is not None else f"{payload['discovered']}+"
+        self.progress_bar.config(maximum=max(total, 1), value=payload["done"])
+        row = self.job_rows.get(payload["job"].id)
+        if row and payload["done"] != row["done"]:
+            row.update(done=payload["done"], since=time.monotonic())
+        if payload["event"] == "file_started":
+            self.status_var.set(f"Converting {payload['file']} ({payload['done'] + 1}/{total_text})")
+        details = f"{payload['done']}/{total_text} done"
+        if payload["rate"]:
+            details += f" - {payload['rate'] * 60:.1f} files/min"
+        if payload["eta"] is not None:
+            minutes, seconds = divmod(int(payload["eta"]), 60)
+            details += f" - ETA {minutes}:{seconds:02d}"
+        self.progress_var.set(details)
+    
+    def on_file_finished(self, payload):
+        # Every converted file of a batch teaches the ETA model
+        self.eta_model.observe(payload["record"])
+    
+    def on_job_finished(self, payload):
+        job = payload["job"]
+        self.reset_progress()
+        self.eta_model.observe(payload["record"])
+        self.eta_model.save()
+        status = "cancelled" if payload["cancelled"] else "done" if payload["success"] else "failed"
+        self.finish_job_row(job, status)
+        if payload["cancelled"]:
+            self.status_var.set("Conversion cancelled. Ready.")
+            return
+        if not self.queue_idle():
+            # More work is queued: report in the queue panel instead of stopping for a dialog
+            outcome = "converted" if payload["success"] else "FAILED (see conversion.log)"
+            self.status_var.set(f"{os.path.basename(job.input_path)} {outcome}. Continuing with the next job...")
+            return
+        if job.kind == "single":
+            if payload["success"]:
+                self.status_var.set(f"Success! PDF saved to: {job.output_path}")
+                # Ask to open output folder
+                if messagebox.askyesno("Success", f"Conversion successful!\nPDF saved to: \n{job.output_path}\nOpen the output folder?"):
+                    self.open_folder(os.path.dirname(job.output_path))
+            else:
+                # Check the log file for specific errors if conversion method returns False
+                self.status_var.set("Conversion failed. Check conversion.log for details.")
+                messagebox.showerror("Conversion Failed", "Could not convert the file. Please check conversion.log for more information.")
+        else:
+            if payload["success"]:
+                self.status_var.set(f"Batch conversion completed for folder: {os.path.basename(job.input_path)}")
+                if messagebox.askyesno("Success", f"Batch conversion complete!\nPDFs saved in:\n{job.output_path}\n\nOpen the output folder?"):
+                    self.open_folder(job.output_path)
             else:
                 # If batch_convert returns False, it likely logged the issue.
                 self.status_var.set("Batch conversion failed. Check conversion.log for details.")
                 messagebox.showerror("Conversion Failed", "Batch conversion failed. Please check conversion.log for more information.")
-        except Exception as e:
-            # Catch unexpected errors
-            self.status_var.set(f"Error during batch conversion: {e}")
-            messagebox.showerror("Error", f"An unexpected error occured during batch conversion:\n{e}")
-            if hasattr(self.converter, 'logger'):
-                self.converter.logger.error(f"GUI Error during batch conversion: {e}", exc_info=True)
+    
+    def on_job_failed(self, payload):
+        # Catch unexpected errors raised on the worker
+        self.reset_progress()
+        self.finish_job_row(payload["job"], "failed")
+        self.status_var.set(f"Error during conversion: {payload['error']}")
+        messagebox.showerror("Error", f"An unexpected error occurred:\n{payload['error']}")
+    
+    def reset_progress(self):
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_var.set("")
+        self.cancel_button.config(state=tk.DISABLED)
+    
+    # --- Job queue panel ---
+    def finish_job_row(self, job, status):
+        row = self.job_rows.get(job.id)
+        if row:
+            row["status"] = status
+            if row["started"]:
+                row["took"] = time.monotonic() - row["started"]
+            self.refresh_queue_view()
+    
+    def queue_idle(self):
+        return not any(row["status"] in ("queued", "running") for row in self.job_rows.values())
+    
+    def refresh_queue_loop(self):
+        """Counts the ETAs down once a second."""
+        if self.closing:
+            return
+        self.refresh_queue_view()
+        self.root.after(ETA_REFRESH_MS, self.refresh_queue_loop)
+    
+    def refresh_queue_view(self):
+        """Re-sorts the queue panel and recomputes each job's duration and finish time.
         
-        finally:
-            # Re-enable buttons regardless of success or failure
-            self.single_file_button.config(state=tk.NORMAL)
-            self.batch_convert_button.config(state=tk.NORMAL)
-            # Set status back to ready after completion or error
-            if 'Batch conversion' not in self.status_var.get():
-                self.status_var.set("Ready. Select an action")
-            
+        A job's duration is the ETA model's prediction for its decks (for the running
+        job, the decks it has not finished yet, minus the time already spent on the
+        current one); finish times add up the durations of every job ahead of it.
+        """
+        now = time.monotonic()
+        running = [row for row in self.job_rows.values() if row["status"] == "running"]
+        waiting = [self.job_rows[job.id] for job in self.worker.jobs.snapshot() if job.id in self.job_rows]
+        finished = [row for row in self.job_rows.values() if row["status"] in FINISHED_STATUSES]
+        # Jobs the worker has taken off its queue but not yet reported as started
+        listed = {id(row) for row in running + waiting + finished}
+        waiting += [row for row in self.job_rows.values() if id(row) not in listed]
+        
+        clock = 0.0 # seconds from now until the jobs so far are done (None once unknown)
+        for index, row in enumerate(running + waiting + finished):
+            job = row["job"]
+            takes = finish = ""
+            if row["status"] in FINISHED_STATUSES:
+                if row["took"] is not None:
+                    takes = format_duration(row["took"])
+            elif row["files"] is None:
+                takes = "estimating..."
+                clock = None
+            else:
+                seconds = self.eta_model.predict_many(row["files"][row["done"]:], self.backend_name)
+                if row["status"] == "running":
+                    seconds = max(seconds - (now - row["since"]), 0.0)
+                takes = format_duration(seconds)
+                if clock is not None:
+                    clock += seconds
+                    finish = format_duration(clock)
+            iid = str(job.id)
+            self.queue_tree.item(iid, values=(os.path.basename(job.input_path) or job.input_path,
+                                              PRIORITY_NAMES[job.priority], row["status"].capitalize(),
+                                              takes, finish))
+            self.queue_tree.move(iid, "", index)
+    
+    def open_folder(self, folder):
+        try:
+            # Use os.startfile on Windows, or subprocess.call for cross-platform
+            os.startfile(folder)
+        except Exception as e:
+            self.status_var.set(f"Success! PDF saved, but could not open folder: {e}")
+            messagebox.showwarning("Warning", f"Could not open  the output folder: \n{e}")
                 
     def placeholder_action(self):
         print("Button clicked!")
         
     # --- Will add functions for the buttons later ---
     
+
+def format_duration(seconds):
+    """m:ss, or h:mm:ss from an hour up."""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
 # Main execution block
 if __name__ == "__main__":
     root = tk.Tk() # Create the main window instance
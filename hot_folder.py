@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+from pathlib import Path
+
+from file_scanner import is_excluded_folder, is_presentation, scan_presentations
+
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class PollingWatcher:
+    """Portable change detection: rescans the folder and diffs (size, mtime) snapshots."""
+
+    def __init__(self, root, recursive=False, include=None, exclude=None, poll_interval=2.0):
+        self.root = Path(root)
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+        self.poll_interval = poll_interval
+        self.snapshot = self._snapshot()
+        self._next_scan = time.monotonic() + poll_interval
+
+    def _snapshot(self):
+        snapshot = {}
+        for path in scan_presentations(self.root, self.recursive, self.include, self.exclude):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout):
+        """Paths created or modified since the last call, waiting up to timeout seconds."""
+        time.sleep(max(0.0, min(timeout, self._next_scan - time.monotonic())))
+        if time.monotonic() < self._next_scan:
+            return set()
+        self._next_scan = time.monotonic() + self.poll_interval
+        snapshot = self._snapshot()
+        changed = {path for path, signature in snapshot.items() if self.snapshot.get(path) != signature}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux change detection through inotify, loaded via ctypes (no extra dependency).
+
+    Reports files as the kernel sees them being written or moved in, so nothing is
+    rescanned between drops. On a queue overflow it falls back to one full rescan.
+    """
+
+    def __init__(self, root, recursive=False, include=None, exclude=None):
+        self.root = Path(root)
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}  # watch descriptor -> (directory, prefix relative to root)
+        self._rescan_needed = False
+        self._add_watch(self.root, "")
+
+    def _add_watch(self, directory, prefix):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            logger.warning(f"Cannot watch {directory}: {os.strerror(ctypes.get_errno())}")
+            return
+        self.watches[wd] = (Path(directory), prefix)
+        if self.recursive:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and \
+                                not is_excluded_folder(prefix + entry.name, entry.name, self.exclude):
+                            self._add_watch(entry.path, prefix + entry.name + "/")
+            except OSError:
+                pass
+
+    def changes(self, timeout):
+        """Paths created or modified since the last call, waiting up to timeout seconds."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            changed |= self._parse(data)
+        if self._rescan_needed:
+            self._rescan_needed = False
+            changed |= set(scan_presentations(self.root, self.recursive, self.include, self.exclude))
+        return changed
+
+    def _parse(self, data):
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed; rescanning watched folder")
+                self._rescan_needed = True
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF):
+                self.watches.pop(wd, None)
+                continue
+            if wd not in self.watches or not name:
+                continue
+            directory, prefix = self.watches[wd]
+            relative_path = prefix + name
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO) and \
+                        not is_excluded_folder(relative_path, name, self.exclude):
+                    # New subfolder: watch it and pick up anything copied in before the watch existed
+                    self._add_watch(directory / name, relative_path + "/")
+                    changed |= set(scan_presentations(directory / name, True, self.include, self.exclude))
+                continue
+            if is_presentation(relative_path, name, self.include, self.exclude):
+                changed.add(directory / name)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(root, recursive=False, include=None, exclude=None, poll_interval=2.0, use_inotify=None):
+    """inotify on Linux when available, polling everywhere else (or when use_inotify=False)."""
+    if use_inotify is None:
+        use_inotify = sys.platform.startswith("linux")
+    if use_inotify:
+        try:
+            return InotifyWatcher(root, recursive, include, exclude)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable ({e}); falling back to polling")
+    return PollingWatcher(root, recursive, include, exclude, poll_interval)
+
+
+class StabilityTracker:
+    """Debounces files that are still being written.
+
+    A file becomes ready once its size and mtime have not changed for
+    settle_seconds, so a deck is never converted while it is still being copied.
+    """
+
+    def __init__(self, settle_seconds=2.0):
+        self.settle_seconds = settle_seconds
+        self.candidates = {}  # path -> ((size, mtime_ns), stable since)
+
+    def touch(self, path):
+        # Any new event restarts the settle period
+        self.candidates[path] = (None, time.monotonic())
+
+    def ready(self):
+        """Pop and return the candidates whose size and mtime have settled."""
+        now = time.monotonic()
+        settled = []
+        for path, (signature, since) in list(self.candidates.items()):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                del self.candidates[path]  # deleted or renamed away before it settled
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != signature:
+                self.candidates[path] = (current, now)
+            elif now - since >= self.settle_seconds and stat.st_size > 0:
+                del self.candidates[path]
+                settled.append(path)
+        return settled
+
+    def next_deadline(self, default):
+        """Seconds until the next candidate could be ready, capped at default."""
+        if not self.candidates:
+            return default
+        now = time.monotonic()
+        earliest = min(since for _, since in self.candidates.values())
+        return max(0.05, min(default, earliest + self.settle_seconds - now))
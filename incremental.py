@@ -0,0 +1,204 @@
+import re
+import json
+import hashlib
+import zipfile
+import posixpath
+from pathlib import Path
+from xml.etree import ElementTree
+
+
+MANIFEST_VERSION = 1
+REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+SLIDE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+# Parts that never change what is exported, so editing them must not force a full export
+IGNORED_PREFIXES = ("docProps/", "customXml/", "ppt/viewProps.xml", "ppt/commentAuthors.xml",
+                    "ppt/comments/", "ppt/notesSlides/", "ppt/notesMasters/", "ppt/printerSettings/")
+# Relationships from a slide that belong to the deck's structure (or aren't exported)
+SHARED_REL_TYPES = ("/slideLayout", "/notesSlide", "/comments")
+HIDDEN_SLIDE = re.compile(rb"<p:sld\b[^>]*\sshow=\"(?:0|false)\"")
+# Above this share of changed slides a full export is cheaper than splicing
+MAX_CHANGED_FRACTION = 0.5
+
+
+def _rels_path(part):
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def _relationships(deck, part, names):
+    """(type, target part) pairs of a part's internal relationships."""
+    rels = _rels_path(part)
+    if rels not in names:
+        return []
+    relationships = []
+    for element in ElementTree.fromstring(deck.read(rels)).iter(REL_NS + "Relationship"):
+        if element.get("TargetMode") == "External":
+            continue
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(part), element.get("Target")))
+        relationships.append((element.get("Type"), target.lstrip("/")))
+    return relationships
+
+
+def _slide_order(deck, names):
+    """Slide part names in presentation order."""
+    targets = dict((rel_id, target) for rel_id, target in _presentation_slides(deck, names))
+    presentation = ElementTree.fromstring(deck.read("ppt/presentation.xml"))
+    order = []
+    for element in presentation.iter():
+        if element.tag.endswith("}sldId"):
+            rel_id = next((value for key, value in element.attrib.items() if key.endswith("}id")), None)
+            if rel_id in targets:
+                order.append(targets[rel_id])
+    return order
+
+
+def _presentation_slides(deck, names):
+    rels = _rels_path("ppt/presentation.xml")
+    for element in ElementTree.fromstring(deck.read(rels)).iter(REL_NS + "Relationship"):
+        if element.get("Type") == SLIDE_REL:
+            target = posixpath.normpath(posixpath.join("ppt", element.get("Target")))
+            yield element.get("Id"), target.lstrip("/")
+
+
+def slide_fingerprint(path):
+    """Per-slide content hashes plus one hash of everything the slides share.
+
+    A slide's hash covers its XML, its relationships and every part it references
+    (images, charts, embedded objects, recursively), so editing one slide changes
+    only that slide's hash. Layouts, masters, themes, slide order and anything
+    else outside the slides go into "structure".
+    """
+    with zipfile.ZipFile(path) as deck:
+        names = set(deck.namelist())
+        order = _slide_order(deck, names)
+        owned = set()
+        slides = []
+        hidden = False
+        for part in order:
+            digest = hashlib.sha256()
+            pending = [part]
+            seen = set()
+            while pending:
+                current = pending.pop()
+                if current in seen or current not in names:
+                    continue
+                seen.add(current)
+                data = deck.read(current)
+                if current == part and HIDDEN_SLIDE.search(data[:4096]):
+                    hidden = True
+                digest.update(current.encode("utf-8") + b"\0" + data)
+                rels = _rels_path(current)
+                if rels in names:
+                    seen.add(rels)
+                    digest.update(rels.encode("utf-8") + b"\0" + deck.read(rels))
+                for rel_type, target in _relationships(deck, current, names):
+                    if not rel_type.endswith(SHARED_REL_TYPES):
+                        pending.append(target)
+            owned |= seen
+            slides.append(digest.hexdigest())
+
+        structure = hashlib.sha256()
+        for info in sorted(deck.infolist(), key=lambda info: info.filename):
+            name = info.filename
+            if name in owned or name.startswith(IGNORED_PREFIXES) or name.endswith("/"):
+                continue
+            structure.update(name.encode("utf-8") + b"\0" + deck.read(name))
+    return {"structure": structure.hexdigest(), "slides": slides, "hidden": hidden}
+
+
+def manifest_path(output_path):
+    """Sidecar next to the PDF recording what it was built from."""
+    output_path = Path(output_path)
+    return output_path.with_name(f".{output_path.name}.slides.json")
+
+
+def load_manifest(output_path):
+    try:
+        with open(manifest_path(output_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(output_path, fingerprint, options):
+    stat = Path(output_path).stat()
+    manifest = dict(fingerprint, version=MANIFEST_VERSION, options=options,
+                    pdf_size=stat.st_size, pdf_mtime_ns=stat.st_mtime_ns)
+    path = manifest_path(output_path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    temp_path.replace(path)
+
+
+def plan_update(manifest, fingerprint, options, output_path):
+    """Slide ranges to re-export as [(first, last), ...] (1-based), or None for a full export.
+
+    An empty list means the existing PDF is already up to date.
+    """
+    if not manifest or manifest.get("version") != MANIFEST_VERSION or manifest.get("options") != options:
+        return None
+    try:
+        stat = Path(output_path).stat()
+    except OSError:
+        return None
+    if (stat.st_size, stat.st_mtime_ns) != (manifest.get("pdf_size"), manifest.get("pdf_mtime_ns")):
+        return None  # the PDF was replaced or edited since
+    if manifest["structure"] != fingerprint["structure"] or len(manifest["slides"]) != len(fingerprint["slides"]):
+        return None  # layout, master, theme or slide order changed
+    if manifest.get("hidden") or fingerprint["hidden"]:
+        return None  # hidden slides shift page numbers; not worth the bookkeeping
+    changed = [number for number, (old, new) in enumerate(zip(manifest["slides"], fingerprint["slides"]), start=1)
+               if old != new]
+    if len(changed) > MAX_CHANGED_FRACTION * len(fingerprint["slides"]):
+        return None
+    ranges = []
+    for number in changed:
+        if ranges and ranges[-1][1] == number - 1:
+            ranges[-1] = (ranges[-1][0], number)
+        else:
+            ranges.append((number, number))
+    return ranges
+
+
+def pypdf_available():
+    try:
+        import pypdf  # noqa: F401  (optional dependency)
+    except ImportError:
+        return False
+    return True
+
+
+def splice_pages(previous_pdf, replacements, output_path, slide_count):
+    """Write previous_pdf with pages replaced: replacements is [((first, last), pdf_path), ...].
+
+    Needs pypdf. Raises ValueError when a PDF can't be read, the previous PDF doesn't
+    have one page per slide or a range PDF doesn't have the expected page count.
+    """
+    from pypdf import PdfReader, PdfWriter  # optional dependency, only needed here
+    from pypdf.errors import PyPdfError
+
+    try:
+        return _splice(PdfReader, PdfWriter, previous_pdf, replacements, output_path, slide_count)
+    except PyPdfError as e:
+        raise ValueError(f"Cannot splice PDF pages: {e}") from e
+
+
+def _splice(PdfReader, PdfWriter, previous_pdf, replacements, output_path, slide_count):
+    previous = PdfReader(previous_pdf)
+    pages = list(previous.pages)
+    if len(pages) != slide_count:
+        raise ValueError(f"Previous PDF has {len(pages)} pages for {slide_count} slides")
+    for (first, last), pdf_path in replacements:
+        new_pages = PdfReader(pdf_path).pages
+        if len(new_pages) != last - first + 1:
+            raise ValueError(f"Slide range {first}-{last} produced {len(new_pages)} pages")
+        pages[first - 1:last] = list(new_pages)
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(page)
+    if previous.metadata:
+        writer.add_metadata(previous.metadata)
+    with open(output_path, "wb") as f:
+        writer.write(f)
+    return len(pages)
@@ -0,0 +1,153 @@
+import io
+import copy
+import math
+import time
+import shutil
+import struct
+import zipfile
+import logging
+from xml.etree import ElementTree
+
+
+logger = logging.getLogger(__name__)
+
+EMU_PER_INCH = 914400
+DEFAULT_DPI = 150
+JPEG_QUALITY = 85
+COPY_CHUNK_SIZE = 1024 * 1024
+# Formats re-encoded in place; the part name (and so its content type) never changes
+IMAGE_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG"}
+_pillow = None
+
+
+def _load_pillow():
+    """PIL.Image, or None when Pillow is not installed (optional dependency)."""
+    global _pillow
+    if _pillow is None:
+        try:
+            from PIL import Image
+        except ImportError:
+            _pillow = False
+        else:
+            _pillow = Image
+    return _pillow or None
+
+
+def pillow_available():
+    return _load_pillow() is not None
+
+
+def slide_size_inches(archive):
+    """(width, height) of the slides in inches, read from ppt/presentation.xml."""
+    with archive.open("ppt/presentation.xml") as f:
+        for _event, element in ElementTree.iterparse(f):
+            if element.tag.endswith("}sldSz"):
+                return int(element.get("cx")) / EMU_PER_INCH, int(element.get("cy")) / EMU_PER_INCH
+    return 10.0, 7.5  # PowerPoint's 4:3 default
+
+
+def _copy_raw(source, destination, info):
+    """Copy a member's compressed bytes as-is, without inflating and deflating them again.
+
+    zipfile has no public API for this, so it goes through the ZipFile internals;
+    callers fall back to _copy_recompressed if those ever change.
+    """
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, source.fp.read(zipfile.sizeFileHeader))
+    data_offset = (info.header_offset + zipfile.sizeFileHeader
+                   + header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH])
+    new_info = copy.copy(info)
+    new_info.flag_bits &= ~0x08  # sizes are known, so no trailing data descriptor
+    new_info.header_offset = destination.fp.tell()
+    destination.fp.write(new_info.FileHeader())
+    source.fp.seek(data_offset)
+    remaining = info.compress_size
+    while remaining:
+        chunk = source.fp.read(min(COPY_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        destination.fp.write(chunk)
+        remaining -= len(chunk)
+    destination.filelist.append(new_info)
+    destination.NameToInfo[new_info.filename] = new_info
+    destination.start_dir = destination.fp.tell()
+    destination._didModify = True
+
+
+def _copy_recompressed(source, destination, info):
+    """Portable fallback: stream the member through inflate/deflate."""
+    new_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    new_info.compress_type = info.compress_type
+    new_info.external_attr = info.external_attr
+    with source.open(info) as src, destination.open(new_info, "w", force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
+def _downsample(Image, data, image_format, max_width, max_height):
+    """Re-encoded image bytes, or None when the image is already small enough."""
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width <= max_width and image.height <= max_height:
+            return None
+        save_options = {"icc_profile": image.info.get("icc_profile")}
+        if image_format == "JPEG":
+            image.draft(image.mode, (max_width, max_height))  # let libjpeg decode at reduced scale
+            save_options.update(quality=JPEG_QUALITY, optimize=True, exif=image.info.get("exif", b""))
+        scaled = image.copy()
+        scaled.thumbnail((max_width, max_height), Image.LANCZOS)
+        if image_format == "JPEG" and scaled.mode not in ("RGB", "L", "CMYK"):
+            scaled = scaled.convert("RGB")
+        buffer = io.BytesIO()
+        scaled.save(buffer, image_format, **{k: v for k, v in save_options.items() if v is not None})
+    result = buffer.getvalue()
+    return result if len(result) < len(data) else None
+
+
+def optimize_deck(input_path, output_path, dpi=DEFAULT_DPI):
+    """Write a copy of a .pptx with its raster media downsampled to dpi.
+
+    Images are capped at the pixel size they would have if they filled the whole
+    slide at dpi, so nothing on a slide loses resolution below that. Everything
+    else is copied member by member without being decompressed; only one image is
+    held in memory at a time. Returns a stats dict (sizes, images downsampled).
+    """
+    Image = _load_pillow()
+    if Image is None:
+        raise RuntimeError("Media optimization needs Pillow (pip install Pillow)")
+
+    started = time.perf_counter()
+    stats = {"images": 0, "downsampled": 0, "media_bytes_before": 0, "media_bytes_after": 0}
+    copy_member = _copy_raw
+    with zipfile.ZipFile(input_path) as source, zipfile.ZipFile(output_path, "w") as destination:
+        width_inches, height_inches = slide_size_inches(source)
+        max_width = math.ceil(width_inches * dpi)
+        max_height = math.ceil(height_inches * dpi)
+        for info in source.infolist():
+            extension = info.filename[info.filename.rfind("."):].lower()
+            image_format = IMAGE_FORMATS.get(extension)
+            if info.filename.startswith("ppt/media/") and image_format:
+                stats["images"] += 1
+                stats["media_bytes_before"] += info.file_size
+                data = source.read(info)
+                try:
+                    smaller = _downsample(Image, data, image_format, max_width, max_height)
+                except Exception as e:  # unreadable image: leave it to the engine
+                    logger.warning(f"Could not downsample {info.filename} in {input_path}: {e}")
+                    smaller = None
+                if smaller is not None:
+                    stats["downsampled"] += 1
+                    new_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    new_info.compress_type = zipfile.ZIP_STORED  # already compressed image data
+                    destination.writestr(new_info, smaller)
+                    stats["media_bytes_after"] += len(smaller)
+                    continue
+                stats["media_bytes_after"] += info.file_size
+            try:
+                copy_member(source, destination, info)
+            except (AttributeError, TypeError, struct.error) as e:
+                if copy_member is _copy_recompressed:
+                    raise
+                logger.warning(f"Raw zip copy unavailable ({e}); recompressing members instead")
+                copy_member = _copy_recompressed
+                copy_member(source, destination, info)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
@@ -0,0 +1,143 @@
+import json
+import time
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+PHASES = ("open", "export", "close", "total")
+
+
+def conversion_record(input_path, output_path, backend, worker=None):
+    """A blank structured record for one conversion attempt; filled in by the converter."""
+    return {
+        "timestamp": time.time(),
+        "input": str(input_path),
+        "output": str(output_path),
+        "backend": backend,
+        "worker": worker,
+        "outcome": None,  # converted, cache_hit, duplicate, skipped, rejected, timeout or failed
+        "attempts": 0,
+        "input_size": None,
+        "slide_count": None,
+        "optimized_size": None,  # deck size after media downsampling, when it ran
+        "images_downsampled": None,
+        "optimize_seconds": None,
+        "slides_reexported": None,  # set when only changed slides were exported (0 = PDF was current)
+        "open_seconds": None,
+        "export_seconds": None,
+        "close_seconds": None,
+        "total_seconds": None,
+        "output_size": None,
+        "error": None,
+    }
+
+
+class JsonLinesSink:
+    """Appends one JSON object per line. Safe to share between threads and processes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            # One write() per record on an O_APPEND file keeps concurrent writers' lines whole
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class MetricsRegistry:
+    """In-memory counters and latency histograms rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = {}  # (backend, outcome) -> count
+        self.bytes_in = 0
+        self.bytes_out = 0
+        # (backend, phase) -> [bucket counts..., sum, count]
+        self.histograms = {}
+
+    def observe(self, record):
+        with self._lock:
+            key = (record["backend"], record["outcome"])
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+            self.bytes_in += record["input_size"] or 0
+            self.bytes_out += record["output_size"] or 0
+            for phase in PHASES:
+                seconds = record[f"{phase}_seconds"]
+                if seconds is None:
+                    continue
+                histogram = self.histograms.setdefault(
+                    (record["backend"], phase), [0] * len(LATENCY_BUCKETS) + [0.0, 0])
+                for index, bound in enumerate(LATENCY_BUCKETS):
+                    if seconds <= bound:
+                        histogram[index] += 1
+                histogram[-2] += seconds
+                histogram[-1] += 1
+
+    def render(self):
+        with self._lock:
+            lines = [
+                "# HELP pptx2pdf_conversions_total Conversion attempts by outcome.",
+                "# TYPE pptx2pdf_conversions_total counter",
+            ]
+            for (backend, outcome), count in sorted(self.outcomes.items()):
+                lines.append(f'pptx2pdf_conversions_total{{backend="{backend}",outcome="{outcome}"}} {count}')
+            lines += [
+                "# HELP pptx2pdf_input_bytes_total Bytes of input decks processed.",
+                "# TYPE pptx2pdf_input_bytes_total counter",
+                f"pptx2pdf_input_bytes_total {self.bytes_in}",
+                "# HELP pptx2pdf_output_bytes_total Bytes of PDF written.",
+                "# TYPE pptx2pdf_output_bytes_total counter",
+                f"pptx2pdf_output_bytes_total {self.bytes_out}",
+                "# HELP pptx2pdf_phase_seconds Time spent per conversion phase.",
+                "# TYPE pptx2pdf_phase_seconds histogram",
+            ]
+            for (backend, phase), histogram in sorted(self.histograms.items()):
+                labels = f'backend="{backend}",phase="{phase}"'
+                for bound, count in zip(LATENCY_BUCKETS, histogram):
+                    lines.append(f'pptx2pdf_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'pptx2pdf_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram[-1]}')
+                lines.append(f"pptx2pdf_phase_seconds_sum{{{labels}}} {histogram[-2]}")
+                lines.append(f"pptx2pdf_phase_seconds_count{{{labels}}} {histogram[-1]}")
+            return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves a registry at http://host:port/metrics from a daemon thread."""
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # only when serving
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep scrapes out of the console
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+        logger.info(f"Serving metrics on http://{host}:{self.server.server_address[1]}/metrics")
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
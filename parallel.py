@@ -0,0 +1,165 @@
+import time
+import queue
+import logging
+import multiprocessing
+
+
+logger = logging.getLogger(__name__)
+
+# How long the parent waits on the result queue before checking worker health
+RESULT_POLL_SECONDS = 1.0
+# Files handed to the task queue ahead of time per worker, so no worker waits on the scanner
+PREFETCH_PER_WORKER = 2
+
+
+def _worker_main(worker_id, converter_options, overwrite, task_queue, result_queue):
+    """Worker process: owns one converter/engine and drains the shared task queue."""
+    from pptToPdf import PPTXtoPDFConverter
+
+    started = time.perf_counter()
+    try:
+        converter = PPTXtoPDFConverter(**converter_options)
+    except Exception as e:
+        result_queue.put({"type": "worker_failed", "worker": worker_id, "error": str(e)})
+        return
+    result_queue.put({"type": "worker_ready", "worker": worker_id,
+                      "startup": time.perf_counter() - started})
+
+    ready = time.perf_counter()
+    busy = 0.0
+    files = 0
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:  # sentinel: no more work
+                break
+            input_path, output_path = task
+            file_started = time.perf_counter()
+            success = converter.convert_single_file(input_path, output_path, overwrite)
+            duration = time.perf_counter() - file_started
+            busy += duration
+            files += 1
+            result_queue.put({"type": "result", "worker": worker_id, "input": str(input_path),
+                              "output": str(output_path), "success": success, "duration": duration,
+                              "record": converter.last_record})
+    finally:
+        converter.close()
+        result_queue.put({"type": "worker_done", "worker": worker_id, "files": files,
+                          "busy": busy, "wall": time.perf_counter() - ready})
+
+
+def run_parallel(jobs, converter_options, workers, overwrite=False, on_result=None, cancel_event=None):
+    """Convert (input_path, output_path) jobs on `workers` processes, each with its own engine.
+
+    jobs may be any iterable, including a generator that is still scanning: it is
+    consumed lazily, keeping at most PREFETCH_PER_WORKER files queued per worker.
+    converter_options(worker_id) returns the PPTXtoPDFConverter arguments for that worker.
+    on_result is called in the parent for every finished file as results stream back.
+    Setting cancel_event withdraws the files no worker has picked up yet.
+    Returns a dict of per-worker statistics keyed by worker id.
+    """
+    context = multiprocessing.get_context("spawn")  # COM and soffice don't survive fork
+    task_queue = context.Queue()
+    result_queue = context.Queue()
+
+    # Start the engines first so they warm up while the first files are being found
+    processes = []
+    for worker_id in range(workers):
+        process = context.Process(
+            target=_worker_main,
+            args=(worker_id, converter_options(worker_id), overwrite, task_queue, result_queue),
+            name=f"pptx2pdf-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+
+    stats = {worker_id: {"files": 0, "busy": 0.0, "wall": 0.0, "startup": None, "error": None}
+             for worker_id in range(workers)}
+    jobs = iter(jobs)
+    pending = {}  # input -> output for every file handed to the workers
+    exhausted = False
+    finished_workers = set()
+    cancelled = False
+
+    def feed():
+        """Top the task queue up from the job iterator; post the sentinels once it runs dry."""
+        nonlocal exhausted
+        while not exhausted and len(pending) < workers * PREFETCH_PER_WORKER:
+            job = next(jobs, None)
+            if job is None:
+                exhausted = True
+                for _ in range(workers):
+                    task_queue.put(None)  # sentinel: no more work
+                break
+            pending[str(job[0])] = str(job[1])
+            task_queue.put((str(job[0]), str(job[1])))
+
+    try:
+        feed()
+        while len(finished_workers) < workers:
+            if cancel_event is not None and cancel_event.is_set() and not cancelled:
+                cancelled = True
+                exhausted = True  # stop pulling from the scanner
+                _withdraw_tasks(task_queue, workers)
+            try:
+                message = result_queue.get(timeout=RESULT_POLL_SECONDS)
+            except queue.Empty:
+                # A worker that died without reporting (crash, killed engine) never sends worker_done
+                for worker_id, process in enumerate(processes):
+                    if worker_id not in finished_workers and not process.is_alive():
+                        logger.error(f"Worker {worker_id} exited unexpectedly (code {process.exitcode})")
+                        stats[worker_id]["error"] = f"exit code {process.exitcode}"
+                        finished_workers.add(worker_id)
+                continue
+
+            kind = message["type"]
+            worker_id = message["worker"]
+            if kind == "result":
+                pending.pop(message["input"], None)
+                if on_result:
+                    on_result(message)
+                feed()
+            elif kind == "worker_ready":
+                stats[worker_id]["startup"] = message["startup"]
+            elif kind == "worker_failed":
+                logger.error(f"Worker {worker_id} could not start its engine: {message['error']}")
+                stats[worker_id]["error"] = message["error"]
+                finished_workers.add(worker_id)
+            elif kind == "worker_done":
+                stats[worker_id].update(files=message["files"], busy=message["busy"], wall=message["wall"])
+                finished_workers.add(worker_id)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    # Anything still pending was withdrawn by a cancel or never picked up because every worker died
+    if on_result and not cancelled:
+        for input_path, output_path in sorted(pending.items()):
+            on_result({"type": "result", "worker": None, "input": input_path, "output": output_path,
+                       "success": False, "duration": 0.0})
+        if not exhausted:
+            for input_path, output_path in jobs:
+                on_result({"type": "result", "worker": None, "input": str(input_path),
+                           "output": str(output_path), "success": False, "duration": 0.0})
+
+    for worker_id, worker in stats.items():
+        worker["utilisation"] = worker["busy"] / worker["wall"] if worker["wall"] else 0.0
+    return stats
+
+
+def _withdraw_tasks(task_queue, workers):
+    """Drop queued files so workers stop after their current one, then re-post the sentinels."""
+    withdrawn = 0
+    while True:
+        try:
+            task = task_queue.get_nowait()
+        except queue.Empty:
+            break
+        if task is not None:
+            withdrawn += 1
+    for _ in range(workers):
+        task_queue.put(None)
+    logger.info(f"Cancelled: withdrew {withdrawn} queued files")
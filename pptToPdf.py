@@ -1,13 +1,70 @@
 import os
+import re
+import sys
+import time
+import tempfile
 import logging
 from pathlib import Path
-import win32com.client
-from tqdm import tqdm
-from tkinter import filedialog, Tk, messagebox
+from collections import OrderedDict
+
+from backends import create_backend
+from batch_journal import JOURNAL_NAME, BatchJournal
+from conversion_cache import DEFAULT_MAX_BYTES, ConversionCache, clone_or_copy, file_digest
+from engine_watchdog import ConversionTimeout, Watchdog, is_transient
+from file_scanner import scan_presentations
+from hot_folder import StabilityTracker, create_watcher
+from incremental import load_manifest, plan_update, pypdf_available, save_manifest, slide_fingerprint, splice_pages
+from media_optimizer import optimize_deck, pillow_available
+from metrics import JsonLinesSink, MetricsRegistry, MetricsServer, conversion_record
+from preflight import inspect_presentation
+from spooling import DEFAULT_MAX_BYTES as DEFAULT_MAX_SPOOL_BYTES, copy_limited, pid_alive, spool_root, spooled_workspace
+from work_queue import CLAIMED, DEFAULT_LEASE_SECONDS, LEASED, LeaseQueue
+
+
+# Files whose digest and pre-flight report are remembered (least recently used are dropped)
+MAX_MEMO_ENTRIES = 4096
+# Exports in progress: .<stem>.<pid>.partial.pdf and .<stem>.<pid>.slides<first>-<last>.pdf
+PARTIAL_OUTPUT = re.compile(r"^\..+\.(\d+)\.(?:partial|slides\d+-\d+)\.pdf$")
+
+
+class ConversionFailed(Exception):
+    """convert_stream/convert_bytes could not produce a PDF; record is the conversion record."""
+
+    def __init__(self, message, record):
+        super().__init__(message)
+        self.record = record
 
 
 class PPTXtoPDFConverter:
-    def __init__(self, log_file="conversion.log"):
+    def __init__(self, log_file="conversion.log", backend=None, backend_options=None,
+                 cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES, metrics_file=None,
+                 metrics_port=None, worker_id=None, timeout=None, retries=0, retry_backoff=1.0,
+                 recycle_after=None, max_engine_rss=None, preflight=True, max_input_bytes=None,
+                 max_slides=None, media_dpi=None, incremental=False):
+        """backend is a backend name ("powerpoint", "libreoffice", "fake"), a
+        ConversionBackend instance, or None for the platform default.
+
+        cache_dir enables the persistent conversion cache (see conversion_cache.py).
+        metrics_file appends a JSON record per conversion; metrics_port serves
+        Prometheus-style counters and histograms at http://127.0.0.1:<port>/metrics.
+
+        For unattended runs: timeout (seconds per file) kills and restarts a hung
+        engine and moves on; retries re-attempts transient engine errors with
+        exponential backoff starting at retry_backoff seconds; recycle_after (files)
+        and max_engine_rss (bytes) restart the engine to bound its memory.
+
+        preflight inspects each deck's zip structure first (see preflight.py) and
+        rejects corrupt, encrypted or oversized decks (max_input_bytes, max_slides)
+        before the engine ever opens them.
+
+        media_dpi downsamples oversized photos to that resolution in a temporary
+        copy of the deck before export (see media_optimizer.py; needs Pillow).
+
+        incremental re-exports only the slides that changed since the existing PDF
+        was made and splices them in (see incremental.py; needs pypdf), falling back
+        to a full export when the deck's structure changed. Only applies when
+        overwriting an earlier output of this converter.
+        """
         # setup logging
         logging.basicConfig(
             filename=log_file,
@@ -15,51 +72,353 @@ class PPTXtoPDFConverter:
             format="%(asctime)s - %(levelname)s - %(message)s"
         )
         self.logger = logging
-
-        # Initialize Powerpoint application
+        self.log_file = log_file
+        # Per-worker statistics of the most recent parallel batch (see batch_convert)
+        self.worker_stats = {}
+        # Persistent PDF cache keyed by input bytes + conversion options
+        self.cache = ConversionCache(cache_dir, cache_max_bytes) if cache_dir else None
+        # Input digests memoised by (path, size, mtime) so each file is hashed once
+        self._digests = OrderedDict()
+        # Structured per-conversion records (see metrics.py)
+        self.worker_id = worker_id
+        self.metrics = MetricsRegistry()
+        self.metrics_sink = JsonLinesSink(metrics_file) if metrics_file else None
+        self.metrics_server = None
+        self.last_record = None
+        # Watchdog and engine recycling (see engine_watchdog.py)
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.recycle_after = recycle_after
+        self.max_engine_rss = max_engine_rss
+        self.files_since_restart = 0
+        # Pre-flight inspection, memoised like the digests
+        self.preflight = preflight
+        self.max_input_bytes = max_input_bytes
+        self.max_slides = max_slides
+        self._reports = OrderedDict()
+        # Optional media downsampling pre-pass
+        self.media_dpi = media_dpi
+        if media_dpi and not pillow_available():
+            self.logger.warning("Pillow is not installed; media downsampling is disabled")
+            self.media_dpi = None
+        # Slide-level incremental reconversion
+        self.incremental = incremental
+        if incremental and not pypdf_available():
+            self.logger.warning("pypdf is not installed; edited decks will be fully re-exported")
+
+        # Initialize the conversion engine (PowerPoint, LibreOffice, ...) once;
+        # it stays warm for every file this converter handles
+        self.backend = create_backend(backend, **(backend_options or {}))
+        self.backend.start()
+        self.logger.info(f"Using {self.backend.name} conversion backend")
         try:
-            print("Attempting to connect to PowerPoint...")
-            self.powerpoint = win32com.client.GetActiveObject("PowerPoint.Application")
-            print("Found running PowerPoint instance")
-        except:
-            try:
-                print("Starting new PowerPoint instance...")
-                self.powerpoint = win32com.client.Dispatch("PowerPoint.Application")
-                print("Successfully started PowerPoint")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize PowerPoint: {str(e)}")
-                print("\nTroubleshooting steps:")
-                print("1. Verify PowerPoint is installed")
-                print("2. Try running the script as administrator")
-                print("3. Check if PowerPoint works by opening it manually")
-                raise Exception("PowerPoint not installed or not accessible")
+            self._check_timeout_enforceable()
+        except Exception:
+            self.backend.close()
+            raise
+        if metrics_port is not None:
+            self.metrics_server = MetricsServer(self.metrics, metrics_port)
 
     def convert_single_file(self, input_path, output_path=None, overwrite=False):
+        started = time.perf_counter()
+        record = self.last_record = conversion_record(input_path, output_path, self.backend.name, self.worker_id)
+        optimized_path = None
         try:
             input_path = Path(input_path).resolve()
             if not output_path:
                 output_path = input_path.with_suffix(".pdf")
             else:
                 output_path = Path(output_path).resolve()
+            record.update(input=str(input_path), output=str(output_path))
             if not input_path.exists():
                 raise FileNotFoundError(f"Input file not found: {input_path}")
+            record["input_size"] = input_path.stat().st_size
+            if self.preflight:
+                report = self.inspect(input_path)
+                record["slide_count"] = report["slides"]
+                if not report["valid"]:
+                    self.logger.warning(f"Rejected {input_path}: {report['reason']}")
+                    record.update(outcome="rejected", error=report["reason"])
+                    return False
             if output_path.exists() and not overwrite:
                 self.logger.warning(f"Output file already exists: {output_path}")
+                record["outcome"] = "skipped"
                 return False
 
-            presentation = self.powerpoint.Presentations.Open(str(input_path))
-            presentation.SaveAs(str(output_path), 32)
-            presentation.Close()
-
-            self.logger.info(f"Successfully converted: {input_path} -> {output_path}")
+            fingerprint = None
+            if self.incremental and input_path.suffix.lower() == ".pptx":
+                try:
+                    fingerprint = slide_fingerprint(input_path)
+                except Exception as e:
+                    self.logger.warning(f"Cannot fingerprint slides of {input_path}: {str(e)}")
+
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.key_for(self.file_digest(input_path), self.conversion_options())
+                if self.cache.materialize(cache_key, output_path):
+                    self.logger.info(f"Cache hit: {input_path} -> {output_path}")
+                    record.update(outcome="cache_hit", output_size=output_path.stat().st_size)
+                    if fingerprint:
+                        save_manifest(output_path, fingerprint, self.conversion_options())
+                    return True
+
+            if self.media_dpi:
+                optimized_path = self._optimize_media(input_path, record)
+            # Export under a temporary name and rename it into place, so output_path is only
+            # ever a complete PDF (and an old, possibly hardlinked cache entry is replaced,
+            # never written through); a failed export leaves any previous PDF untouched
+            partial_path = output_path.with_name(f".{output_path.stem}.{os.getpid()}.partial.pdf")
+            timings = None
+            if fingerprint:
+                timings = self._incremental_update(optimized_path or input_path, output_path, partial_path,
+                                                   fingerprint, record)
+            if timings is None:
+                timings = self._guarded_convert(optimized_path or input_path, partial_path, record)
+                os.replace(partial_path, output_path)
+            if fingerprint:
+                save_manifest(output_path, fingerprint, self.conversion_options())
+            record.update(open_seconds=timings.get("open"), export_seconds=timings.get("export"),
+                          close_seconds=timings.get("close"), slide_count=timings.get("slides"))
+            if cache_key:
+                self.cache.store(cache_key, output_path)
+
+            self.logger.info(f"Successfully converted: {input_path} -> {output_path} "
+                             f"(export {record['export_seconds'] or 0:.2f}s)")
+            record.update(outcome="converted", output_size=output_path.stat().st_size)
             return True
 
         except Exception as e:
             self.logger.error(f"Error converting {input_path}: {str(e)}")
+            record.update(outcome="timeout" if isinstance(e, ConversionTimeout) else "failed", error=str(e))
             return False
 
-    def batch_convert(self, input_folder, output_folder=None, overwrite=False, gui_mode=False):
-        """Convert all PPTX files in a folder. Disables tqdm output in GUI mode."""
+        finally:
+            if optimized_path:
+                optimized_path.unlink(missing_ok=True)
+            record["total_seconds"] = time.perf_counter() - started
+            self.emit_record(record)
+            self._maybe_recycle_engine()
+
+    def _optimize_media(self, input_path, record):
+        """Temporary copy of input_path with downsampled media, or None to export the original."""
+        if input_path.suffix.lower() != ".pptx":
+            return None  # legacy .ppt is not a zip
+        # RAM-backed when there is room, so the copy never touches the disk
+        fd, temp_name = tempfile.mkstemp(prefix="pptx2pdf-", suffix=".pptx", dir=spool_root(record["input_size"]))
+        os.close(fd)
+        optimized_path = Path(temp_name)
+        try:
+            stats = optimize_deck(input_path, optimized_path, self.media_dpi)
+        except Exception as e:
+            self.logger.warning(f"Media optimization failed for {input_path}, exporting original: {str(e)}")
+            optimized_path.unlink(missing_ok=True)
+            return None
+        record.update(optimize_seconds=stats["seconds"], images_downsampled=stats["downsampled"])
+        if not stats["downsampled"]:
+            optimized_path.unlink()
+            return None
+        record["optimized_size"] = optimized_path.stat().st_size
+        self.logger.info(
+            f"Downsampled {stats['downsampled']}/{stats['images']} images in {input_path.name} to {self.media_dpi} DPI: "
+            f"{record['input_size'] / 1024 ** 2:.1f} -> {record['optimized_size'] / 1024 ** 2:.1f} MiB "
+            f"in {stats['seconds']:.2f}s")
+        return optimized_path
+
+    def _incremental_update(self, input_path, output_path, partial_path, fingerprint, record):
+        """Re-export only changed slides into the existing PDF; returns timings, or None for a full export."""
+        ranges = plan_update(load_manifest(output_path), fingerprint, self.conversion_options(), output_path)
+        if ranges is None:
+            return None
+        slide_count = len(fingerprint["slides"])
+        if not ranges:
+            self.logger.info(f"No slide changed in {input_path.name}; keeping {output_path}")
+            record["slides_reexported"] = 0
+            return {"slides": slide_count}
+        if not pypdf_available():
+            return None
+
+        timings = {"open": 0.0, "export": 0.0, "close": 0.0, "slides": slide_count}
+        replacements = []
+        try:
+            for first, last in ranges:
+                range_path = output_path.with_name(f".{output_path.stem}.{os.getpid()}.slides{first}-{last}.pdf")
+                replacements.append(((first, last), range_path))
+                range_timings = self._guarded_convert(input_path, range_path, record, slide_range=(first, last))
+                for phase in ("open", "export", "close"):
+                    timings[phase] += range_timings.get(phase) or 0.0
+            splice_pages(output_path, replacements, partial_path, slide_count)
+            os.replace(partial_path, output_path)
+        except (NotImplementedError, ValueError) as e:
+            # No slide-range export on this engine, or page counts that don't line up
+            self.logger.warning(f"Incremental export of {input_path.name} not possible ({str(e)}); "
+                                f"exporting every slide")
+            self._remove_partial_output(partial_path)
+            return None
+        finally:
+            for _, range_path in replacements:
+                self._remove_partial_output(range_path)
+        record["slides_reexported"] = sum(last - first + 1 for first, last in ranges)
+        self.logger.info(f"Re-exported {record['slides_reexported']}/{slide_count} slides of {input_path.name}")
+        return timings
+
+    def _check_timeout_enforceable(self):
+        """Fail loudly rather than run with a timeout the watchdog could not enforce."""
+        if self.timeout and not self.backend.can_kill():
+            raise Exception(f"timeout={self.timeout}s needs a {self.backend.name} engine the converter can kill, "
+                            f"but this one was already running (e.g. PowerPoint opened by the user) and is "
+                            f"never killed; close it first or run without a timeout")
+
+    def _guarded_convert(self, input_path, output_path, record, slide_range=None):
+        """Run the engine under the hang watchdog, retrying transient failures with backoff."""
+        attempt = 0
+        while True:
+            attempt += 1
+            record["attempts"] = attempt
+            # A restarted PowerPoint may have attached to one the user opened meanwhile
+            self._check_timeout_enforceable()
+            try:
+                with Watchdog(self.timeout, self.backend.kill) as watchdog:
+                    if slide_range:
+                        timings = self.backend.export_slides(input_path, output_path, *slide_range) or {}
+                    else:
+                        timings = self.backend.convert(input_path, output_path) or {}
+                if watchdog.fired:
+                    raise ConversionTimeout(f"Engine did not finish within {self.timeout}s")
+                return timings
+            except Exception as e:
+                self._remove_partial_output(output_path)
+                if watchdog.fired:
+                    # A deck that hung once will hang again: restart the engine and move on
+                    self.logger.error(f"Timed out converting {input_path} after {self.timeout}s; restarting engine")
+                    self._restart_engine()
+                    raise ConversionTimeout(f"Conversion timed out after {self.timeout}s") from e
+                if attempt > self.retries or not is_transient(e):
+                    raise
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                self.logger.warning(f"Transient error converting {input_path} (attempt {attempt}): {str(e)}; "
+                                    f"retrying in {delay:.1f}s with a fresh engine")
+                time.sleep(delay)
+                self._restart_engine()
+
+    def _remove_partial_output(self, output_path):
+        try:
+            output_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Could not remove partial output {output_path}: {str(e)}")
+
+    def _sweep_partial_outputs(self, output_folder):
+        """Remove half-written exports left in output_folder by converters that crashed."""
+        removed = 0
+        for folder, _, names in os.walk(output_folder):
+            for name in names:
+                match = PARTIAL_OUTPUT.match(name)
+                if match and int(match.group(1)) != os.getpid() and pid_alive(int(match.group(1))) is False:
+                    self._remove_partial_output(Path(folder) / name)
+                    removed += 1
+        if removed:
+            self.logger.info(f"Removed {removed} partial PDFs left by interrupted conversions")
+        return removed
+
+    def _restart_engine(self):
+        self.backend.restart()
+        self.files_since_restart = 0
+
+    def _maybe_recycle_engine(self):
+        """Restart the engine after recycle_after files or once it outgrows max_engine_rss."""
+        if not self.last_record or not self.last_record.get("attempts"):
+            return  # skipped or served from cache: the engine did no work
+        self.files_since_restart += 1
+        reason = None
+        if self.recycle_after and self.files_since_restart >= self.recycle_after:
+            reason = f"{self.files_since_restart} files converted"
+        elif self.max_engine_rss:
+            rss = self.backend.engine_rss()
+            if rss and rss > self.max_engine_rss:
+                reason = f"engine RSS {rss / 1024 ** 2:.0f} MiB over limit"
+        if reason:
+            self.logger.info(f"Recycling {self.backend.name} engine: {reason}")
+            try:
+                self._restart_engine()
+            except Exception as e:
+                self.logger.error(f"Engine restart failed: {str(e)}")
+
+    def emit_record(self, record):
+        """Send a conversion record to the JSON-lines sink and the metrics registry."""
+        self.metrics.observe(record)
+        if self.metrics_sink:
+            try:
+                self.metrics_sink.write(record)
+            except OSError as e:
+                self.logger.warning(f"Could not write metrics record: {str(e)}")
+
+    def conversion_options(self):
+        """Everything besides the input bytes that affects the produced PDF."""
+        options = {"backend": self.backend.name, "format": "pdf"}
+        if self.media_dpi:
+            options["media_dpi"] = self.media_dpi
+        return options
+
+    def file_digest(self, path):
+        """Content hash of an input file, memoised while the file is unchanged."""
+        return self._memoised(self._digests, path, file_digest)
+
+    def inspect(self, path):
+        """Pre-flight report for an input file, memoised while the file is unchanged."""
+        return self._memoised(self._reports, path, lambda path: inspect_presentation(
+            path, max_bytes=self.max_input_bytes, max_slides=self.max_slides))
+
+    @staticmethod
+    def _memoised(memo, path, compute):
+        """compute(path), cached by (path, size, mtime) in an LRU memo of MAX_MEMO_ENTRIES.
+
+        Bounded because watch() and the conversion service see a new path per file forever.
+        """
+        stat = os.stat(path)
+        memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+        value = memo.get(memo_key)
+        if value is None:
+            value = memo[memo_key] = compute(path)
+            if len(memo) > MAX_MEMO_ENTRIES:
+                memo.popitem(last=False)
+        else:
+            memo.move_to_end(memo_key)
+        return value
+
+    def batch_convert(self, input_folder, output_folder=None, overwrite=False, gui_mode=False,
+                      workers=1, on_result=None, deduplicate=True, progress_callback=None,
+                      cancel_event=None, recursive=False, include=None, exclude=None, order=None,
+                      work_queue=None, lease_seconds=DEFAULT_LEASE_SECONDS, journal=None, resume=False):
+        """Convert all PPTX files in a folder. Disables tqdm output in GUI mode.
+
+        Files are discovered lazily (see file_scanner.scan_presentations) and fed to
+        the engine while scanning continues; recursive/include/exclude control the
+        scan and subfolders are mirrored under output_folder.
+        With workers > 1 the files are spread over that many processes, each with
+        its own engine instance; on_result(result) is called as each file finishes,
+        with the file's conversion record under "record" when an engine converted it.
+        With deduplicate, byte-identical inputs are converted once and the PDF copied.
+        progress_callback(progress) receives a dict (file, done, total, rate, eta, ...)
+        before and after every file; total stays None until the scan has finished.
+        Setting cancel_event stops the batch between files.
+        order="largest_first" pre-flights the whole folder before starting and converts
+        the most expensive decks first, so one huge deck doesn't leave a single worker
+        busy at the end; the ETA is then weighted by estimated cost instead of file count.
+        work_queue names a directory on a share that several converter processes (on
+        any number of hosts) use to drain the same input tree together: each file is
+        claimed through a lease there first (see work_queue.py), so every node only
+        reports the files it converted itself. Leases of a crashed node are reclaimed
+        after lease_seconds, and this call returns once no file is left unclaimed.
+        journal (a path, or True for .pptx2pdf-journal.jsonl in output_folder) logs each
+        file's progress durably (see batch_journal.py); resume=True replays it, skips
+        files already done whose deck is unchanged and retries everything else, after
+        removing partial PDFs that crashed converters left in output_folder.
+        """
+        lease_queue = None
+        batch_journal = None
+        workers = self.engine_workers(workers)
         try:
             input_folder = Path(input_folder).resolve()
             if output_folder:
@@ -68,39 +427,208 @@ class PPTXtoPDFConverter:
             else:
                 output_folder = input_folder
 
-            # Get all PPTX files
-            ppt_files = list(input_folder.glob("*.ppt"))
-            pptx_files = list(input_folder.glob("*.pptx"))
-            all_powerpoint_files = ppt_files + pptx_files
-
-            # Replace pptx files with ppt files if pptx files are not found
-            if not all_powerpoint_files: # <- Check the combine list
-                # REMOVED: print(f"No PPTX files found in {input_folder}") 
-                self.logger.warning(f"No PPTX or PPT files found in {input_folder}")
-                return False # Indicate no files found or failure
-
             # Process files with progress bar
             success_count = 0
-            self.logger.info(f"Starting batch conversion for {len(all_powerpoint_files)} files in {input_folder}") # <- use combine list length
+            done_count = 0
+            discovered = 0
+            total = None  # known once the scan is exhausted
+            costs = {}  # input -> estimated cost, filled in by largest-first ordering
+            cost_total = None
+            cost_done = 0.0
+            # Shared work queue: input -> path relative to input_folder for each claimed file
+            claimed = {}
+            if work_queue:
+                lease_queue = LeaseQueue(work_queue, lease_seconds).start()
+            # Resumable batches: input -> path relative to input_folder for journaled files
+            journaled = {}
+            resumed_count = 0
+            if journal or resume:
+                journal_path = output_folder / JOURNAL_NAME if journal in (None, True) else Path(journal)
+                batch_journal = BatchJournal(journal_path, resume)
+                if resume:
+                    self.logger.info(f"Resuming from journal {journal_path}: {batch_journal.summary()}")
+                    self._sweep_partial_outputs(output_folder)
+            batch_started = time.perf_counter()
+            self.logger.info(f"Starting batch conversion in {input_folder}")
+
+            def cancelled():
+                return cancel_event is not None and cancel_event.is_set()
+
+            def report_progress(event, file_name):
+                if not progress_callback:
+                    return
+                elapsed = time.perf_counter() - batch_started
+                rate = done_count / elapsed if elapsed > 0 else 0.0
+                if cost_total is not None and cost_done:
+                    eta = elapsed / cost_done * (cost_total - cost_done)
+                else:
+                    eta = (total - done_count) / rate if rate and total is not None else None
+                progress_callback({
+                    "event": event,  # "file_started", "file_done" or "scan_complete"
+                    "file": file_name,
+                    "done": done_count,
+                    "total": total,
+                    "discovered": discovered,
+                    "succeeded": success_count,
+                    "elapsed": elapsed,
+                    "rate": rate,  # files per second
+                    "eta": eta,
+                })
+
+            # Output path -> success, so duplicates know whether their original converted
+            converted = {}
+            # Original output -> duplicates waiting for it to finish (worker-pool mode)
+            waiting_duplicates = {}
+            first_output = {}  # input digest -> output of its first occurrence
 
             # Process files with progress bar - disable output in  GUI mode
             # Pass disable=gui_mode to tqdm constructor
-            with tqdm(total=len(all_powerpoint_files), desc="Converting", disable=gui_mode) as pbar:
-                for powerpoint_file in all_powerpoint_files:
-                    output_path = output_folder / powerpoint_file.with_suffix('.pdf').name
-                    #REMOVED: print(f"\nConverting: {pptx_file.name}")
-                    self.logger.info(f"Batch converting: {powerpoint_file.name}") # Log instead of print
-
-                    # Use a flag for clarity on conversion success/failure per file
-                    file_converted = self.convert_single_file(powerpoint_file, output_path, overwrite)
-                    if file_converted:
+            from tqdm import tqdm  # imported on first batch to keep startup fast
+            with tqdm(total=None, desc="Converting", disable=gui_mode) as pbar:
+                def record(result):
+                    nonlocal success_count, done_count, cost_done
+                    if workers > 1 and result.get("record"):
+                        self.emit_record(result["record"])  # converted in a worker process
+                    converted[result["output"]] = result["success"]
+                    if result["success"]:
                         success_count += 1
+                    done_count += 1
+                    cost_done += costs.get(result["input"], 0.0)
+                    if result["input"] in claimed:
+                        lease_queue.complete(claimed.pop(result["input"]), result["success"], result["output"])
+                    if result["input"] in journaled:
+                        outcome = result.get("outcome") or (result.get("record") or {}).get("outcome")
+                        # An output that already existed (overwrite=False) is not a failure
+                        state = "done" if result["success"] else "skipped" if outcome == "skipped" else "failed"
+                        batch_journal.write(journaled.pop(result["input"]), state, result["input"], result["output"],
+                                            result.get("error") or (result.get("record") or {}).get("error"))
                     # Still update pbar even if conversion failed,  to advance progress
                     pbar.update(1)
+                    if on_result:
+                        on_result(result)
+                    report_progress("file_done", Path(result["input"]).name)
+                    for duplicate in waiting_duplicates.pop(result["output"], ()):
+                        record(self._copy_duplicate(*duplicate, result["success"], overwrite))
+
+                def discovered_files():
+                    """Scanner output, or the whole scan ranked by pre-flight cost for largest-first."""
+                    nonlocal cost_total, total
+                    files = scan_presentations(input_folder, recursive, include, exclude)
+                    if order != "largest_first":
+                        return files
+                    for powerpoint_file in files:
+                        try:
+                            costs[str(powerpoint_file)] = self.inspect(powerpoint_file)["cost"] or 0.0
+                        except OSError:
+                            costs[str(powerpoint_file)] = 0.0
+                    cost_total = sum(costs.values())
+                    total = pbar.total = len(costs)
+                    self.logger.info(f"Pre-flighted {len(costs)} files, estimated cost {cost_total:.1f}")
+                    return sorted((Path(name) for name in costs), key=lambda path: -costs[str(path)])
+
+                def claimed_files():
+                    """Files this process wins from the shared work queue.
+
+                    Rescans until no file is leased elsewhere, so files held by a node that
+                    dies are picked up here once their lease expires.
+                    """
+                    while True:
+                        leased_elsewhere = 0
+                        for powerpoint_file in discovered_files():
+                            if cancelled():
+                                return
+                            relative = powerpoint_file.relative_to(input_folder)
+                            if lease_queue.holds(relative):
+                                continue  # still converting it here; not worth waiting for
+                            state = lease_queue.claim(relative)
+                            if state == CLAIMED:
+                                claimed[str(powerpoint_file)] = relative
+                                yield powerpoint_file
+                            elif state == LEASED:
+                                leased_elsewhere += 1
+                        if not leased_elsewhere:
+                            return
+                        self.logger.info(f"{leased_elsewhere} files are leased by other converters; rechecking")
+                        if cancel_event is not None:
+                            if cancel_event.wait(lease_queue.lease_seconds / 4):
+                                return
+                        else:
+                            time.sleep(lease_queue.lease_seconds / 4)
+
+                def scanned_jobs():
+                    """(input, output) pairs straight from the scanner, minus in-batch duplicates."""
+                    nonlocal discovered, total, resumed_count
+                    for powerpoint_file in (claimed_files() if lease_queue else discovered_files()):
+                        if cancelled():
+                            return
+                        discovered += 1
+                        output_path = self._mirrored_output_path(powerpoint_file, input_folder, output_folder)
+                        if batch_journal:
+                            relative = powerpoint_file.relative_to(input_folder)
+                            if resume and batch_journal.is_done(relative, powerpoint_file, output_path, overwrite):
+                                resumed_count += 1
+                                record({"worker": None, "input": str(powerpoint_file), "output": str(output_path),
+                                        "success": True, "duration": 0.0, "resumed": True})
+                                continue
+                            journaled[str(powerpoint_file)] = relative
+                            batch_journal.write(relative, "started", output_path=output_path)
+                        if deduplicate:
+                            try:
+                                digest = self.file_digest(powerpoint_file)
+                            except OSError:
+                                digest = None  # let the conversion report it
+                            original_output = first_output.get(digest)
+                            if original_output is not None:
+                                duplicate = (powerpoint_file, output_path, original_output)
+                                if str(original_output) in converted:
+                                    record(self._copy_duplicate(*duplicate, converted[str(original_output)], overwrite))
+                                else:
+                                    waiting_duplicates.setdefault(str(original_output), []).append(duplicate)
+                                continue
+                            if digest is not None:
+                                first_output[digest] = output_path
+                        yield powerpoint_file, output_path
+                    total = discovered
+                    pbar.total = total
+                    pbar.refresh()
+                    report_progress("scan_complete", None)
+
+                if workers > 1:
+                    self._convert_parallel(scanned_jobs(), workers, overwrite, record, cancel_event)
+                else:
+                    for powerpoint_file, output_path in scanned_jobs():
+                        if cancelled():
+                            break
+                        report_progress("file_started", powerpoint_file.name)
+                        #REMOVED: print(f"\nConverting: {pptx_file.name}")
+                        self.logger.info(f"Batch converting: {powerpoint_file.name}") # Log instead of print
+
+                        # Use a flag for clarity on conversion success/failure per file
+                        started = time.perf_counter()
+                        file_converted = self.convert_single_file(powerpoint_file, output_path, overwrite)
+                        record({"worker": 0, "input": str(powerpoint_file), "output": str(output_path),
+                                "success": file_converted, "duration": time.perf_counter() - started,
+                                "error": self.last_record["error"], "record": self.last_record})
+
+            if cancelled():
+                self.logger.warning(
+                    f"Batch conversion cancelled after {done_count}/{discovered} files ({success_count} converted)")
+                return False
+
+            # Replace pptx files with ppt files if pptx files are not found
+            if not discovered and lease_queue:
+                self.logger.info(f"Nothing left to convert in {input_folder}: other converters took every file")
+                return True
+            if not discovered:
+                # REMOVED: print(f"No PPTX files found in {input_folder}") 
+                self.logger.warning(f"No PPTX or PPT files found in {input_folder}")
+                return False # Indicate no files found or failure
 
             #REMOVED:print(f"\nBatch conversion completed: {success_count}/{len(pptx_files)} files converted successfully")
+            if resumed_count:
+                self.logger.info(f"{resumed_count} files were already done according to the journal")
             self.logger.info(
-                f"Batch conversion completed. {success_count}/{len(all_powerpoint_files)} files converted successfully")
+                f"Batch conversion completed. {success_count}/{discovered} files converted successfully")
             return True
 
         except Exception as e:
@@ -108,22 +636,230 @@ class PPTXtoPDFConverter:
             #REMOVED: print(f"\nError: {error_msg}")
             self.logger.error(error_msg)
             return False
-        
+
+        finally:
+            if lease_queue:
+                lease_queue.close()  # hands unfinished (e.g. cancelled) files back to the queue
+            if batch_journal:
+                batch_journal.close()
+
+    def convert_many(self, jobs, workers=1, overwrite=False, on_result=None, cancel_event=None):
+        """Convert explicit (input, output) pairs, e.g. from a manifest. Returns (succeeded, total).
+
+        jobs may be a lazy iterable. With workers > 1 they are spread over worker
+        processes as in batch_convert. on_result(result) receives each result dict,
+        with the file's conversion record under "record".
+        """
+        counts = {"total": 0, "succeeded": 0}
+        workers = self.engine_workers(workers)
+
+        def record(result):
+            if workers > 1 and result.get("record"):
+                self.emit_record(result["record"])  # converted in a worker process
+            counts["total"] += 1
+            counts["succeeded"] += bool(result["success"])
+            if on_result:
+                on_result(result)
+
+        if workers > 1:
+            self._convert_parallel(jobs, workers, overwrite, record, cancel_event)
+        else:
+            for input_path, output_path in jobs:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                started = time.perf_counter()
+                success = self.convert_single_file(input_path, output_path, overwrite)
+                record({"worker": 0, "input": str(input_path), "output": str(output_path), "success": success,
+                        "duration": time.perf_counter() - started, "record": self.last_record})
+        return counts["succeeded"], counts["total"]
+
+    def convert_stream(self, source, destination=None, name="presentation.pptx", max_bytes=None, size_hint=None):
+        """Convert a deck read from a file-like object (or bytes) without the caller touching the disk.
+
+        The deck, the PDF and every intermediate live in a private spool directory,
+        in RAM (/dev/shm) when it has room (see spooling.py), removed afterwards.
+        The PDF is copied to the destination file-like object, returning its size,
+        or returned as bytes when there is no destination. name only supplies the
+        extension (.pptx or .ppt) and what the logs call the deck. Inputs over
+        max_bytes (default max_input_bytes, else 512 MiB) raise SpoolLimitExceeded;
+        a failed conversion raises ConversionFailed with the conversion record.
+        """
+        max_bytes = max_bytes or self.max_input_bytes or DEFAULT_MAX_SPOOL_BYTES
+        if size_hint is None and isinstance(source, (bytes, bytearray, memoryview)):
+            size_hint = len(source)
+        if size_hint is None:
+            size_hint = max_bytes  # unknown length: it may be as large as the limit allows
+        with spooled_workspace(size_hint) as workspace:
+            input_path = workspace / Path(name).name
+            with open(input_path, "wb") as f:
+                copy_limited(source, f, max_bytes)
+            output_path = input_path.with_suffix(".pdf")
+            if not self.convert_single_file(input_path, output_path):
+                record = self.last_record
+                if record["outcome"] == "timeout":
+                    raise ConversionTimeout(record["error"])
+                raise ConversionFailed(f"Converting {name} {record['outcome']}: {record['error']}", record)
+            with open(output_path, "rb") as f:
+                if destination is None:
+                    return f.read()
+                return copy_limited(f, destination)
+
+    def convert_bytes(self, data, name="presentation.pptx", max_bytes=None):
+        """PDF bytes for a deck given as bytes; see convert_stream."""
+        return self.convert_stream(data, name=name, max_bytes=max_bytes)
+
+    def watch(self, input_folder, output_folder=None, recursive=False, include=None, exclude=None,
+              settle_seconds=2.0, poll_interval=2.0, stop_event=None, on_result=None, use_inotify=None):
+        """Hot-folder mode: convert new or modified decks as they arrive, until stopped.
+
+        Uses inotify on Linux and polling elsewhere (see hot_folder.py). A deck is
+        converted once its size has been stable for settle_seconds; decks whose PDF
+        is already newer than the deck are skipped. Runs until stop_event is set or
+        Ctrl+C, on the converter's already warm engine, and returns the number of
+        files converted.
+        """
+        input_folder = Path(input_folder).resolve()
+        if output_folder:
+            output_folder = Path(output_folder).resolve()
+            output_folder.mkdir(parents=True, exist_ok=True)
+        else:
+            output_folder = input_folder
+
+        watcher = create_watcher(input_folder, recursive, include, exclude, poll_interval, use_inotify)
+        tracker = StabilityTracker(settle_seconds)
+        # Catch up on decks that arrived while nothing was watching
+        for powerpoint_file in scan_presentations(input_folder, recursive, include, exclude):
+            tracker.touch(powerpoint_file)
+
+        converted = 0
+        self.logger.info(f"Watching {input_folder} for new decks ({type(watcher).__name__})")
+        try:
+            while not (stop_event is not None and stop_event.is_set()):
+                for changed_file in watcher.changes(tracker.next_deadline(poll_interval)):
+                    tracker.touch(changed_file)
+                for powerpoint_file in tracker.ready():
+                    output_path = self._mirrored_output_path(powerpoint_file, input_folder, output_folder)
+                    if self._is_up_to_date(powerpoint_file, output_path):
+                        continue
+                    self.logger.info(f"Hot folder converting: {powerpoint_file.name}")
+                    started = time.perf_counter()
+                    success = self.convert_single_file(powerpoint_file, output_path, overwrite=True)
+                    converted += success
+                    if on_result:
+                        on_result({"worker": 0, "input": str(powerpoint_file), "output": str(output_path),
+                                   "success": success, "duration": time.perf_counter() - started})
+        except KeyboardInterrupt:
+            self.logger.info("Watch mode interrupted")
+        finally:
+            watcher.close()
+        self.logger.info(f"Stopped watching {input_folder}. {converted} files converted")
+        return converted
+
+    @staticmethod
+    def _is_up_to_date(input_path, output_path):
+        try:
+            return output_path.stat().st_mtime_ns >= input_path.stat().st_mtime_ns
+        except OSError:
+            return False
+
+    def _mirrored_output_path(self, input_path, input_folder, output_folder):
+        """PDF path for input_path, mirroring its subfolder below input_folder."""
+        relative = input_path.relative_to(input_folder)
+        output_path = output_folder / relative.parent / (input_path.stem + ".pdf")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return output_path
+
+    def _copy_duplicate(self, input_path, output_path, original_output, original_ok, overwrite):
+        """Reuse the PDF converted for an identical input instead of converting again."""
+        started = time.perf_counter()
+        record = conversion_record(input_path, output_path, self.backend.name, self.worker_id)
+        success = False
+        record["outcome"] = "failed"
+        if output_path.exists() and not overwrite:
+            self.logger.warning(f"Output file already exists: {output_path}")
+            record["outcome"] = "skipped"
+        elif not original_ok:
+            self.logger.error(f"Not copying {original_output} for duplicate {input_path}: original failed")
+        else:
+            try:
+                clone_or_copy(original_output, output_path)  # independent file: edits don't spread
+                self.logger.info(f"Duplicate input: {input_path} -> {output_path} (copied from {original_output})")
+                success = True
+                record.update(outcome="duplicate", input_size=input_path.stat().st_size,
+                              output_size=output_path.stat().st_size)
+            except OSError as e:
+                self.logger.error(f"Error copying duplicate {input_path}: {str(e)}")
+                record["error"] = str(e)
+        record["total_seconds"] = time.perf_counter() - started
+        self.emit_record(record)
+        return {"worker": None, "input": str(input_path), "output": str(output_path),
+                "success": success, "duration": time.perf_counter() - started, "outcome": record["outcome"]}
+
+    def engine_workers(self, workers):
+        """workers, capped at what the backend can run side by side (PowerPoint: one per session)."""
+        limit = self.backend.max_workers
+        if limit and workers > limit:
+            self.logger.warning(f"The {self.backend.name} backend runs one shared engine per user session; "
+                                f"using {limit} worker instead of {workers}")
+            return limit
+        return workers
+
+    def worker_options(self, worker_id):
+        """Constructor arguments for an equivalent converter in worker process worker_id."""
+        return {
+            "log_file": self.log_file,
+            "backend": self.backend.name,
+            "backend_options": self.backend.worker_options(worker_id),
+            "cache_dir": str(self.cache.cache_dir) if self.cache else None,
+            "cache_max_bytes": self.cache.max_bytes if self.cache else DEFAULT_MAX_BYTES,
+            # Records travel back with each result and are emitted once, by this process
+            "worker_id": worker_id,
+            "timeout": self.timeout,
+            "retries": self.retries,
+            "retry_backoff": self.retry_backoff,
+            "recycle_after": self.recycle_after,
+            "max_engine_rss": self.max_engine_rss,
+            "preflight": self.preflight,
+            "max_input_bytes": self.max_input_bytes,
+            "max_slides": self.max_slides,
+            "media_dpi": self.media_dpi,
+            "incremental": self.incremental,
+        }
+
+    def _convert_parallel(self, jobs, workers, overwrite, on_result, cancel_event=None):
+        """Fan jobs out to worker processes that each own an isolated engine."""
+        from parallel import run_parallel  # pulls in multiprocessing, only needed here
+        self.logger.info(f"Starting {workers} {self.backend.name} workers")
+        self.worker_stats = run_parallel(
+            jobs,
+            converter_options=self.worker_options,
+            workers=workers,
+            overwrite=overwrite,
+            on_result=on_result,
+            cancel_event=cancel_event,
+        )
+        for worker_id, stats in self.worker_stats.items():
+            self.logger.info(
+                f"Worker {worker_id}: {stats['files']} files, "
+                f"{stats['utilisation']:.0%} utilisation ({stats['busy']:.1f}s busy of {stats['wall']:.1f}s)")
+
     def close(self):
-        """Safely quits the PowerPoint application instance if it was created."""
+        """Safely shuts down the conversion engine if it was started."""
+        if self.metrics_server:
+            self.metrics_server.close()
+            self.metrics_server = None
         try:
-            if self.powerpoint:
-                self.powerpoint.Quit()
-                print("PowerPoint application closed")
+            if self.backend:
+                self.backend.close()
         except Exception as e:
-            # Log potential errors during quitting, but don't crash the app
-            print(f"Warning: Error while closing PowerPoint: {str(e)}")
+            # Log potential errors during shutdown, but don't crash the app
+            print(f"Warning: Error while closing {self.backend.name}: {str(e)}", file=sys.stderr)
             if hasattr(self, 'logger'):
-                self.logger.warning(f"Error during PowerPoint Quit: {str(e)}")
-                
+                self.logger.warning(f"Error during {self.backend.name} shutdown: {str(e)}")
+
         finally:
             # Ensure the reference is cleared
-            self.powerpoint = None
+            self.backend = None
 
     # def __del__(self):
     #     try:
@@ -136,6 +872,7 @@ class PPTXtoPDFConverter:
 
 def select_file(title="Select file", file_types=(("PowerPoint files", "*.pptx"),)):
     """Create a file dialog for selecting files"""
+    from tkinter import filedialog, Tk
     root = Tk()
     root.withdraw()  # Hide the main window
     root.attributes('-topmost', True)  # Make dialog appear on top
@@ -149,6 +886,7 @@ def select_file(title="Select file", file_types=(("PowerPoint files", "*.pptx"),
 
 def select_directory(title="Select folder"):
     """Create a dialog for selecting directories"""
+    from tkinter import filedialog, Tk
     root = Tk()
     root.withdraw()  # Hide the main window
     root.attributes('-topmost', True)  # Make dialog appear on top
@@ -159,6 +897,8 @@ def select_directory(title="Select folder"):
 
 
 def main():
+    from tkinter import filedialog, messagebox
+
     try:
         converter = PPTXtoPDFConverter()
 
@@ -170,7 +910,8 @@ def main():
         print("\nWhat would you like to do?")
         print("1. Convert single PPTX file")
         print("2. Batch convert all PPTX files in a folder")
-        choice = input("\nEnter your choice (1 or 2): ")
+        print("3. Watch a folder and convert new PPTX files as they arrive")
+        choice = input("\nEnter your choice (1, 2 or 3): ")
 
         if choice == "1":
             # Single file conversion with file dialog
@@ -222,6 +963,24 @@ def main():
             else:
                 print("\nNo input folder selected. Operation cancelled.")
 
+        elif choice == "3":
+            # Hot-folder mode: runs until Ctrl+C
+            print("\nPlease select the folder to watch...")
+            input_folder = select_directory(title="Select Folder to Watch")
+
+            if input_folder:
+                print("\nPlease select where to save the converted PDFs...")
+                output_folder = select_directory(title="Select Output Folder")
+
+                if output_folder:
+                    print(f"\nWatching: {input_folder} (press Ctrl+C to stop)")
+                    converted = converter.watch(input_folder, output_folder)
+                    print(f"\nStopped watching. {converted} files converted.")
+                else:
+                    print("\nNo output folder selected. Operation cancelled.")
+            else:
+                print("\nNo input folder selected. Operation cancelled.")
+
         else:
             print("\nInvalid choice!")
 
@@ -0,0 +1,143 @@
+import re
+import struct
+import zipfile
+from pathlib import Path
+
+# Compound File Binary (OLE2) signature: legacy .ppt, and encrypted .pptx wrappers
+CFB_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+SLIDE_PART = re.compile(r"^ppt/slides/slide\d+\.xml$")
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".mov", ".wmv", ".avi", ".mpg", ".mpeg", ".webm", ".mkv")
+# Refuse decks that would inflate past this many bytes (zip bombs, absurd media)
+DEFAULT_MAX_UNCOMPRESSED = 4 * 1024 ** 3
+
+
+def _report(path, size):
+    return {
+        "path": str(path),
+        "format": None,  # "pptx" or "ppt"
+        "valid": False,
+        "reason": None,  # why the deck was rejected
+        "encrypted": False,
+        "size": size,
+        "slides": None,
+        "media_files": 0,
+        "media_bytes": 0,
+        "embedded_fonts": 0,
+        "has_video": False,
+        "uncompressed_bytes": None,
+        "cost": None,
+    }
+
+
+def _cfb_stream_names(f):
+    """Names in the first directory sector of an OLE2 file (best effort, no full parse)."""
+    f.seek(0)
+    header = f.read(512)
+    if len(header) < 512:
+        return []
+    sector_shift = struct.unpack_from("<H", header, 0x1E)[0]
+    first_directory_sector = struct.unpack_from("<I", header, 0x30)[0]
+    sector_size = 1 << sector_shift
+    f.seek((first_directory_sector + 1) * sector_size)
+    directory = f.read(sector_size)
+    names = []
+    for offset in range(0, len(directory) - 127, 128):
+        name_length = struct.unpack_from("<H", directory, offset + 0x40)[0]
+        if 2 <= name_length <= 64:
+            names.append(directory[offset:offset + name_length - 2].decode("utf-16-le", "replace"))
+    return names
+
+
+def estimated_cost(report):
+    """Relative conversion cost, used for largest-first ordering and ETAs.
+
+    Roughly one unit per plain file, plus a tenth per slide and half per MiB of
+    media; legacy .ppt files (no cheap slide count) are costed by size instead.
+    """
+    cost = 1.0 + 0.5 * report["media_bytes"] / 1024 ** 2
+    if report["slides"] is not None:
+        cost += 0.1 * report["slides"]
+    else:
+        cost += 0.5 * report["size"] / 1024 ** 2
+    return cost
+
+
+def inspect_presentation(path, max_bytes=None, max_slides=None, max_uncompressed=DEFAULT_MAX_UNCOMPRESSED):
+    """Cheap pre-flight check of a deck without launching any engine.
+
+    Reads only the zip central directory of a .pptx (slide count, media bytes,
+    embedded fonts, video) and the OLE2 header of a legacy .ppt, so corrupt,
+    encrypted or oversized inputs are rejected in milliseconds. Returns a dict;
+    "valid" is False and "reason" says why when the deck should not be converted.
+    """
+    path = Path(path)
+    try:
+        size = path.stat().st_size
+    except OSError as e:
+        report = _report(path, None)
+        report["reason"] = f"cannot read file: {e.strerror or e}"
+        return report
+    report = _report(path, size)
+
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(8)
+            if magic == CFB_MAGIC:
+                streams = _cfb_stream_names(f)
+                if "EncryptedPackage" in streams or "EncryptionInfo" in streams:
+                    report.update(format="pptx", encrypted=True, reason="encrypted (password protected)")
+                else:
+                    # Legacy .ppt, whatever its extension: PowerPoint's stream may sit past
+                    # the first directory sector, so it is not required here
+                    report.update(format="ppt", valid=True)
+                    report["cost"] = estimated_cost(report)
+                return _apply_limits(report, max_bytes, max_slides)
+            if not magic.startswith(ZIP_MAGIC):
+                report["reason"] = "not a PowerPoint file (neither zip nor OLE2)"
+                return report
+
+        report["format"] = "pptx"
+        with zipfile.ZipFile(path) as archive:  # reads the central directory only
+            infos = archive.infolist()
+    except zipfile.BadZipFile as e:
+        report["reason"] = f"corrupt zip: {e}"
+        return report
+    except OSError as e:
+        report["reason"] = f"cannot read file: {e.strerror or e}"
+        return report
+
+    names = {info.filename for info in infos}
+    if "[Content_Types].xml" not in names or "ppt/presentation.xml" not in names:
+        report["reason"] = "zip is not a PowerPoint presentation"
+        return report
+
+    report["uncompressed_bytes"] = sum(info.file_size for info in infos)
+    for info in infos:
+        name = info.filename
+        if SLIDE_PART.match(name):
+            report["slides"] = (report["slides"] or 0) + 1
+        elif name.startswith("ppt/media/"):
+            report["media_files"] += 1
+            report["media_bytes"] += info.file_size
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                report["has_video"] = True
+        elif name.startswith("ppt/fonts/"):
+            report["embedded_fonts"] += 1
+    report["slides"] = report["slides"] or 0
+    report["valid"] = True
+    report["cost"] = estimated_cost(report)
+
+    if max_uncompressed and report["uncompressed_bytes"] > max_uncompressed:
+        report.update(valid=False, reason=f"expands to {report['uncompressed_bytes'] / 1024 ** 3:.1f} GiB")
+        return report
+    return _apply_limits(report, max_bytes, max_slides)
+
+
+def _apply_limits(report, max_bytes, max_slides):
+    if max_bytes and report["size"] > max_bytes:
+        report.update(valid=False, reason=f"file is {report['size'] / 1024 ** 2:.0f} MiB "
+                                          f"(limit {max_bytes / 1024 ** 2:.0f} MiB)")
+    elif max_slides and report["slides"] and report["slides"] > max_slides:
+        report.update(valid=False, reason=f"{report['slides']} slides (limit {max_slides})")
+    return report
@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import contextlib
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+# Leave this much of a RAM-backed filesystem free; bigger jobs spool to disk instead
+RAM_HEADROOM_BYTES = 256 * 1024 ** 2
+# Room for the PDF and intermediates next to the input, as a multiple of the input size
+SPACE_FACTOR = 3
+RAM_DIRECTORIES = ("/dev/shm",)
+_ram_root = None
+
+
+class SpoolLimitExceeded(ValueError):
+    """The input is larger than the caller's size limit."""
+
+
+def ram_root():
+    """A writable RAM-backed directory (PPTX2PDF_SPOOL_DIR or /dev/shm), or None."""
+    global _ram_root
+    if _ram_root is None:
+        _ram_root = False
+        candidates = [os.environ.get("PPTX2PDF_SPOOL_DIR")]
+        if sys.platform.startswith("linux"):
+            candidates += RAM_DIRECTORIES
+        for candidate in filter(None, candidates):
+            if os.path.isdir(candidate) and os.access(candidate, os.W_OK | os.X_OK):
+                _ram_root = candidate
+                break
+    return _ram_root or None
+
+
+def spool_root(size_hint=0):
+    """Where to put intermediates of about size_hint bytes: RAM when it fits, else the temp dir."""
+    root = ram_root()
+    if root:
+        try:
+            free = shutil.disk_usage(root).free
+        except OSError:
+            free = 0
+        if free - SPACE_FACTOR * size_hint > RAM_HEADROOM_BYTES:
+            return root
+        logger.info(f"Not enough free space in {root} for {size_hint} bytes; spooling to disk")
+    return tempfile.gettempdir()
+
+
+def spool_prefix(kind):
+    """Directory name prefix that records the owning process, so sweep_stale() can find leftovers."""
+    return f"pptx2pdf-{kind}-{os.getpid()}-"
+
+
+def pid_alive(pid):
+    """True, False, or None when it can't be told without risk (os.kill terminates on Windows)."""
+    try:
+        import psutil  # optional
+        return psutil.pid_exists(pid)
+    except ImportError:
+        pass
+    if os.name == "nt":
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_stale(directories):
+    """Remove spool directories left behind by processes that died (e.g. a killed service)."""
+    removed = 0
+    for directory in filter(None, set(directories)):
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        for entry in entries:
+            parts = entry.split("-")
+            if len(parts) < 4 or parts[0] != "pptx2pdf" or not parts[2].isdigit():
+                continue
+            pid = int(parts[2])
+            if pid != os.getpid() and pid_alive(pid) is False:
+                shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+                removed += 1
+    if removed:
+        logger.info(f"Removed {removed} spool directories left by earlier processes")
+    return removed
+
+
+@contextlib.contextmanager
+def spooled_workspace(size_hint=0):
+    """A private directory for one conversion, removed with everything in it on exit."""
+    workspace = Path(tempfile.mkdtemp(prefix=spool_prefix("spool"), dir=spool_root(size_hint)))
+    try:
+        yield workspace
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def copy_limited(source, destination, max_bytes=None):
+    """Stream a file-like object (or bytes) into destination; returns bytes copied.
+
+    Raises SpoolLimitExceeded as soon as more than max_bytes have been read.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if max_bytes and len(source) > max_bytes:
+            raise SpoolLimitExceeded(f"Input of {len(source)} bytes exceeds the {max_bytes} byte limit")
+        destination.write(source)
+        return len(source)
+    copied = 0
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return copied
+        copied += len(chunk)
+        if max_bytes and copied > max_bytes:
+            raise SpoolLimitExceeded(f"Input exceeds the {max_bytes} byte limit")
+        destination.write(chunk)
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The converter modules live at the top of the repository, not in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark import write_synthetic_deck  # noqa: E402
+from pptToPdf import PPTXtoPDFConverter  # noqa: E402
+
+
+@pytest.fixture
+def decks(tmp_path):
+    folder = tmp_path / "decks"
+    folder.mkdir()
+    for name, slides in (("alpha.pptx", 3), ("beta.pptx", 4), ("gamma.pptx", 5)):
+        write_synthetic_deck(folder / name, slides)
+    return folder
+
+
+@pytest.fixture
+def make_converter(tmp_path):
+    converters = []
+
+    def make(backend_options=None, **options):
+        """A converter (on the fake backend unless given another), closed after the test."""
+        options.setdefault("backend", "fake")
+        converter = PPTXtoPDFConverter(log_file=str(tmp_path / "conversion.log"),
+                                       backend_options=backend_options, **options)
+        converters.append(converter)
+        return converter
+
+    yield make
+    for converter in converters:
+        converter.close()
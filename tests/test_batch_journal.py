@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import multiprocessing
+from pathlib import Path
+
+from batch_journal import JOURNAL_NAME
+from benchmark import write_synthetic_deck
+from pptToPdf import PPTXtoPDFConverter
+
+DECKS = 6
+
+
+def _make_decks(folder):
+    folder.mkdir()
+    for index in range(DECKS):
+        write_synthetic_deck(folder / f"deck{index}.pptx", slides=index + 1)  # distinct, so none deduplicate
+
+
+def _converter(tmp_path, **backend_options):
+    return PPTXtoPDFConverter(log_file=str(tmp_path / "conversion.log"), backend="fake",
+                              backend_options=backend_options)
+
+
+def _resume(tmp_path, input_dir, output_dir, overwrite=False):
+    """Resume the batch; returns the names of the decks the engine had to convert."""
+    converter = _converter(tmp_path)
+    try:
+        assert converter.batch_convert(input_dir, output_dir, overwrite=overwrite, gui_mode=True, resume=True)
+        return sorted(path.name for path in converter.backend.converted)
+    finally:
+        converter.close()
+
+
+def _journaled(output_dir, state):
+    entries = {}
+    with open(output_dir / JOURNAL_NAME, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            entries[entry["file"]] = entry["state"]
+    return sorted(name for name, latest in entries.items() if latest == state)
+
+
+def _slow_batch(input_dir, output_dir, log_file):
+    converter = PPTXtoPDFConverter(log_file=log_file, backend="fake", backend_options={"delay": 0.5})
+    converter.batch_convert(input_dir, output_dir, gui_mode=True, journal=True)
+
+
+def test_resume_after_kill_converts_only_unfinished_decks(tmp_path):
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    _make_decks(input_dir)
+
+    context = multiprocessing.get_context("spawn")
+    batch = context.Process(target=_slow_batch, args=(input_dir, output_dir, str(tmp_path / "killed.log")))
+    batch.start()
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if (output_dir / JOURNAL_NAME).exists() and len(_journaled(output_dir, "done")) >= 2:
+            break
+        time.sleep(0.05)
+    batch.kill()
+    batch.join()
+
+    finished = _journaled(output_dir, "done")
+    unfinished = sorted({f"deck{index}.pptx" for index in range(DECKS)} - set(finished))
+    assert finished and unfinished
+    # The export the crash interrupted, and a foreign one from a converter that is still running
+    crashed_partial = output_dir / f".{Path(unfinished[0]).stem}.{batch.pid}.partial.pdf"
+    crashed_partial.write_bytes(b"%PDF-1.4 half written")
+    live_partial = output_dir / f".other.{os.getppid()}.partial.pdf"
+    live_partial.write_bytes(b"%PDF-1.4 in progress")
+
+    assert _resume(tmp_path, input_dir, output_dir) == unfinished
+    assert _journaled(output_dir, "done") == sorted(f"deck{index}.pptx" for index in range(DECKS))
+    assert not crashed_partial.exists()
+    assert live_partial.exists()
+
+
+def test_resume_reconverts_changed_decks_and_missing_pdfs(tmp_path):
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    _make_decks(input_dir)
+    converter = _converter(tmp_path)
+    try:
+        assert converter.batch_convert(input_dir, output_dir, overwrite=True, gui_mode=True, journal=True)
+    finally:
+        converter.close()
+    assert _resume(tmp_path, input_dir, output_dir, overwrite=True) == []
+
+    touched = input_dir / "deck1.pptx"
+    later = touched.stat().st_mtime + 10
+    os.utime(touched, (later, later))  # same size, new mtime
+    write_synthetic_deck(input_dir / "deck2.pptx", slides=12)  # new size
+    (output_dir / "deck4.pdf").unlink()
+    assert _resume(tmp_path, input_dir, output_dir, overwrite=True) == ["deck1.pptx", "deck2.pptx", "deck4.pptx"]
+    assert _resume(tmp_path, input_dir, output_dir, overwrite=True) == []
+
+
+def test_skipped_deck_is_converted_when_resumed_with_overwrite(tmp_path):
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    _make_decks(input_dir)
+    output_dir.mkdir()
+    (output_dir / "deck0.pdf").write_bytes(b"%PDF-1.4 older export")
+    converter = _converter(tmp_path)
+    try:
+        converter.batch_convert(input_dir, output_dir, gui_mode=True, journal=True)
+    finally:
+        converter.close()
+    assert _journaled(output_dir, "skipped") == ["deck0.pptx"]
+
+    assert _resume(tmp_path, input_dir, output_dir) == []  # still not overwriting
+    assert _resume(tmp_path, input_dir, output_dir, overwrite=True) == ["deck0.pptx"]
+    assert (output_dir / "deck0.pdf").read_bytes() != b"%PDF-1.4 older export"
+
+
+def test_failed_export_keeps_the_previous_pdf(tmp_path):
+    input_dir = tmp_path / "input"
+    _make_decks(input_dir)
+    output = tmp_path / "deck0.pdf"
+    output.write_bytes(b"%PDF-1.4 previous export")
+    converter = _converter(tmp_path, fail_on=["deck0.pptx"])
+    try:
+        assert not converter.convert_single_file(input_dir / "deck0.pptx", output, overwrite=True)
+    finally:
+        converter.close()
+    assert output.read_bytes() == b"%PDF-1.4 previous export"
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".pdf"] == ["deck0.pdf"]
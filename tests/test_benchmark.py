@@ -0,0 +1,35 @@
+import os
+import time
+
+import pytest
+
+from benchmark import PeakRSS, percentile
+from engine_watchdog import process_rss
+
+
+@pytest.mark.parametrize("values, fraction, expected", [
+    (range(1, 101), 0.50, 50),
+    (range(1, 101), 0.95, 95),
+    (range(1, 101), 0.99, 99),
+    (range(1, 101), 1.00, 100),
+    ([1, 2], 0.50, 1),
+    ([2, 1], 0.99, 2),
+    (range(1, 11), 0.50, 5),
+    (range(1, 11), 0.95, 10),
+    ([7], 0.50, 7),
+    ([7], 0.0, 7),
+])
+def test_percentile_is_nearest_rank(values, fraction, expected):
+    assert percentile(list(values), fraction) == expected
+
+
+def test_percentile_of_nothing():
+    assert percentile([], 0.5) is None
+
+
+@pytest.mark.skipif(process_rss(os.getpid()) is None, reason="needs psutil or /proc")
+def test_peak_rss_samples_this_process():
+    with PeakRSS(interval=0.01) as rss:
+        ballast = bytearray(b"x" * 32 * 1024 ** 2)
+        time.sleep(0.2)
+    assert rss.peak >= len(ballast)
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+import cli
+from benchmark import write_synthetic_deck
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "decks"
+    folder.mkdir()
+    for index in range(12):
+        write_synthetic_deck(folder / f"deck{index:02d}.pptx", index % 4 + 1)
+    return folder
+
+
+def _run(capsys, tmp_path, *argv):
+    code = cli.main([*argv, "--log-file", str(tmp_path / "cli.log")])
+    out, err = capsys.readouterr()
+    return code, [json.loads(line) for line in out.splitlines()], err
+
+
+def test_shards_partition_the_inputs(capsys, tmp_path, folder):
+    shards = []
+    for index in range(3):
+        code, lines, _ = _run(capsys, tmp_path, str(folder), "--shard", f"{index}/3", "--list")
+        assert code == cli.EXIT_OK
+        shards.append({line["input"] for line in lines})
+    everything = set().union(*shards)
+    assert len(everything) == sum(len(shard) for shard in shards) == 12  # disjoint and complete
+    # Every machine given the same arguments computes the same shard
+    assert {line["input"] for line in _run(capsys, tmp_path, str(folder), "--shard", "1/3", "--list")[1]} \
+        == shards[1]
+
+
+def test_conversion_prints_one_json_line_per_file(capsys, tmp_path, folder):
+    code, lines, err = _run(capsys, tmp_path, str(folder), "--backend", "fake",
+                            "--output", str(tmp_path / "out" / "{stem}.pdf"))
+    assert code == cli.EXIT_OK
+    assert len(lines) == 12 and all(line["outcome"] == "converted" for line in lines)
+    assert "12/12 files converted" in err
+
+    code, lines, err = _run(capsys, tmp_path, str(folder), "--backend", "fake",
+                            "--output", str(tmp_path / "out" / "{stem}.pdf"))
+    assert code == cli.EXIT_OK  # existing PDFs are skipped, not failures
+    assert {line["outcome"] for line in lines} == {"skipped"}
+    assert "0/12 files converted (12 skipped)" in err
+
+
+def test_failures_exit_1(capsys, tmp_path, folder):
+    code, lines, err = _run(capsys, tmp_path, str(folder / "deck00.pptx"), str(folder / "deck01.pptx"),
+                            "--backend", "fake", "--backend-option", 'fail_on=["deck01.pptx"]')
+    assert code == cli.EXIT_FAILURES
+    assert [line["outcome"] for line in lines] == ["converted", "failed"]
+    assert "1/2 files converted (1 failed)" in err
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["{folder}", "--shard", "3/3"],
+    ["{folder}", "--workers", "0"],
+    ["{folder}", "--output", "{{nope}}.pdf"],
+    ["{folder}/*.docx"],
+    ["{folder}", "--backend-option", "no-equals-sign"],
+])
+def test_usage_errors_exit_2(capsys, tmp_path, folder, argv):
+    code, lines, _ = _run(capsys, tmp_path, *(arg.format(folder=folder) for arg in argv))
+    assert code == cli.EXIT_USAGE and lines == []
+
+
+def test_empty_shard_is_not_an_error(capsys, tmp_path, folder):
+    deck = str(folder / "deck00.pptx")
+    results = [_run(capsys, tmp_path, deck, "--shard", f"{index}/2", "--backend", "fake") for index in range(2)]
+    assert sorted(code for code, _, _ in results) == [cli.EXIT_OK, cli.EXIT_OK]
+    assert sorted(len(lines) for _, lines, _ in results) == [0, 1]
+    assert any("selected none of the inputs" in err for _, _, err in results)
+
+
+def test_engine_that_cannot_start_exits_3(capsys, tmp_path, folder):
+    code, lines, err = _run(capsys, tmp_path, str(folder), "--backend", "no-such-engine")
+    assert code == cli.EXIT_ENGINE and lines == []
+    assert "could not start the conversion engine" in err
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import pytest
+
+import conversion_cache
+from benchmark import write_synthetic_deck
+from conversion_cache import ConversionCache, clone_or_copy
+
+
+def _pdf(path, size):
+    path.write_bytes(b"%PDF-1.4\n" + b"x" * (size - 9))
+    return path
+
+
+def test_cache_hit_and_miss(decks, tmp_path, make_converter):
+    converter = make_converter(cache_dir=tmp_path / "cache")
+    assert converter.convert_single_file(decks / "alpha.pptx", tmp_path / "first.pdf")
+    assert converter.last_record["outcome"] == "converted"
+    assert converter.convert_single_file(decks / "alpha.pptx", tmp_path / "second.pdf")
+    assert converter.last_record["outcome"] == "cache_hit"
+    assert converter.backend.converted == [decks / "alpha.pptx"]
+    assert (tmp_path / "first.pdf").read_bytes() == (tmp_path / "second.pdf").read_bytes()
+    assert (converter.cache.hits, converter.cache.misses) == (1, 1)
+
+    # Editing a served copy must not reach the cache entry behind it
+    (tmp_path / "second.pdf").write_bytes(b"annotated")
+    assert converter.convert_single_file(decks / "alpha.pptx", tmp_path / "third.pdf")
+    assert (tmp_path / "third.pdf").read_bytes() == (tmp_path / "first.pdf").read_bytes()
+
+
+def test_duplicate_outputs_are_copies(tmp_path, make_converter):
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    write_synthetic_deck(decks / "original.pptx", 3)
+    shutil.copyfile(decks / "original.pptx", decks / "copy.pptx")
+    converter = make_converter()
+    results = []
+    assert converter.batch_convert(decks, tmp_path / "pdfs", gui_mode=True, on_result=results.append)
+
+    assert len(converter.backend.converted) == 1
+    outcomes = sorted(result.get("outcome") or result["record"]["outcome"] for result in results)
+    assert outcomes == ["converted", "duplicate"]  # whichever the scanner found first is converted
+    original, duplicate = tmp_path / "pdfs" / "original.pdf", tmp_path / "pdfs" / "copy.pdf"
+    assert original.read_bytes() == duplicate.read_bytes()
+    assert not os.path.samefile(original, duplicate)
+    assert original.stat().st_nlink == duplicate.stat().st_nlink == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ConversionCache(tmp_path / "cache", max_bytes=2500)
+    for number, key in enumerate("abc"):
+        cache.store(key, _pdf(tmp_path / f"{key}.pdf", 1000))
+        os.utime(cache.cache_dir / f"{key}.pdf", (number, number))
+    # c pushed the cache past max_bytes: a, the oldest, went
+    assert [item["key"] for item in cache.entries()] == ["b", "c"]
+
+    assert cache.materialize("b", tmp_path / "out.pdf")  # b is now the most recent
+    cache.store("d", _pdf(tmp_path / "d.pdf", 1000))
+    assert [item["key"] for item in cache.entries()] == ["b", "d"]
+    assert not cache.materialize("a", tmp_path / "out.pdf")
+    assert cache.stats()["bytes"] == 2000
+
+
+def test_store_only_scans_the_cache_when_full(tmp_path, monkeypatch):
+    cache = ConversionCache(tmp_path / "cache", max_bytes=10_000)
+    scans = []
+    entries = cache.entries
+    monkeypatch.setattr(cache, "entries", lambda: scans.append(1) or entries())
+    for key in "abcdefgh":
+        cache.store(key, _pdf(tmp_path / f"{key}.pdf", 1000))
+    assert len(scans) == 1  # the first store learns the size; the rest keep a running total
+    cache.store("i", _pdf(tmp_path / "i.pdf", 1000))
+    cache.store("j", _pdf(tmp_path / "j.pdf", 1500))  # 10.5 kB: over the limit
+    assert len(scans) == 2
+    assert cache.stats()["bytes"] <= 10_000
+
+
+def test_clone_or_copy_leaves_no_temp_file_on_failure(tmp_path, monkeypatch):
+    def half_copy(source, destination):
+        open(destination, "wb").close()
+        raise OSError("disk full")
+
+    monkeypatch.setattr(conversion_cache, "_reflink", half_copy)
+    monkeypatch.setattr(conversion_cache.shutil, "copyfile", half_copy)
+    with pytest.raises(OSError):
+        clone_or_copy(_pdf(tmp_path / "source.pdf", 100), tmp_path / "dest.pdf")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["source.pdf"]
@@ -0,0 +1,112 @@
+import json
+import time
+import socket
+import threading
+import http.client
+
+import pytest
+
+from benchmark import write_synthetic_deck
+from conversion_service import ConversionService
+from pptToPdf import PPTXtoPDFConverter
+
+
+@pytest.fixture
+def service(tmp_path):
+    """A service on a free port with one fake-engine worker (1s per deck) and room for one queued job."""
+    def create_converter(worker_id):
+        return PPTXtoPDFConverter(log_file=str(tmp_path / "service.log"), backend="fake",
+                                  backend_options={"delay": 1.0}, worker_id=worker_id)
+
+    service = ConversionService(create_converter, workers=1, queue_size=1, work_dir=tmp_path / "work",
+                                max_upload_bytes=1024 ** 2)
+    server = service.serve(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    service.port = server.server_address[1]
+    yield service
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _request(service, method, path, body=b"", headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", service.port, timeout=30)
+    try:
+        connection.putrequest(method, path)
+        for name, value in (headers if headers is not None else {"Content-Length": str(len(body))}).items():
+            connection.putheader(name, value)
+        connection.endheaders(body or None)
+        response = connection.getresponse()
+        data = response.read()
+        if response.getheader("Content-Type") == "application/json":
+            data = json.loads(data)
+        return response.status, dict(response.getheaders()), data
+    finally:
+        connection.close()
+
+
+def _wait_for(service, job_id, *statuses):
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        _, _, job = _request(service, "GET", f"/jobs/{job_id}")
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} never reached {statuses}")
+
+
+@pytest.fixture
+def deck(tmp_path):
+    write_synthetic_deck(tmp_path / "deck.pptx", 2)
+    return (tmp_path / "deck.pptx").read_bytes()
+
+
+def test_convert_and_download(service, deck):
+    status, headers, job = _request(service, "POST", "/jobs?name=deck.pptx", deck)
+    assert status == 202 and headers["Location"] == f"/jobs/{job['id']}"
+    job = _wait_for(service, job["id"], "done", "failed")
+    assert job["status"] == "done"
+    status, headers, pdf = _request(service, "GET", job["pdf"])
+    assert status == 200 and pdf.startswith(b"%PDF")
+    assert headers["Content-Disposition"] == 'attachment; filename="deck.pdf"'
+
+
+def test_full_queue_answers_429(service, deck):
+    _, _, running = _request(service, "POST", "/jobs?name=one.pptx", deck)
+    _wait_for(service, running["id"], "running")
+    status, _, _ = _request(service, "POST", "/jobs?name=two.pptx", deck)
+    assert status == 202  # fills the one queue slot
+    status, headers, body = _request(service, "POST", "/jobs?name=three.pptx", deck)
+    assert (status, headers["Retry-After"], body) == (429, "5", {"error": "queue full"})
+    assert service.health()["queued"] == 1
+
+
+@pytest.mark.parametrize("path, headers, expected", [
+    ("/jobs?name=deck.pptx", {"Content-Length": "many"}, 400),
+    ("/jobs?name=deck.pptx", {"Content-Length": "-5"}, 400),
+    ("/jobs?name=deck.pptx", {}, 411),
+    ("/jobs?name=deck.pdf", {"Content-Length": "0"}, 415),
+    ("/jobs?name=deck.pptx", {"Content-Length": str(2 * 1024 ** 2)}, 413),
+    ("/elsewhere", {"Content-Length": "0"}, 404),
+])
+def test_bad_uploads_are_refused(service, path, headers, expected):
+    status, _, body = _request(service, "POST", path, headers=headers)
+    assert status == expected and body["error"]
+    assert not list(service.work_dir.iterdir())  # nothing was spooled
+
+
+def test_truncated_upload_is_refused(service):
+    with socket.create_connection(("127.0.0.1", service.port), timeout=30) as client:
+        client.sendall(b"POST /jobs?name=deck.pptx HTTP/1.1\r\nHost: test\r\nContent-Length: 100\r\n\r\nPK\x03\x04")
+        client.shutdown(socket.SHUT_WR)  # the client gives up after four bytes
+        response = http.client.HTTPResponse(client)
+        response.begin()
+        assert (response.status, json.loads(response.read())) == (400, {"error": "Upload ended early"})
+    assert not list(service.work_dir.iterdir())
+
+
+def test_unknown_jobs(service):
+    assert _request(service, "GET", "/jobs/999")[0] == 404
+    assert _request(service, "GET", "/jobs/nope/pdf")[0] == 404
+    assert _request(service, "DELETE", "/jobs/999")[0] == 404
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+
+def test_convert_single_file(decks, tmp_path, make_converter):
+    converter = make_converter()
+    output = tmp_path / "alpha.pdf"
+    assert converter.convert_single_file(decks / "alpha.pptx", output)
+    assert output.read_bytes().startswith(b"%PDF")
+    assert converter.last_record["outcome"] == "converted"
+    assert converter.last_record["slide_count"] == 3
+
+    assert not converter.convert_single_file(decks / "alpha.pptx", output)  # exists, no overwrite
+    assert converter.last_record["outcome"] == "skipped"
+
+
+def test_batch_convert_reports_failures(decks, tmp_path, make_converter):
+    converter = make_converter({"fail_on": ["beta.pptx"]})
+    results = []
+    converter.batch_convert(decks, tmp_path / "pdfs", gui_mode=True, on_result=results.append)
+
+    outcomes = {Path(result["input"]).name: result["success"] for result in results}
+    assert outcomes == {"alpha.pptx": True, "beta.pptx": False, "gamma.pptx": True}
+    assert sorted(path.name for path in (tmp_path / "pdfs").glob("*.pdf")) == ["alpha.pdf", "gamma.pdf"]
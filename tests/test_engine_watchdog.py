@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import subprocess
+
+import pytest
+
+from backends import FakeBackend
+from engine_watchdog import Watchdog, child_pids, is_transient, kill_process_group
+
+
+def test_hung_engine_is_killed_after_timeout(decks, tmp_path, make_converter):
+    converter = make_converter({"hang_on": ["alpha.pptx"]}, timeout=0.5)
+    assert not converter.convert_single_file(decks / "alpha.pptx", tmp_path / "alpha.pdf")
+    assert converter.last_record["outcome"] == "timeout"
+    assert not (tmp_path / "alpha.pdf").exists()
+
+    # The restarted engine carries on with the next deck
+    assert converter.convert_single_file(decks / "beta.pptx", tmp_path / "beta.pdf")
+    assert converter.backend.starts == 2
+
+
+def test_timeout_refused_for_an_engine_that_cannot_be_killed(make_converter):
+    class UnkillableBackend(FakeBackend):
+        def can_kill(self):
+            return False
+
+    with pytest.raises(Exception, match="can kill"):
+        make_converter(timeout=5, backend=UnkillableBackend())
+    make_converter(backend=UnkillableBackend())  # fine without a timeout
+
+
+def test_watchdog_only_fires_on_overrun():
+    fired = []
+    with Watchdog(1, lambda: fired.append(True)) as watchdog:
+        pass
+    assert not watchdog.fired
+    with Watchdog(0.05, lambda: fired.append(True)) as watchdog:
+        time.sleep(0.3)
+    assert watchdog.fired and fired == [True]
+
+
+def test_is_transient():
+    assert is_transient(Exception(-2147023174, "The RPC server is unavailable."))
+    assert is_transient(Exception("Binary URP bridge disposed during call"))
+    assert not is_transient(Exception("The file is corrupt"))
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="POSIX process groups, observed through /proc")
+def test_kill_process_group_reaches_grandchildren():
+    launcher = subprocess.Popen([sys.executable, "-c", "import subprocess, sys, time; "
+                                 "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+                                 "time.sleep(60)"], start_new_session=True)
+    try:
+        deadline = time.monotonic() + 10
+        while not child_pids(launcher.pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        grandchildren = child_pids(launcher.pid)
+        assert grandchildren
+        kill_process_group(launcher.pid)
+        launcher.wait(timeout=10)
+        deadline = time.monotonic() + 10
+        while any(_running(pid) for pid in grandchildren) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not any(_running(pid) for pid in grandchildren)
+    finally:
+        if launcher.poll() is None:
+            launcher.kill()
+
+
+def _running(pid):
+    """Alive and not a zombie waiting for its (killed) parent to be reaped by init."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
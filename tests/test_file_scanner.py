@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from file_scanner import scan_presentations
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"deck")
+    return path
+
+
+def _names(root, **options):
+    return [path.relative_to(root).as_posix() for path in scan_presentations(root, **options)]
+
+
+def test_extensions_match_case_insensitively(tmp_path):
+    for name in ("a.pptx", "B.PPTX", "c.Ppt", "d.pdf", "e.pptx.bak", "~$a.pptx", "notes.txt"):
+        _touch(tmp_path / name)
+    assert _names(tmp_path) == ["B.PPTX", "a.pptx", "c.Ppt"]
+
+
+def test_same_file_reached_twice_is_yielded_once(tmp_path):
+    original = _touch(tmp_path / "a.pptx")
+    try:
+        os.link(original, tmp_path / "b.pptx")
+    except OSError:
+        pytest.skip("no hardlinks on this filesystem")
+    try:
+        (tmp_path / "c.pptx").symlink_to(original)
+    except OSError:
+        pass  # unprivileged Windows: the hardlink still proves the point
+    assert _names(tmp_path) == ["a.pptx"]
+
+
+def test_recursive_scan_with_filters(tmp_path):
+    for name in ("top.pptx", "sub/inner.pptx", "sub/draft-inner.pptx", "archive/old.pptx"):
+        _touch(tmp_path / name)
+    assert _names(tmp_path) == ["top.pptx"]
+    assert _names(tmp_path, recursive=True) == ["top.pptx", "archive/old.pptx", "sub/draft-inner.pptx",
+                                                "sub/inner.pptx"]
+    assert _names(tmp_path, recursive=True, exclude=["archive", "draft-*"]) == ["top.pptx", "sub/inner.pptx"]
+    assert _names(tmp_path, recursive=True, include=["sub/*"]) == ["sub/draft-inner.pptx", "sub/inner.pptx"]
+
+
+def test_scan_is_lazy(tmp_path):
+    _touch(tmp_path / "a.pptx")
+    scan = scan_presentations(tmp_path)
+    _touch(tmp_path / "b.pptx")  # nothing has been read yet
+    assert [path.name for path in scan] == ["a.pptx", "b.pptx"]
@@ -0,0 +1,85 @@
+import zipfile
+
+import pytest
+
+from backends import FakeBackend
+from benchmark import write_synthetic_deck
+
+pypdf = pytest.importorskip("pypdf")
+
+
+class RecordingBackend(FakeBackend):
+    """The fake engine, noting every slide range it was asked to export."""
+
+    def __init__(self):
+        super().__init__()
+        self.exports = []
+
+    def export_slides(self, input_path, output_path, first, last):
+        self.exports.append((first, last))
+        return super().export_slides(input_path, output_path, first, last)
+
+
+def _edit_slides(deck, *numbers):
+    """Rewrite the deck with new text on the given slides."""
+    with zipfile.ZipFile(deck) as archive:
+        parts = [(info, archive.read(info)) for info in archive.infolist()]
+    with zipfile.ZipFile(deck, "w", zipfile.ZIP_DEFLATED) as archive:
+        for info, data in parts:
+            for number in numbers:
+                if info.filename == f"ppt/slides/slide{number}.xml":
+                    data = data.replace(b"Benchmark slide", b"Edited slide")
+            archive.writestr(info, data)
+
+
+def _pages(pdf):
+    return [page.extract_text().strip() for page in pypdf.PdfReader(pdf).pages]
+
+
+@pytest.fixture
+def converted(tmp_path, make_converter):
+    """A 6-slide deck, its PDF, and the incremental converter that made it."""
+    deck, pdf = tmp_path / "deck.pptx", tmp_path / "deck.pdf"
+    write_synthetic_deck(deck, 6)
+    backend = RecordingBackend()
+    converter = make_converter(backend=backend, incremental=True)
+    assert converter.convert_single_file(deck, pdf, overwrite=True)
+    assert backend.exports == [(1, None)]
+    backend.exports.clear()
+    return converter, deck, pdf
+
+
+def test_only_changed_slides_are_reexported(converted):
+    converter, deck, pdf = converted
+    before = _pages(pdf)
+    _edit_slides(deck, 3, 4)
+    assert converter.convert_single_file(deck, pdf, overwrite=True)
+
+    assert converter.backend.exports == [(3, 4)]
+    assert converter.last_record["slides_reexported"] == 2
+    after = _pages(pdf)
+    assert len(after) == 6
+    assert [number for number in range(6) if after[number] != before[number]] == [2, 3]
+    assert after[2].startswith("deck slide 3 ")
+
+
+def test_unchanged_deck_is_not_exported(converted):
+    converter, deck, pdf = converted
+    assert converter.convert_single_file(deck, pdf, overwrite=True)
+    assert converter.backend.exports == []
+    assert converter.last_record["slides_reexported"] == 0
+
+
+@pytest.mark.parametrize("change", ["most slides", "slide count", "edited pdf"])
+def test_full_export_when_splicing_is_not_safe(converted, change):
+    converter, deck, pdf = converted
+    if change == "most slides":
+        _edit_slides(deck, 1, 2, 3, 4)
+    elif change == "slide count":
+        write_synthetic_deck(deck, 7)
+    else:
+        _edit_slides(deck, 2)
+        pdf.write_bytes(pdf.read_bytes() + b"\n% annotated")
+    assert converter.convert_single_file(deck, pdf, overwrite=True)
+    assert converter.backend.exports == [(1, None)]
+    assert converter.last_record["slides_reexported"] is None
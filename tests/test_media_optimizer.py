@@ -0,0 +1,49 @@
+import io
+import zipfile
+
+import pytest
+
+from benchmark import write_synthetic_deck
+from media_optimizer import optimize_deck
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def test_optimized_deck_is_a_valid_zip_with_smaller_images(tmp_path):
+    deck, optimized = tmp_path / "deck.pptx", tmp_path / "optimized.pptx"
+    write_synthetic_deck(deck, 3, image_kb=300)  # about 320 px square per slide
+    stats = optimize_deck(deck, optimized, dpi=20)  # a 10 x 7.5 in slide: at most 200 x 150 px
+
+    assert (stats["images"], stats["downsampled"]) == (3, 3)
+    assert stats["media_bytes_after"] < stats["media_bytes_before"]
+    with zipfile.ZipFile(deck) as before, zipfile.ZipFile(optimized) as after:
+        assert after.testzip() is None
+        assert after.namelist() == before.namelist()
+        for name in after.namelist():
+            if name.startswith("ppt/media/"):
+                with Image.open(io.BytesIO(after.read(name))) as image:
+                    assert image.format == "PNG"
+                    assert image.width <= 200 and image.height <= 150
+            else:
+                assert after.read(name) == before.read(name)
+
+
+def test_small_images_are_left_alone(tmp_path):
+    deck, optimized = tmp_path / "deck.pptx", tmp_path / "optimized.pptx"
+    write_synthetic_deck(deck, 2, image_kb=300)
+    stats = optimize_deck(deck, optimized, dpi=300)
+    assert stats["downsampled"] == 0
+    with zipfile.ZipFile(deck) as before, zipfile.ZipFile(optimized) as after:
+        assert [after.read(name) for name in after.namelist()] == [before.read(name) for name in before.namelist()]
+
+
+def test_converter_exports_the_downsampled_copy(tmp_path, make_converter):
+    deck = tmp_path / "deck.pptx"
+    write_synthetic_deck(deck, 2, image_kb=300)
+    converter = make_converter(media_dpi=20)
+    assert converter.convert_single_file(deck, tmp_path / "deck.pdf")
+    record = converter.last_record
+    assert record["images_downsampled"] == 2
+    assert record["optimized_size"] < record["input_size"]
+    assert converter.backend.converted[0] != deck  # the engine got the temporary copy...
+    assert not converter.backend.converted[0].exists()  # ...which is gone again
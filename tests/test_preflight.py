@@ -0,0 +1,91 @@
+import struct
+import zipfile
+from pathlib import Path
+
+from benchmark import write_synthetic_deck
+from preflight import CFB_MAGIC, inspect_presentation
+
+
+def _declare_size(path, member, size):
+    """Rewrite a member's uncompressed size in the zip's central directory, like a zip bomb would."""
+    data = bytearray(path.read_bytes())
+    end_record = data.rfind(b"PK\x05\x06")
+    entry = struct.unpack_from("<I", data, end_record + 16)[0]  # start of the central directory
+    while data[entry:entry + 4] == b"PK\x01\x02":
+        name_length = struct.unpack_from("<H", data, entry + 28)[0]
+        if data[entry + 46:entry + 46 + name_length] == member.encode():
+            struct.pack_into("<I", data, entry + 24, size)
+            path.write_bytes(data)
+            return
+        extra_length, comment_length = struct.unpack_from("<HH", data, entry + 30)
+        entry += 46 + name_length + extra_length + comment_length
+    raise AssertionError(f"{member} not in {path}")
+
+
+def _ole2(path, stream_name=None):
+    """A minimal Compound File Binary header with one directory sector, as legacy/encrypted decks have."""
+    header = bytearray(512)
+    header[:8] = CFB_MAGIC
+    struct.pack_into("<H", header, 0x1E, 9)  # 512-byte sectors
+    struct.pack_into("<I", header, 0x30, 0)  # directory in sector 0, right after the header
+    directory = bytearray(512)
+    if stream_name:
+        encoded = (stream_name + "\0").encode("utf-16-le")
+        directory[:len(encoded)] = encoded
+        struct.pack_into("<H", directory, 0x40, len(encoded))
+    path.write_bytes(bytes(header + directory))
+    return path
+
+
+def test_broken_decks_are_rejected_before_the_engine(tmp_path, make_converter):
+    write_synthetic_deck(tmp_path / "good.pptx", 2)
+    (tmp_path / "truncated.pptx").write_bytes((tmp_path / "good.pptx").read_bytes()[:300])
+    (tmp_path / "text.pptx").write_text("not a deck")
+    with zipfile.ZipFile(tmp_path / "archive.pptx", "w") as archive:
+        archive.writestr("readme.txt", "a zip, but no presentation")
+    write_synthetic_deck(tmp_path / "bomb.pptx", 1, image_kb=1)
+    _declare_size(tmp_path / "bomb.pptx", "ppt/media/image1.png", 0xFFFFFFFF)  # a 4 GiB image
+    _ole2(tmp_path / "locked.pptx", "EncryptedPackage")
+
+    converter = make_converter()
+    reasons = {}
+    for name in ("truncated", "text", "archive", "bomb", "locked"):
+        assert not converter.convert_single_file(tmp_path / f"{name}.pptx", tmp_path / f"{name}.pdf")
+        assert converter.last_record["outcome"] == "rejected"
+        reasons[name] = converter.last_record["error"]
+    assert converter.backend.converted == []
+    assert "corrupt zip" in reasons["truncated"]
+    assert "neither zip nor OLE2" in reasons["text"]
+    assert "not a PowerPoint presentation" in reasons["archive"]
+    assert "expands to" in reasons["bomb"]
+    assert "encrypted" in reasons["locked"]
+
+
+def test_inflation_limit(tmp_path):
+    deck = tmp_path / "deck.pptx"
+    write_synthetic_deck(deck, 2, image_kb=64)
+    report = inspect_presentation(deck)
+    assert report["valid"] and report["slides"] == 2 and report["media_files"] == 2
+    assert not inspect_presentation(deck, max_uncompressed=report["uncompressed_bytes"] - 1)["valid"]
+    assert not inspect_presentation(deck, max_slides=1)["valid"]
+
+
+def test_legacy_deck_is_accepted_whatever_its_extension(tmp_path):
+    for name in ("old.ppt", "misnamed.pptx"):
+        report = inspect_presentation(_ole2(tmp_path / name))
+        assert (report["format"], report["valid"]) == ("ppt", True)
+
+
+def test_largest_first_ordering(tmp_path, make_converter):
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    for name, slides, image_kb in (("a_small.pptx", 1, 0), ("b_huge.pptx", 4, 1000), ("c_medium.pptx", 12, 0)):
+        write_synthetic_deck(decks / name, slides, image_kb)
+    totals = []
+    order = []
+    converter = make_converter()
+    assert converter.batch_convert(decks, tmp_path / "pdfs", gui_mode=True, order="largest_first",
+                                   on_result=lambda result: order.append(Path(result["input"]).name),
+                                   progress_callback=lambda progress: totals.append(progress["total"]))
+    assert order == ["b_huge.pptx", "c_medium.pptx", "a_small.pptx"]
+    assert set(totals) == {3}  # the whole folder was pre-flighted before the first file
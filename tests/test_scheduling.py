@@ -0,0 +1,81 @@
+import pytest
+
+from conversion_worker import HIGH, LOW, NORMAL, ConversionJob, JobQueue
+from eta_model import DEFAULT_SECONDS, ThroughputModel
+
+
+def _job(name, priority=NORMAL):
+    job = ConversionJob("single", name, None, priority=priority)
+    job.name = name
+    return job
+
+
+def _names(jobs):
+    return [job.name for job in jobs]
+
+
+def test_jobs_run_by_priority_then_arrival():
+    jobs = JobQueue()
+    for name, priority in (("n1", NORMAL), ("l1", LOW), ("h1", HIGH), ("n2", NORMAL), ("h2", HIGH), ("l2", LOW)):
+        jobs.put(_job(name, priority))
+    assert _names(jobs.snapshot()) == ["h1", "h2", "n1", "n2", "l1", "l2"]
+    jobs.put(None)  # the stop sentinel jumps the queue
+    assert jobs.get() is None
+    assert _names(jobs.get() for _ in range(6)) == ["h1", "h2", "n1", "n2", "l1", "l2"]
+
+
+def test_waiting_jobs_can_be_moved_and_withdrawn():
+    jobs = JobQueue()
+    n1, n2, l1 = _job("n1"), _job("n2"), _job("l1", LOW)
+    for job in (n1, n2, l1):
+        jobs.put(job)
+
+    assert jobs.move(l1, -2)  # past two normal jobs: it becomes normal too
+    assert _names(jobs.snapshot()) == ["l1", "n1", "n2"] and l1.priority == NORMAL
+    assert not jobs.move(l1, -1)  # already first
+    jobs.put(_job("h1", HIGH))
+    assert _names(jobs.snapshot()) == ["h1", "l1", "n1", "n2"]
+
+    assert jobs.remove(n1) and not jobs.remove(n1)
+    started = jobs.get()
+    assert started.name == "h1" and not jobs.remove(started)
+    assert _names(jobs.snapshot()) == ["l1", "n2"]
+
+
+def _record(mib, slides, seconds, backend="fake", **extra):
+    return {"outcome": "converted", "backend": backend, "input_size": int(mib * 1024 ** 2),
+            "slide_count": slides, "total_seconds": seconds, **extra}
+
+
+def test_eta_fits_size_and_slide_cost(tmp_path):
+    model = ThroughputModel(tmp_path / "history.json")
+    assert model.predict(1024 ** 2, 10) == DEFAULT_SECONDS
+    for mib, slides in ((1, 5), (4, 10), (2, 40), (8, 20), (16, 60), (3, 3)):
+        assert model.observe(_record(mib, slides, 1.0 + 0.5 * mib + 0.1 * slides))
+    assert model.predict(10 * 1024 ** 2, 30) == pytest.approx(9.0, abs=0.01)
+    assert model.predict(0, 0) == pytest.approx(1.0, abs=0.01)
+    assert model.predict_many([(1024 ** 2, 10), (10 * 1024 ** 2, 30)]) == pytest.approx(11.5, abs=0.02)
+
+    model.save()  # estimates carry over to the next session
+    reloaded = ThroughputModel(tmp_path / "history.json")
+    assert reloaded.predict(10 * 1024 ** 2, 30) == pytest.approx(9.0, abs=0.01)
+
+
+def test_eta_with_little_or_foreign_history(tmp_path):
+    model = ThroughputModel(tmp_path / "history.json", max_samples=3)
+    for seconds in (2.0, 4.0):
+        model.observe(_record(1, 5, seconds, backend="libreoffice"))
+    assert model.predict(50 * 1024 ** 2, 100, backend="libreoffice") == 3.0  # too few for a fit: the mean
+    assert model.predict(1024 ** 2, 5, backend="powerpoint") == 3.0  # no history of its own: pooled
+    assert not model.observe(_record(1, 5, 60.0, slides_reexported=1))  # partial re-export
+    assert not model.observe({**_record(1, 5, 60.0), "outcome": "cache_hit"})
+    for seconds in (6.0, 6.0):
+        model.observe(_record(1, 5, seconds, backend="libreoffice"))
+    assert model.sample_count("libreoffice") == 3  # only the most recent max_samples are kept
+    assert model.predict(1024 ** 2, 5, backend="libreoffice") == pytest.approx(16 / 3)
+
+
+def test_unreadable_history_is_ignored(tmp_path):
+    history = tmp_path / "history.json"
+    history.write_text("{not json")
+    assert ThroughputModel(history).predict(1024 ** 2) == DEFAULT_SECONDS
@@ -0,0 +1,91 @@
+import io
+import os
+import sys
+import time
+import subprocess
+
+import pytest
+
+import spooling
+from benchmark import write_synthetic_deck
+from conversion_service import ConversionService
+from pptToPdf import ConversionFailed, PPTXtoPDFConverter
+from spooling import SpoolLimitExceeded, spool_prefix, spool_root, sweep_stale
+
+
+@pytest.fixture
+def ram(tmp_path, monkeypatch):
+    """Stand-in for /dev/shm, so every spool directory lands somewhere the test can see."""
+    ram = tmp_path / "ram"
+    ram.mkdir()
+    monkeypatch.setattr(spooling, "_ram_root", str(ram))
+    monkeypatch.setattr(spooling, "RAM_HEADROOM_BYTES", 0)
+    return ram
+
+
+@pytest.fixture
+def deck_bytes(tmp_path):
+    write_synthetic_deck(tmp_path / "deck.pptx", 2)
+    return (tmp_path / "deck.pptx").read_bytes()
+
+
+def test_convert_bytes_spools_in_ram_and_cleans_up(ram, deck_bytes, make_converter):
+    converter = make_converter()
+    assert converter.convert_bytes(deck_bytes, name="deck.pptx").startswith(b"%PDF")
+    assert converter.backend.converted[0].parent.parent == ram
+    destination = io.BytesIO()
+    assert converter.convert_stream(io.BytesIO(deck_bytes), destination) == len(destination.getvalue())
+    assert list(ram.iterdir()) == []
+
+
+def test_size_limit(ram, deck_bytes, make_converter):
+    converter = make_converter()
+    for source in (deck_bytes, io.BytesIO(deck_bytes)):
+        with pytest.raises(SpoolLimitExceeded):
+            converter.convert_stream(source, max_bytes=len(deck_bytes) - 1)
+    assert converter.convert_bytes(deck_bytes, max_bytes=len(deck_bytes))
+    assert converter.backend.converted and list(ram.iterdir()) == []
+
+
+def test_failed_conversion_cleans_up(ram, deck_bytes, make_converter):
+    converter = make_converter({"fail_on": ["deck.pptx"]})
+    with pytest.raises(ConversionFailed) as failure:
+        converter.convert_bytes(deck_bytes, name="deck.pptx")
+    assert failure.value.record["outcome"] == "failed"
+    with pytest.raises(ConversionFailed) as failure:
+        converter.convert_bytes(b"not a deck", name="other.pptx")
+    assert failure.value.record["outcome"] == "rejected"
+    assert list(ram.iterdir()) == []
+
+
+def test_large_inputs_spool_to_disk(ram):
+    free = spooling.shutil.disk_usage(ram).free
+    assert spool_root(0) == str(ram)
+    assert spool_root(free) == spooling.tempfile.gettempdir()
+
+
+def test_sweep_removes_only_folders_of_dead_processes(tmp_path):
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                          capture_output=True, text=True, check=True)
+    dead_pid = int(dead.stdout)
+    leftovers = [tmp_path / f"pptx2pdf-job-{dead_pid}-abc", tmp_path / f"pptx2pdf-spool-{dead_pid}-def"]
+    alive = [tmp_path / f"pptx2pdf-job-{os.getppid()}-ghi", tmp_path / (spool_prefix("job") + "jkl"),
+             tmp_path / "pptx2pdf-bench-xyz", tmp_path / "unrelated"]
+    for folder in leftovers + alive:
+        folder.mkdir()
+        (folder / "deck.pptx").write_bytes(b"deck")
+    assert sweep_stale([tmp_path]) == 2
+    assert sorted(tmp_path.iterdir()) == sorted(alive)
+
+
+def test_service_close_removes_job_folders(tmp_path, deck_bytes):
+    service = ConversionService(lambda worker_id: PPTXtoPDFConverter(log_file=str(tmp_path / "service.log"),
+                                                                     backend="fake"),
+                                work_dir=tmp_path / "work")
+    job = service.submit("deck.pptx", io.BytesIO(deck_bytes), len(deck_bytes))
+    deadline = time.monotonic() + 30
+    while job.status not in ("done", "failed") and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert job.status == "done" and job.output_path.exists()
+    service.close()
+    assert list((tmp_path / "work").iterdir()) == []
@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import threading
+import multiprocessing
+
+from benchmark import write_synthetic_deck
+from pptToPdf import PPTXtoPDFConverter
+from work_queue import CLAIMED, DONE, LEASED, LeaseQueue
+
+NODES = 3
+FILES = 20
+
+
+def _drain(node, input_dir, output_dir, queue_dir):
+    """One converter node: drains the shared queue and returns the decks it converted."""
+    converter = PPTXtoPDFConverter(log_file=os.path.join(output_dir, f"node{node}.log"), backend="fake",
+                                   backend_options={"delay": 0.02}, preflight=False)
+    converted = []
+    try:
+        converter.batch_convert(input_dir, os.path.join(output_dir, f"node{node}"), gui_mode=True,
+                                work_queue=queue_dir, lease_seconds=60, deduplicate=False,
+                                on_result=lambda result: converted.append(os.path.basename(result["input"])))
+    finally:
+        converter.close()
+    return converted
+
+
+def _expire(path, age=3600):
+    old = time.time() - age
+    os.utime(path, (old, old))
+
+
+def test_nodes_drain_each_file_exactly_once(tmp_path):
+    input_dir, output_dir, queue_dir = tmp_path / "input", tmp_path / "output", tmp_path / "queue"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    names = [f"deck{index:02d}.pptx" for index in range(FILES)]
+    for name in names:
+        write_synthetic_deck(input_dir / name, slides=2)
+
+    # A node that died holding deck00: its lease has long expired
+    dead = LeaseQueue(queue_dir, lease_seconds=60, owner="dead-node")
+    assert dead.claim("deck00.pptx") == CLAIMED
+    _expire(dead.lease_dir / f"{LeaseQueue.key_for('deck00.pptx')}.lease")
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(NODES) as pool:
+        per_node = pool.starmap(_drain, [(node, str(input_dir), str(output_dir), str(queue_dir))
+                                         for node in range(NODES)])
+
+    converted = [name for node in per_node for name in node]
+    assert sorted(converted) == names  # every deck once, none twice
+    markers = [json.loads(path.read_text()) for path in (queue_dir / "done").glob("*.json")]
+    assert len(markers) == FILES
+    assert all(marker["success"] for marker in markers)
+    assert not list((queue_dir / "leases").iterdir())
+
+
+def test_expired_lease_is_reclaimed_then_abandoned(tmp_path):
+    first = LeaseQueue(tmp_path, lease_seconds=60, max_attempts=2, owner="first")
+    second = LeaseQueue(tmp_path, lease_seconds=60, max_attempts=2, owner="second")
+    third = LeaseQueue(tmp_path, lease_seconds=60, max_attempts=2, owner="third")
+    lease = first.lease_dir / f"{LeaseQueue.key_for('bad.pptx')}.lease"
+
+    assert first.claim("bad.pptx") == CLAIMED
+    assert second.claim("bad.pptx") == LEASED  # live lease
+
+    _expire(lease)
+    assert second.claim("bad.pptx") == CLAIMED
+    reclaimed = json.loads(lease.read_text())
+    assert (reclaimed["owner"], reclaimed["attempt"]) == ("second", 2)
+    first.renew()
+    assert "bad.pptx" not in first.held.values()  # lost to the reclaiming node
+
+    _expire(lease)
+    assert third.claim("bad.pptx") == DONE  # third expiry is past max_attempts
+    marker = json.loads((tmp_path / "done" / f"{LeaseQueue.key_for('bad.pptx')}.json").read_text())
+    assert marker["success"] is False
+    assert "abandoned" in marker["error"]
+    assert first.claim("bad.pptx") == DONE
+
+
+def test_node_does_not_wait_for_its_own_leases(tmp_path, decks, make_converter):
+    # Another node holds gamma for a moment, so this node has to rescan the queue
+    # while it is still converting alpha and beta in its own workers
+    other = LeaseQueue(tmp_path / "queue", lease_seconds=16, owner="other")
+    assert other.claim("gamma.pptx") == CLAIMED
+    finish = threading.Timer(0.5, other.complete, ["gamma.pptx", True])
+    finish.start()
+    converter = make_converter({"delay": 5})
+    started = time.monotonic()
+    try:
+        assert converter.batch_convert(decks, tmp_path / "pdfs", gui_mode=True, workers=2,
+                                       work_queue=tmp_path / "queue", lease_seconds=16)
+    finally:
+        finish.cancel()
+    # The rescan 4s (lease_seconds / 4) in must not count alpha and beta as leased
+    # elsewhere: waiting for them there stalls the very loop that completes them
+    assert time.monotonic() - started < 7.5
+    assert sorted(path.name for path in (tmp_path / "pdfs").glob("*.pdf")) == ["alpha.pdf", "beta.pdf"]
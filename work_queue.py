@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import socket
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+
+# claim() results
+CLAIMED = "claimed"
+DONE = "done"  # finished (or abandoned) by some node
+LEASED = "leased"  # a live lease is held by another node
+
+
+class LeaseQueue:
+    """Work queue shared by converter processes through a directory, with no broker.
+
+    A node owns a file while it holds queue_dir/leases/<key>.lease, created with
+    O_EXCL so only one node can win it; queue_dir/done/<key>.json marks a file as
+    finished so nobody converts it again. Held leases are touched every
+    lease_seconds / 4; a lease left untouched for lease_seconds belongs to a crashed
+    or hung node and is reclaimed by renaming it away, which only one node can do.
+    A file whose lease expires max_attempts times is marked done as failed, so one
+    poisonous deck can't take down every node in turn. Keys are derived from the
+    path relative to the batch root, so hosts may mount the share anywhere.
+    """
+
+    def __init__(self, queue_dir, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 owner=None):
+        self.queue_dir = Path(queue_dir)
+        self.lease_dir = self.queue_dir / "leases"
+        self.done_dir = self.queue_dir / "done"
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.done_dir.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{os.urandom(4).hex()}"
+        self.held = {}  # key -> relative path
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    @staticmethod
+    def key_for(relative_path):
+        return hashlib.sha1(Path(relative_path).as_posix().encode("utf-8")).hexdigest()
+
+    def _lease_path(self, key):
+        return self.lease_dir / f"{key}.lease"
+
+    def _done_path(self, key):
+        return self.done_dir / f"{key}.json"
+
+    def _write_new(self, path, payload):
+        """Create path exclusively; raises FileExistsError if anyone else has it."""
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+    def _shared_clock(self):
+        """Current time as the shared filesystem sees it, so node clock skew can't expire leases."""
+        probe = self.queue_dir / f".clock-{self.owner}"
+        probe.touch()
+        return probe.stat().st_mtime
+
+    def is_done(self, key):
+        return self._done_path(key).exists()
+
+    def holds(self, relative_path):
+        """Whether this node has claimed the file and not yet completed or released it."""
+        with self._lock:
+            return self.key_for(relative_path) in self.held
+
+    def claim(self, relative_path):
+        """Try to take ownership of a file. Returns CLAIMED, DONE or LEASED."""
+        key = self.key_for(relative_path)
+        if self.is_done(key):
+            return DONE
+        lease = self._lease_path(key)
+        attempt = 1
+        try:
+            self._write_new(lease, {"owner": self.owner, "file": str(relative_path), "attempt": attempt,
+                                    "claimed": time.time()})
+        except FileExistsError:
+            attempt = self._reclaim_if_expired(key, lease)
+            if attempt is None:
+                return LEASED
+            if attempt > self.max_attempts:
+                self._mark_done(key, relative_path, False,
+                                f"abandoned after {self.max_attempts} expired leases")
+                return DONE
+            try:
+                self._write_new(lease, {"owner": self.owner, "file": str(relative_path), "attempt": attempt,
+                                        "claimed": time.time()})
+            except FileExistsError:
+                return LEASED  # another node reclaimed it first
+        if self.is_done(key):
+            # Finished by another node between our check and our lease
+            lease.unlink(missing_ok=True)
+            return DONE
+        with self._lock:
+            self.held[key] = str(relative_path)
+        if attempt > 1:
+            logger.warning(f"Reclaimed expired lease on {relative_path} (attempt {attempt})")
+        return CLAIMED
+
+    def _reclaim_if_expired(self, key, lease):
+        """Remove an expired lease; returns the next attempt number, or None while it is live."""
+        try:
+            if self._shared_clock() - lease.stat().st_mtime < self.lease_seconds:
+                return None
+        except FileNotFoundError:
+            return 1  # released meanwhile; try to create it again
+        tombstone = lease.with_name(f"{lease.name}.{self.owner}.expired")
+        try:
+            os.rename(lease, tombstone)  # only one node's rename of this file can succeed
+        except FileNotFoundError:
+            return None
+        try:
+            if self._shared_clock() - tombstone.stat().st_mtime < self.lease_seconds:
+                # Another node renewed the lease between our check and the rename: put it back
+                try:
+                    os.link(tombstone, lease)
+                except FileExistsError:
+                    pass
+                return None
+            with open(tombstone, encoding="utf-8") as f:
+                previous = json.load(f)
+            return int(previous.get("attempt", 1)) + 1
+        except (OSError, ValueError):
+            return 2
+        finally:
+            tombstone.unlink(missing_ok=True)
+
+    def complete(self, relative_path, success, output=None, error=None):
+        """Write the done marker for a claimed file and drop its lease."""
+        key = self.key_for(relative_path)
+        self._mark_done(key, relative_path, success, error, output)
+        self.release(relative_path)
+
+    def _mark_done(self, key, relative_path, success, error=None, output=None):
+        marker = self._done_path(key)
+        temp_path = marker.with_name(f".{marker.name}.{self.owner}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"file": str(relative_path), "success": bool(success), "output": output, "error": error,
+                       "owner": self.owner, "finished": time.time()}, f)
+        os.replace(temp_path, marker)
+
+    def release(self, relative_path):
+        """Give a claimed file back to the queue without marking it done."""
+        key = self.key_for(relative_path)
+        with self._lock:
+            held = self.held.pop(key, None)
+        if held is not None and self._owns(key):
+            self._lease_path(key).unlink(missing_ok=True)
+
+    def release_all(self):
+        with self._lock:
+            held = list(self.held.values())
+        for relative_path in held:
+            self.release(relative_path)
+
+    def _owns(self, key):
+        try:
+            with open(self._lease_path(key), encoding="utf-8") as f:
+                return json.load(f).get("owner") == self.owner
+        except (OSError, ValueError):
+            return False
+
+    def renew(self):
+        """Touch every held lease; leases taken over by another node are dropped."""
+        with self._lock:
+            held = dict(self.held)
+        for key, relative_path in held.items():
+            if not self._owns(key):
+                logger.warning(f"Lost lease on {relative_path} to another node")
+                with self._lock:
+                    self.held.pop(key, None)
+                continue
+            try:
+                os.utime(self._lease_path(key))
+            except OSError as e:
+                logger.warning(f"Could not renew lease on {relative_path}: {e}")
+
+    def start(self):
+        """Renew held leases from a daemon thread until close()."""
+        def heartbeat():
+            while not self._stop.wait(self.lease_seconds / 4):
+                self.renew()
+
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=heartbeat, name="lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.join()
+            self._heartbeat = None
+        self.release_all()
+        (self.queue_dir / f".clock-{self.owner}").unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()